@@ -0,0 +1,622 @@
+"""
+Benchmarks of parsing, pagination, extraction and removal.
+
+The suite is not installed with the package. Run it from the root of the repository with
+``python -m benchmarks.bench run -o results.json``. Every benchmark works on
+:py:class:`~youtube_unofficial.testing.synthetic.SyntheticData` pages served from memory, so no
+network is used and two runs with the same options do the same work.
+
+Each benchmark is run once under :py:mod:`tracemalloc` to measure its peak memory (this also warms
+it up), then ``--repeat`` times without it to measure its duration. The ``import.*`` benchmarks
+import a module in a new interpreter with ``-X importtime``.
+
+``python -m benchmarks.bench compare baseline.json results.json`` exits with status 1 if the second
+run regressed. A time is a regression if it grew by more than its threshold and a one-sided
+Mann-Whitney U test of the samples is significant. Peak memory and peak RSS are regressions if they
+grew by more than ``--memory-threshold``. There is no ``youtube-unofficial-bench`` command for this
+because the module is not in the wheel, so such a command would fail to import once the package is
+installed.
+
+``parse.threads`` and ``history.threads`` run ``--threads`` parses or listings at once in as many
+worker threads. With the GIL they take about ``--threads`` times as long as one, and on a
+free-threaded build they take about as long as one if there are enough cores. To compare the two
+builds, run the benchmarks with each and compare the results files:
+
+.. code-block:: shell
+
+   uv run --python 3.14 python -m benchmarks.bench run -k '*threads' -o gil.json
+   uv run --python 3.14t python -m benchmarks.bench run -k '*threads' -o nogil.json
+   python -m benchmarks.bench compare gil.json nogil.json
+"""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from fnmatch import fnmatch
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple, cast
+from urllib.parse import urlsplit
+import math
+import platform
+import statistics
+import subprocess as sp
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup as Soup
+from typing_extensions import TypedDict, override
+from youtube_unofficial import __version__
+from youtube_unofficial.client import YouTubeClient
+from youtube_unofficial.constants import WATCH_HISTORY_URL, WATCH_LATER_URL
+from youtube_unofficial.json_codec import codec, dumps, loads
+from youtube_unofficial.parsing import gil_enabled, parse_bootstrap
+from youtube_unofficial.testing.synthetic import BROWSE_API_URL, FEEDBACK_API_URL, SyntheticData
+from youtube_unofficial.utils import find_ytcfg, initial_data
+import anyio
+import anyio.to_thread
+import click
+import niquests
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+__all__ = ('RESULTS_VERSION', 'BenchmarkResult', 'BenchmarkResults', 'Comparison', 'Thresholds',
+           'compare_results', 'main', 'run_benchmarks')
+
+RESULTS_VERSION = 1
+"""Version of the results file format."""
+# Playlist removal gets the ytcfg from the Watch Later page.
+_PLAYLIST_ID = 'WL'
+
+
+class BenchmarkResult(TypedDict):
+    """Measurements of one benchmark."""
+    samples: list[float]
+    """Duration of each run in seconds."""
+    items: int
+    """Number of items (entries, video IDs or removals) processed by one run."""
+    pages: int
+    """Number of pages processed by one run."""
+    median: float
+    """Median duration in seconds."""
+    items_per_second: float
+    """Items processed per second, from the median."""
+    seconds_per_page: float
+    """Seconds per page, from the median."""
+    seconds_per_1k_items: float
+    """Seconds per 1000 items, from the median."""
+    peak_memory: int
+    """Peak memory allocated by one run in bytes, as measured by :py:mod:`tracemalloc`."""
+
+
+class BenchmarkResults(TypedDict):
+    """Contents of a results file."""
+    version: int
+    """Version of the format. See :py:data:`RESULTS_VERSION`."""
+    created: str
+    """Time of the run in ISO 8601 format."""
+    package_version: str
+    """Version of this package."""
+    python: str
+    """Python implementation and version, followed by ``(free-threaded)`` if the GIL is disabled."""
+    platform: str
+    """Operating system and machine."""
+    json_codec: str
+    """Name of the JSON codec used."""
+    options: dict[str, int]
+    """Sizes, thread count and repeat count of the run."""
+    benchmarks: dict[str, BenchmarkResult]
+    """Results keyed by benchmark name."""
+    peak_rss: int | None
+    """Peak resident set size of the process in bytes, or ``None`` where it cannot be measured."""
+
+
+class Thresholds(NamedTuple):
+    """Relative growth above which a measurement is a regression."""
+    parse: float = 0.1
+    """Median duration of the ``parse.*`` benchmarks."""
+    item: float = 0.1
+    """Seconds per 1000 items of the other benchmarks."""
+    import_time: float = 0.2
+    """Median duration of the ``import.*`` benchmarks."""
+    memory: float = 0.1
+    """Peak memory of each benchmark and peak RSS of the run."""
+    alpha: float = 0.05
+    """Significance level of the Mann-Whitney U test of the samples of timed measurements."""
+
+
+_DEFAULT_THRESHOLDS = Thresholds()
+
+
+class Comparison(NamedTuple):
+    """Comparison of one measurement of two runs."""
+    metric: str
+    """Benchmark name and measurement, such as ``history.extract:seconds_per_1k_items``."""
+    baseline: float
+    """Value in the baseline run."""
+    current: float
+    """Value in the current run."""
+    change: float
+    """Relative change. ``0.1`` is 10% higher than the baseline."""
+    p_value: float | None
+    """One-sided p-value that the current samples are larger, or ``None`` for memory."""
+    regression: bool
+    """Whether the change is a regression."""
+
+
+class _Pages(NamedTuple):
+    history_html: str
+    history_continuations: dict[str, bytes]
+    playlist_html: str
+    playlist_continuations: dict[str, bytes]
+    soup: Soup
+    history_video_ids: list[str]
+    threads: int
+
+
+class _MemorySession(niquests.AsyncSession):
+    # Serves prepared pages without a network. Mutations always succeed.
+    def __init__(self, pages: _Pages) -> None:
+        super().__init__()
+        self.cookies.set('SAPISID', 'bench')  # type: ignore[no-untyped-call]
+        self._get = {
+            WATCH_HISTORY_URL: pages.history_html.encode(),
+            WATCH_LATER_URL: pages.playlist_html.encode()
+        }
+        self._continuations = pages.history_continuations | pages.playlist_continuations
+        self._feedback = dumps({'feedbackResponses': [{'isProcessed': True}]}).encode()
+        self._edit_playlist = dumps({'status': 'STATUS_SUCCEEDED'}).encode()
+
+    @override
+    async def request(  # type: ignore[override]
+            self, method: str, url: str, *args: Any, **kwargs: Any) -> niquests.Response:
+        path = urlsplit(url).path
+        if method.upper() == 'GET':
+            content = self._get[url]
+        elif path == BROWSE_API_URL:
+            content = self._continuations[kwargs['json']['continuation']]
+        elif path == FEEDBACK_API_URL:
+            content = self._feedback
+        else:
+            content = self._edit_playlist
+        resp = niquests.Response()
+        resp.status_code = 200
+        resp._content = content  # ruff:ignore[private-member-access]
+        resp.encoding = 'utf-8'
+        resp.url = url
+        return resp
+
+
+class _Run(NamedTuple):
+    items: int
+    pages: int
+    # Replaces the measured duration when the benchmark times itself.
+    seconds: float | None = None
+
+
+_BenchmarkFunc = Callable[[_Pages], Awaitable[_Run]]
+
+
+class _Benchmark(NamedTuple):
+    name: str
+    description: str
+    func: _BenchmarkFunc
+
+
+_BENCHMARKS: list[_Benchmark] = []
+
+
+def _benchmark(name: str, description: str) -> Callable[[_BenchmarkFunc], _BenchmarkFunc]:
+    def decorator(func: _BenchmarkFunc) -> _BenchmarkFunc:
+        _BENCHMARKS.append(_Benchmark(name, description, func))
+        return func
+
+    return decorator
+
+
+def _import_seconds(module: str) -> float:
+    proc = sp.run((sys.executable, '-X', 'importtime', '-c', f'import {module}'),
+                  capture_output=True,
+                  check=True,
+                  text=True)
+    for line in proc.stderr.splitlines():
+        _, cumulative, name = (x.strip() for x in line.removeprefix('import time:').split('|'))
+        if name == module:
+            return int(cumulative) / 1e6
+    msg = f'No import time reported for {module}.'  # pragma: no cover
+    raise RuntimeError(msg)  # pragma: no cover
+
+
+def _import_benchmark(module: str) -> None:
+    async def func(_pages: _Pages) -> _Run:
+        return _Run(1, 0, await anyio.to_thread.run_sync(_import_seconds, module))
+
+    _benchmark(f'import.{module.rpartition(".")[2]}',
+               f'Import {module} in a new interpreter.')(func)
+
+
+_import_benchmark('youtube_unofficial.main')
+_import_benchmark('youtube_unofficial.client')
+
+
+@_benchmark('parse.soup', 'Build the html5lib tree of the first history page.')
+async def _parse_soup(pages: _Pages) -> _Run:  # ruff:ignore[unused-async]
+    Soup(pages.history_html, 'html5lib')
+    return _Run(1, 1)
+
+
+@_benchmark('parse.find_ytcfg', 'Extract the ytcfg of the first history page.')
+async def _parse_find_ytcfg(pages: _Pages) -> _Run:  # ruff:ignore[unused-async]
+    find_ytcfg(pages.soup)
+    return _Run(1, 1)
+
+
+@_benchmark('parse.initial_data', 'Decode the ytInitialData of the first history page.')
+async def _parse_initial_data(pages: _Pages) -> _Run:  # ruff:ignore[unused-async]
+    initial_data(pages.soup)
+    return _Run(1, 1)
+
+
+@_benchmark('parse.threads', 'Parse the first history page in --threads worker threads at once.')
+async def _parse_threads(pages: _Pages) -> _Run:
+    limiter = anyio.CapacityLimiter(pages.threads)
+    async with anyio.create_task_group() as tg:
+        for _ in range(pages.threads):
+            tg.start_soon(
+                partial(anyio.to_thread.run_sync,
+                        parse_bootstrap,
+                        pages.history_html,
+                        limiter=limiter))
+    return _Run(pages.threads, pages.threads)
+
+
+@_benchmark('history.extract',
+            'Page through the history with get_history_video_ids(return_dict=True).')
+async def _history_extract(pages: _Pages) -> _Run:
+    client = YouTubeClient(_MemorySession(pages))
+    items = sum([1 async for _ in client.get_history_video_ids(return_dict=True)])
+    return _Run(items, len(pages.history_continuations) + 1)
+
+
+@_benchmark(
+    'history.threads',
+    'Page through the history with --threads clients at once that share --threads parse '
+    'threads.')
+async def _history_threads(pages: _Pages) -> _Run:
+    limiter = anyio.CapacityLimiter(pages.threads)
+    counts: list[int] = []
+
+    async def extract() -> None:
+        client = YouTubeClient(_MemorySession(pages), parse_limiter=limiter)
+        counts.append(sum([1 async for _ in client.get_history_video_ids(return_dict=True)]))
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(pages.threads):
+            tg.start_soon(extract)
+    return _Run(sum(counts), pages.threads * (len(pages.history_continuations) + 1))
+
+
+@_benchmark('playlist.paging', 'Page through a playlist with get_playlist_video_ids().')
+async def _playlist_paging(pages: _Pages) -> _Run:
+    client = YouTubeClient(_MemorySession(pages))
+    items = sum([1 async for _ in client.get_playlist_video_ids(_PLAYLIST_ID)])
+    return _Run(items, len(pages.playlist_continuations) + 1)
+
+
+@_benchmark('history.remove', 'Remove every history entry with remove_video_ids_from_history().')
+async def _history_remove(pages: _Pages) -> _Run:
+    client = YouTubeClient(_MemorySession(pages))
+    await client.remove_video_ids_from_history(pages.history_video_ids)
+    return _Run(len(pages.history_video_ids), len(pages.history_continuations) + 1)
+
+
+@_benchmark('playlist.clear', 'Remove every video of a playlist with clear_playlist().')
+async def _playlist_clear(pages: _Pages) -> _Run:
+    session = _MemorySession(pages)
+    count = 0
+    request = session.request
+
+    async def counting_request(method: str, url: str, *args: Any,
+                               **kwargs: Any) -> niquests.Response:
+        nonlocal count
+        count += url.endswith('/edit_playlist')
+        return await request(method, url, *args, **kwargs)
+
+    session.request = counting_request  # type: ignore[method-assign]
+    await YouTubeClient(session).clear_playlist(_PLAYLIST_ID)
+    return _Run(count, len(pages.playlist_continuations) + 1)
+
+
+def _build_pages(data: SyntheticData, history_size: int, playlist_size: int, page_size: int,
+                 threads: int) -> _Pages:
+    history_html, history_continuations = data.history_chain(
+        history_size, continuations=max(0,
+                                        math.ceil(history_size / page_size) - 1))
+    playlist_html, playlist_continuations = data.playlist_chain(
+        _PLAYLIST_ID, playlist_size, continuations=max(0,
+                                                       math.ceil(playlist_size / page_size) - 1))
+    return _Pages(history_html, {
+        k: dumps(v).encode()
+        for k, v in history_continuations.items()
+    }, playlist_html, {
+        k: dumps(v).encode()
+        for k, v in playlist_continuations.items()
+    }, Soup(history_html, 'html5lib'), [data.video_id(n) for n in range(history_size)], threads)
+
+
+async def _measure(benchmark: _Benchmark, pages: _Pages, repeat: int) -> BenchmarkResult:
+    tracemalloc.start()
+    try:
+        await benchmark.func(pages)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    samples = []
+    items = page_count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items, page_count, seconds = await benchmark.func(pages)
+        samples.append(time.perf_counter() - start if seconds is None else seconds)
+    median = statistics.median(samples)
+    return {
+        'samples': samples,
+        'items': items,
+        'pages': page_count,
+        'median': median,
+        'items_per_second': items / median if median else 0.0,
+        'seconds_per_page': median / page_count if page_count else 0.0,
+        'seconds_per_1k_items': median * 1000 / items if items else 0.0,
+        'peak_memory': peak_memory
+    }
+
+
+def run_benchmarks(
+        *,
+        history_size: int = 5000,
+        playlist_size: int = 5000,
+        page_size: int = 100,
+        threads: int = 4,
+        repeat: int = 5,
+        seed: int = 0,
+        select: Sequence[str] = (),
+        on_result: Callable[[str, BenchmarkResult], None] | None = None) -> BenchmarkResults:
+    """
+    Run the benchmarks.
+
+    Parameters
+    ----------
+    history_size : int
+        Number of history entries.
+    playlist_size : int
+        Number of playlist videos.
+    page_size : int
+        Number of entries or videos per page.
+    threads : int
+        Number of worker threads of the ``*.threads`` benchmarks.
+    repeat : int
+        Number of timed runs of each benchmark.
+    seed : int
+        Seed of the synthetic data.
+    select : Sequence[str]
+        Shell-style patterns of the benchmark names to run. All are run if empty.
+    on_result : Callable[[str, BenchmarkResult], None] | None
+        Called with the name and the result of each benchmark when it finishes.
+
+    Returns
+    -------
+    BenchmarkResults
+        The results.
+    """
+    pages = _build_pages(SyntheticData(seed), history_size, playlist_size, page_size, threads)
+    selected = [
+        x for x in _BENCHMARKS if not select or any(fnmatch(x.name, pattern) for pattern in select)
+    ]
+
+    async def run_all() -> dict[str, BenchmarkResult]:
+        results = {}
+        for benchmark in selected:
+            results[benchmark.name] = await _measure(benchmark, pages, repeat)
+            if on_result is not None:
+                on_result(benchmark.name, results[benchmark.name])
+        return results
+
+    return {
+        'version': RESULTS_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(),
+        'package_version': __version__,
+        'python': (f'{platform.python_implementation()} {platform.python_version()}'
+                   f'{"" if gil_enabled() else " (free-threaded)"}'),
+        'platform': f'{platform.system()} {platform.machine()}',
+        'json_codec': codec.name,
+        'options': {
+            'history_size': history_size,
+            'playlist_size': playlist_size,
+            'page_size': page_size,
+            'threads': threads,
+            'repeat': repeat,
+            'seed': seed
+        },
+        'benchmarks': anyio.run(run_all),
+        'peak_rss': _peak_rss()
+    }
+
+
+def _peak_rss() -> int | None:
+    try:
+        import resource  # ruff:ignore[import-outside-top-level]
+    except ImportError:  # pragma: no cover
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kibibytes and macOS reports bytes.
+    return int(max_rss if sys.platform == 'darwin' else max_rss * 1024)
+
+
+def _mann_whitney_p(baseline: Sequence[float], current: Sequence[float]) -> float:
+    # One-sided p-value that current is larger, with the normal approximation.
+    n, m = len(baseline), len(current)
+    u = sum(1.0 if c > b else 0.5 if c == b else 0.0 for b in baseline for c in current)
+    sd = math.sqrt(n * m * (n + m + 1) / 12)
+    if not sd:
+        return 1.0
+    return 1 - statistics.NormalDist().cdf((u - n * m / 2 - 0.5) / sd)
+
+
+def _change(baseline: float, current: float) -> float:
+    return (current - baseline) / baseline if baseline else 0.0
+
+
+def compare_results(baseline: BenchmarkResults,
+                    current: BenchmarkResults,
+                    thresholds: Thresholds | None = None) -> list[Comparison]:
+    """
+    Compare two runs.
+
+    Only benchmarks present in both runs are compared.
+
+    Parameters
+    ----------
+    baseline : BenchmarkResults
+        The earlier run.
+    current : BenchmarkResults
+        The run to check.
+    thresholds : Thresholds | None
+        Thresholds. Defaults to :py:class:`Thresholds` with its default values.
+
+    Returns
+    -------
+    list[Comparison]
+        Comparisons of the timed measurements and peak memory of each benchmark, then of peak RSS.
+    """
+    thresholds = thresholds or _DEFAULT_THRESHOLDS
+    comparisons = []
+    for name, old in baseline['benchmarks'].items():
+        if (new := current['benchmarks'].get(name)) is None:
+            continue
+        kind = name.partition('.')[0]
+        if kind in {'import', 'parse'}:
+            metric, threshold = 'median', (thresholds.import_time
+                                           if kind == 'import' else thresholds.parse)
+            old_value, new_value = old['median'], new['median']
+            old_samples, new_samples = old['samples'], new['samples']
+        else:
+            metric, threshold = 'seconds_per_1k_items', thresholds.item
+            old_value, new_value = old['seconds_per_1k_items'], new['seconds_per_1k_items']
+            old_samples = [x * 1000 / old['items'] for x in old['samples']] if old['items'] else []
+            new_samples = [x * 1000 / new['items'] for x in new['samples']] if new['items'] else []
+        change = _change(old_value, new_value)
+        p_value = _mann_whitney_p(old_samples, new_samples)
+        comparisons.append(
+            Comparison(f'{name}:{metric}', old_value, new_value, change, p_value, change > threshold
+                       and p_value < thresholds.alpha))
+        if kind != 'import':
+            change = _change(old['peak_memory'], new['peak_memory'])
+            comparisons.append(
+                Comparison(f'{name}:peak_memory', old['peak_memory'], new['peak_memory'], change,
+                           None, change > thresholds.memory))
+    if baseline.get('peak_rss') and current.get('peak_rss'):
+        old_rss, new_rss = cast('int', baseline['peak_rss']), cast('int', current['peak_rss'])
+        change = _change(old_rss, new_rss)
+        comparisons.append(
+            Comparison('peak_rss', old_rss, new_rss, change, None, change > thresholds.memory))
+    return comparisons
+
+
+def _echo_result(name: str, result: Mapping[str, Any]) -> None:
+    click.echo(f'{name:<20}{result["median"] * 1e3:>12.2f}{result["items_per_second"]:>14,.0f}'
+               f'{result["seconds_per_page"] * 1e3:>12.3f}{result["peak_memory"] / 2**20:>12.1f}')
+
+
+@click.group(context_settings={'help_option_names': ('-h', '--help')})
+def main() -> None:
+    """Benchmarks of youtube-unofficial."""
+
+
+@main.command('list')
+def list_benchmarks() -> None:
+    """List the benchmarks."""
+    for benchmark in _BENCHMARKS:
+        click.echo(f'{benchmark.name:<20}{benchmark.description}')
+
+
+@main.command()
+@click.option('--history-size', default=5000, help='Number of history entries.')
+@click.option('--playlist-size', default=5000, help='Number of playlist videos.')
+@click.option('--page-size', default=100, help='Number of entries or videos per page.')
+@click.option('--threads', default=4, help='Number of worker threads of the *.threads benchmarks.')
+@click.option('-r', '--repeat', default=5, help='Number of timed runs of each benchmark.')
+@click.option('--seed', default=0, help='Seed of the synthetic data.')
+@click.option('-k',
+              '--select',
+              multiple=True,
+              help='Shell-style pattern of the benchmarks to run. May be given more than once.')
+@click.option('-o',
+              '--output',
+              type=click.Path(dir_okay=False, path_type=Path),
+              help='File to write the results to as JSON.')
+def run(history_size: int, playlist_size: int, page_size: int, threads: int, repeat: int, seed: int,
+        select: tuple[str, ...], output: Path | None) -> None:
+    """Run the benchmarks and print a summary."""
+    click.echo(f'{"benchmark":<20}{"median ms":>12}{"items/s":>14}{"ms/page":>12}{"peak MiB":>12}')
+    results = run_benchmarks(history_size=history_size,
+                             playlist_size=playlist_size,
+                             page_size=page_size,
+                             threads=threads,
+                             repeat=repeat,
+                             seed=seed,
+                             select=select,
+                             on_result=_echo_result)
+    if output is not None:
+        output.write_text(dumps(cast('dict[str, Any]', results), indent=True), encoding='utf-8')
+
+
+@main.command()
+@click.argument('baseline', type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.argument('current', type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option('--parse-threshold',
+              default=_DEFAULT_THRESHOLDS.parse,
+              help='Allowed growth of the parse.* medians. 0.1 is 10%.')
+@click.option('--item-threshold',
+              default=_DEFAULT_THRESHOLDS.item,
+              help='Allowed growth of the seconds per 1000 items.')
+@click.option('--import-threshold',
+              default=_DEFAULT_THRESHOLDS.import_time,
+              help='Allowed growth of the import.* medians.')
+@click.option('--memory-threshold',
+              default=_DEFAULT_THRESHOLDS.memory,
+              help='Allowed growth of peak memory and peak RSS.')
+@click.option('--alpha',
+              default=_DEFAULT_THRESHOLDS.alpha,
+              help='Significance level of the test of the timed samples.')
+def compare(baseline: Path, current: Path, parse_threshold: float, item_threshold: float,
+            import_threshold: float, memory_threshold: float, alpha: float) -> None:
+    """
+    Compare two results files and exit with status 1 on a regression.
+
+    BASELINE is the earlier run and CURRENT the run to check.
+    """
+    old, new = (cast('BenchmarkResults', loads(x.read_bytes())) for x in (baseline, current))
+    if old['options'] != new['options']:
+        click.echo('Warning: the runs used different options.', err=True)
+    if old.get('python') != new.get('python'):
+        click.echo(
+            f'Comparing {old.get("python", "an unknown Python")} with '
+            f'{new.get("python", "an unknown Python")}.',
+            err=True)
+    comparisons = compare_results(
+        old, new,
+        Thresholds(parse_threshold, item_threshold, import_threshold, memory_threshold, alpha))
+    click.echo(f'{"metric":<40}{"baseline":>14}{"current":>14}{"change":>9}{"p":>8}')
+    for comparison in comparisons:
+        p_value = '' if comparison.p_value is None else f'{comparison.p_value:.3f}'
+        click.echo(f'{comparison.metric:<40}{comparison.baseline:>14.6g}{comparison.current:>14.6g}'
+                   f'{comparison.change:>+9.1%}{p_value:>8}'
+                   f'{"  REGRESSION" if comparison.regression else ""}')
+    if regressions := sum(x.regression for x in comparisons):
+        click.echo(f'{regressions} regression(s).', err=True)
+        click.get_current_context().exit(1)
+
+
+if __name__ == '__main__':
+    main()
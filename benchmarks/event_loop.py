@@ -0,0 +1,106 @@
+"""
+Compare the event loops on concurrent pagination and mutation.
+
+Each workload runs many clients at once against an
+:py:class:`~youtube_unofficial.testing.server.InnerTubeServer` on localhost, so the time the loop
+spends switching tasks and handling sockets shows. The server runs in threads of the same process,
+so compare the loops with each other rather than with YouTube. Run with
+``python benchmarks/event_loop.py``. uvloop is skipped if it is not installed.
+"""
+from __future__ import annotations
+
+from contextlib import AsyncExitStack
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from youtube_unofficial.client import YouTubeClient
+from youtube_unofficial.event_loop import available_loops, backend_options
+from youtube_unofficial.testing.server import InnerTubeServer
+import anyio
+import click
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+_PLAYLIST_ID = 'PL1'
+
+
+async def _clients(stack: AsyncExitStack, server: InnerTubeServer,
+                   count: int) -> list[YouTubeClient]:
+    return [YouTubeClient(await stack.enter_async_context(server.session())) for _ in range(count)]
+
+
+async def _paginate(server: InnerTubeServer, concurrency: int) -> tuple[float, int]:
+    counts: list[int] = []
+
+    async def paginate(client: YouTubeClient) -> None:
+        counts.append(sum([1 async for _ in client.get_playlist_video_ids(_PLAYLIST_ID)]))
+
+    async with AsyncExitStack() as stack:
+        clients = await _clients(stack, server, concurrency)
+        start = perf_counter()
+        async with anyio.create_task_group() as tg:
+            for client in clients:
+                tg.start_soon(paginate, client)
+        return perf_counter() - start, sum(counts)
+
+
+async def _mutate(server: InnerTubeServer, concurrency: int) -> tuple[float, int]:
+    video_ids = iter([video_id for video_id, _ in server.playlists['WL']])
+    results: list[bool] = []
+
+    async def remove(client: YouTubeClient) -> None:
+        for video_id in video_ids:
+            succeeded = await client.remove_video_id_from_playlist('WL',
+                                                                   video_id,
+                                                                   cache_values=True)
+            results.append(succeeded)
+
+    async with AsyncExitStack() as stack:
+        clients = await _clients(stack, server, concurrency)
+        start = perf_counter()
+        async with anyio.create_task_group() as tg:
+            for client in clients:
+                tg.start_soon(remove, client)
+        return perf_counter() - start, sum(results)
+
+
+def _best_of(workload: Callable[[InnerTubeServer, int], Awaitable[tuple[float, int]]],
+             server_factory: Callable[[], InnerTubeServer], loop: str, concurrency: int,
+             repeat: int) -> tuple[float, int]:
+    results = []
+    for _ in range(repeat):
+        # Mutations empty the playlist, so every run gets a new server.
+        with server_factory() as server:
+            results.append(
+                anyio.run(workload, server, concurrency,
+                          backend_options=backend_options(loop)))  # type: ignore[arg-type]
+    return min(results)
+
+
+@click.command()
+@click.option('-c', '--concurrency', default=50, help='Number of clients running at once.')
+@click.option('--playlist-size', default=1000, help='Number of videos each client pages through.')
+@click.option('--page-size', default=100, help='Number of videos per page.')
+@click.option('--mutations', default=2000, help='Number of videos removed by all clients.')
+@click.option('--repeat', default=3, help='Runs per measurement. The best one is kept.')
+def main(concurrency: int, playlist_size: int, page_size: int, mutations: int, repeat: int) -> None:
+    """Print the duration and throughput of each workload on each installed event loop."""
+    workloads = {
+        'paginate': (
+            _paginate,
+            lambda: InnerTubeServer(playlists={_PLAYLIST_ID: playlist_size}, page_size=page_size)),
+        'mutate': (_mutate, lambda: InnerTubeServer(playlists={'WL': mutations}))
+    }
+    click.echo(f'{"workload":<10}{"loop":<10}{"seconds":>10}{"items/s":>12}{"speed-up":>10}')
+    for name, (workload, server_factory) in workloads.items():
+        baseline = 0.0
+        for loop in available_loops():
+            seconds, items = _best_of(workload, server_factory, loop, concurrency, repeat)
+            baseline = baseline or seconds
+            click.echo(f'{name:<10}{loop:<10}{seconds:>10.3f}{items / seconds:>12,.0f}'
+                       f'{baseline / seconds:>9.2f}x')
+
+
+if __name__ == '__main__':
+    main()
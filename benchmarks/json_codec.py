@@ -0,0 +1,55 @@
+"""
+Compare the JSON codecs on the history and playlist fixtures.
+
+The fixtures are a few KB, so each is repeated to the size of a real ``ytInitialData`` blob before
+timing. Run with ``python benchmarks/json_codec.py``.
+"""
+from __future__ import annotations
+
+from functools import partial
+from pathlib import Path
+from timeit import Timer
+from typing import TYPE_CHECKING
+import json
+
+from youtube_unofficial.json_codec import available_codecs, get_codec
+import click
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+DATA_PATH = Path(__file__).resolve().parent.parent / 'tests' / 'client' / 'data'
+FIXTURES = {
+    'history': DATA_PATH / 'get-history-info' / '00-with-continuation.json',
+    'playlist': DATA_PATH / 'get-playlist-info' / '00.json'
+}
+
+
+def _best_of(func: Callable[[], object], repeat: int, number: int) -> float:
+    return min(Timer(func).repeat(repeat=repeat, number=number)) / number
+
+
+@click.command()
+@click.option('--size', default=500_000, help='Approximate document size in bytes.')
+@click.option('--number', default=20, help='Calls per timing.')
+@click.option('--repeat', default=5, help='Timings per measurement. The best one is kept.')
+def main(size: int, number: int, repeat: int) -> None:
+    """Print the decode and encode time of each installed codec."""
+    reference = get_codec('json')
+    click.echo(f'{"fixture":<10}{"codec":<10}{"loads ms":>10}{"dumps ms":>10}{"speed-up":>10}')
+    for fixture, path in FIXTURES.items():
+        item = json.loads(path.read_text(encoding='utf-8'))
+        obj = [item] * max(1, size // len(reference.dumps(item)))
+        text = reference.dumps(obj)
+        baseline = 0.0
+        for name in available_codecs()[::-1]:
+            codec = get_codec(name)
+            loads_s = _best_of(partial(codec.loads, text), repeat, number)
+            dumps_s = _best_of(partial(codec.dumps, obj, sort_keys=True), repeat, number)
+            baseline = baseline or loads_s + dumps_s
+            click.echo(f'{fixture:<10}{name:<10}{loads_s * 1e3:>10.2f}{dumps_s * 1e3:>10.2f}'
+                       f'{baseline / (loads_s + dumps_s):>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -74,3 +74,4 @@ async def test_clear_playlist(mocker: MockerFixture, client: YouTubeClient,
     rem_video_id = mocker.spy(client, 'remove_video_id_from_playlist')
     await client.clear_playlist(playlist_id='test_playlist')
     assert rem_video_id.call_count == 2
+    rem_video_id.assert_called_with('test_playlist', mocker.ANY, cache_values=True)
@@ -34,3 +34,63 @@ async def test_remove_video_ids_from_history(mocker: MockerFixture, client: YouT
     mocker.patch('youtube_unofficial.client.download_page', side_effect=fake_dl)
     result = await client.remove_video_ids_from_history(['test_video', 'test_video2'])
     assert result is True
+
+
+@pytest.mark.anyio
+async def test_remove_video_ids_from_history_batched(mocker: MockerFixture, client: YouTubeClient,
+                                                     data_path: Path) -> None:
+    mocker.patch('youtube_unofficial.client.find_ytcfg',
+                 return_value={
+                     'USER_SESSION_ID': 'test_session_id',
+                     'INNERTUBE_API_KEY': 'test_api_key',
+                     'INNERTUBE_CONTEXT_CLIENT_VERSION': '1.0',
+                     'SESSION_INDEX': 0,
+                     'VISITOR_DATA': 'test_visitor_data'
+                 })
+    mocker.patch('youtube_unofficial.client.initial_data',
+                 return_value=json.loads((data_path / 'remove-video-ids-00.json').read_text()))
+    html_requests = 0
+
+    async def fake_dl(*args: Any, **kwargs: Any) -> str | dict[str, Any]:
+        nonlocal html_requests
+        if kwargs.get('return_json'):
+            return cast('dict[str, Any]', {'feedbackResponses': [{'isProcessed': True}]})
+        html_requests += 1
+        return '<html></html>'
+
+    mocker.patch('youtube_unofficial.client.download_page', side_effect=fake_dl)
+    feedback = mocker.spy(client, '_single_feedback_api_call')
+    result = await client.remove_video_ids_from_history(iter(('test_video', 'test_video2')),
+                                                        batch_size=1)
+    assert result is True
+    assert html_requests == 1
+    assert feedback.call_count == 2
+    # The scan has passed test_video when test_video2 is found. It ends without finding
+    # not_in_history, which is then known to be absent, and only the batch of test_video starts
+    # again from a new history page.
+    video_ids = iter(('test_video2', 'not_in_history', 'test_video'))
+    result = await client.remove_video_ids_from_history(video_ids, batch_size=1)
+    assert result is True
+    assert html_requests == 3
+    assert feedback.call_count == 4
+
+
+@pytest.mark.anyio
+async def test_remove_video_ids_from_history_failure(mocker: MockerFixture, client: YouTubeClient,
+                                                     data_path: Path) -> None:
+    mocker.patch('youtube_unofficial.client.find_ytcfg',
+                 return_value={
+                     'USER_SESSION_ID': 'test_session_id',
+                     'INNERTUBE_CONTEXT_CLIENT_VERSION': '1.0',
+                     'SESSION_INDEX': 0
+                 })
+    mocker.patch('youtube_unofficial.client.initial_data',
+                 return_value=json.loads((data_path / 'remove-video-ids-00.json').read_text()))
+
+    async def fake_dl(*args: Any, **kwargs: Any) -> str | dict[str, Any]:
+        if kwargs.get('return_json'):
+            return cast('dict[str, Any]', {'feedbackResponses': [{'isProcessed': False}]})
+        return '<html></html>'
+
+    mocker.patch('youtube_unofficial.client.download_page', side_effect=fake_dl)
+    assert await client.remove_video_ids_from_history(['test_video']) is False
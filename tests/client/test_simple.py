@@ -102,9 +102,10 @@ async def _empty_history_info(*args: object, **kwargs: object) -> AsyncGenerator
 @pytest.mark.anyio
 async def test_remove_video_ids_from_history_no_entries(mocker: MockerFixture,
                                                         client: YouTubeClient) -> None:
-    mocker.patch.object(client, 'get_history_info', _empty_history_info)
+    mocker.patch.object(client, '_iter_history_info', _empty_history_info)
     mocker.patch('youtube_unofficial.client.Soup')
     mocker.patch('youtube_unofficial.client.find_ytcfg', return_value={})
+    mocker.patch('youtube_unofficial.client.initial_data', return_value={})
     mocker.patch('youtube_unofficial.client.download_page',
                  new_callable=AsyncMock,
                  return_value='<html></html>')
@@ -190,3 +191,17 @@ async def test_remove_set_video_id_from_playlist_cached(mocker: MockerFixture,
                                                             cache_values=True)
     assert result is True
     assert mock_dl.call_count == 3
+
+
+@pytest.mark.anyio
+async def test_download_page_cache_only(mocker: MockerFixture, client: YouTubeClient) -> None:
+    download = mocker.patch('youtube_unofficial.client.download_page',
+                            new_callable=AsyncMock,
+                            return_value='<html></html>')
+    limiter = mocker.AsyncMock()
+    client.rate_limiter = limiter
+    client.cache_only = True
+    await client._download_page(  # ruff:ignore[private-member-access]
+        'https://www.youtube.com/feed/history')
+    assert download.call_args.kwargs['only_if_cached'] is True
+    limiter.wait.assert_not_awaited()
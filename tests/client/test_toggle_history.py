@@ -32,3 +32,31 @@ async def test_toggle_history(mocker: MockerFixture, client: YouTubeClient,
     mocker.patch('youtube_unofficial.client.download_page', side_effect=fake_dl)
     result = await client.toggle_watch_history()
     assert result is True
+
+
+@pytest.mark.anyio
+async def test_toggle_history_capture_sink(mocker: MockerFixture, client: YouTubeClient,
+                                           data_path: Path) -> None:
+    mocker.patch('youtube_unofficial.client.Soup')
+    mocker.patch('youtube_unofficial.client.find_ytcfg',
+                 return_value={
+                     'USER_SESSION_ID': 'test_session_id',
+                     'INNERTUBE_CONTEXT_CLIENT_VERSION': '1.0'
+                 })
+    mocker.patch('youtube_unofficial.client.initial_data',
+                 return_value=json.loads((data_path / 'toggle-history-00.json').read_text()))
+    response = {'feedbackResponses': [{'isProcessed': True}]}
+
+    async def fake_dl(*args: Any, **kwargs: Any) -> str | dict[str, Any]:
+        if kwargs.get('return_json'):
+            return response
+        return '<html></html>'
+
+    mocker.patch('youtube_unofficial.client.download_page', side_effect=fake_dl)
+    sink = mocker.MagicMock()
+    client.capture_sink = sink
+    assert await client.toggle_watch_history() is True
+    url, request, captured = sink.call_args.args
+    assert url == 'https://www.youtube.com/youtubei/v1/feedback'
+    assert request['context']['client'] == {'clientName': 'WEB', 'clientVersion': '1.0'}
+    assert captured is response
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, NoReturn, cast
+import json
 import os
 
 from click.testing import CliRunner
@@ -15,6 +16,8 @@ if TYPE_CHECKING:
 
     from pytest_mock import MockerFixture
 
+pytest_plugins = ('youtube_unofficial.testing.pytest_plugin',)
+
 if os.getenv('_PYTEST_RAISE', '0') != '0':  # pragma no cover
 
     @pytest.hookimpl(tryfirst=True)
@@ -32,6 +35,20 @@ def runner() -> CliRunner:
     return CliRunner()
 
 
+@pytest.fixture
+def mock_build_session(mocker: MockerFixture) -> None:
+    mock_session = mocker.AsyncMock(spec=niquests.AsyncSession)
+    mock_session.__aenter__.return_value = mock_session
+    mock_session.__aexit__.return_value = None
+
+    async def _build(browser: str,
+                     profile: str,
+                     delegated_session_id: str | None = None) -> niquests.AsyncSession:
+        return cast('niquests.AsyncSession', mock_session)
+
+    mocker.patch('youtube_unofficial.pool.build_youtube_session', side_effect=_build)
+
+
 @pytest.fixture
 def mock_cookie_jar(mocker: MockerFixture) -> MagicMock:
     mock_jar = mocker.MagicMock()
@@ -66,6 +83,7 @@ def make_niquests_response(mocker: MockerFixture,
     r = mocker.MagicMock()
     r.text = text.strip() if text else ''
     r.json = mocker.MagicMock(return_value=json_data if json_data is not None else {})
+    r.content = json.dumps(json_data if json_data is not None else {}).encode()
     r.raise_for_status = mocker.MagicMock()
     r.status_code = status_code
     return cast('MagicMock', r)
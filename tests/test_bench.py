@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+import json
+import statistics
+
+from benchmarks.bench import RESULTS_VERSION, Thresholds, compare_results, main
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from click.testing import CliRunner
+
+
+def test_bench_list(runner: CliRunner) -> None:
+    result = runner.invoke(main, ['list'])
+    assert result.exit_code == 0
+    assert 'history.extract' in result.output
+    assert 'playlist.clear' in result.output
+    assert 'parse.threads' in result.output
+
+
+def test_bench_run(runner: CliRunner, tmp_path: Path) -> None:
+    output = tmp_path / 'results.json'
+    result = runner.invoke(main, [
+        'run', '--history-size', '30', '--playlist-size', '20', '--page-size', '10', '--threads',
+        '2', '-r', '2', '-k', 'history.*', '-k', 'playlist.*', '-k', 'import.main', '-k',
+        'parse.threads', '-o',
+        str(output)
+    ])
+    assert result.exit_code == 0, result.output
+    assert 'history.remove' in result.output
+    results = json.loads(output.read_text())
+    assert results['version'] == RESULTS_VERSION
+    assert results['options']['history_size'] == 30
+    assert results['options']['threads'] == 2
+    assert results['python'].startswith('CPython ')
+    assert set(results['benchmarks']) == {
+        'history.extract', 'history.remove', 'history.threads', 'import.main', 'parse.threads',
+        'playlist.clear', 'playlist.paging'
+    }
+    assert 0 < results['benchmarks']['import.main']['median'] < 1
+    assert results['peak_rss'] > 0
+    extract = results['benchmarks']['history.extract']
+    assert extract['items'] == 30
+    assert extract['pages'] == 3
+    assert len(extract['samples']) == 2
+    assert extract['peak_memory'] > 0
+    assert extract['seconds_per_1k_items'] > 0
+    assert results['benchmarks']['playlist.clear']['items'] == 20
+    assert results['benchmarks']['history.threads']['items'] == 60
+    assert results['benchmarks']['history.threads']['pages'] == 6
+    assert results['benchmarks']['parse.threads']['items'] == 2
+
+
+def _results(samples: list[float], *, peak_memory: int = 1000, peak_rss: int = 10_000) -> Any:
+    return {
+        'options': {
+            'history_size': 100
+        },
+        'benchmarks': {
+            'parse.soup': {
+                'samples': samples,
+                'items': 1,
+                'median': statistics.median(samples),
+                'seconds_per_1k_items': statistics.median(samples) * 1000,
+                'peak_memory': peak_memory
+            },
+            'history.extract': {
+                'samples': [x * 10 for x in samples],
+                'items': 100,
+                'median': statistics.median(samples) * 10,
+                'seconds_per_1k_items': statistics.median(samples) * 100,
+                'peak_memory': peak_memory
+            },
+            'import.main': {
+                'samples': samples,
+                'items': 1,
+                'median': statistics.median(samples),
+                'seconds_per_1k_items': statistics.median(samples) * 1000,
+                'peak_memory': 0
+            }
+        },
+        'peak_rss': peak_rss
+    }
+
+
+def test_compare_results() -> None:
+    baseline = _results([1.0, 1.01, 0.99, 1.02, 0.98])
+    assert not any(x.regression for x in compare_results(baseline, baseline))
+    slower = _results([1.5, 1.51, 1.49, 1.52, 1.48])
+    comparisons = {x.metric: x for x in compare_results(baseline, slower)}
+    assert comparisons['parse.soup:median'].regression
+    assert comparisons['history.extract:seconds_per_1k_items'].regression
+    assert comparisons['import.main:median'].regression
+    assert 'import.main:peak_memory' not in comparisons
+    assert not comparisons['peak_rss'].regression
+    # A large change that is not significant is not a regression.
+    noisy = _results([0.5, 2.0, 0.6, 1.9, 0.7])
+    assert not any(x.regression for x in compare_results(baseline, noisy, Thresholds(parse=0.01)))
+    # Below the threshold.
+    assert not any(x.regression for x in compare_results(baseline, slower, Thresholds(1, 1, 1)))
+    bigger = _results([1.0, 1.01, 0.99, 1.02, 0.98], peak_memory=2000, peak_rss=20_000)
+    assert {x.metric
+            for x in compare_results(baseline, bigger) if x.regression} == {
+                'parse.soup:peak_memory', 'history.extract:peak_memory', 'peak_rss'
+            }
+
+
+def test_bench_compare(runner: CliRunner, tmp_path: Path) -> None:
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(json.dumps(_results([1.0, 1.01, 0.99, 1.02, 0.98])))
+    current = tmp_path / 'current.json'
+    current.write_text(json.dumps(_results([1.0, 1.01, 0.99, 1.02, 0.98])))
+    result = runner.invoke(main, ['compare', str(baseline), str(current)])
+    assert result.exit_code == 0
+    assert 'REGRESSION' not in result.output
+    slower = _results([1.5, 1.51, 1.49, 1.52, 1.48])
+    slower['options']['history_size'] = 200
+    slower['python'] = 'CPython 3.14.0 (free-threaded)'
+    current.write_text(json.dumps(slower))
+    result = runner.invoke(main, ['compare', str(baseline), str(current)])
+    assert result.exit_code == 1
+    assert 'parse.soup:median' in result.output
+    assert 'REGRESSION' in result.output
+    assert 'different options' in result.output
+    assert 'with CPython 3.14.0 (free-threaded).' in result.output
+    result = runner.invoke(main, [
+        'compare', '--parse-threshold', '1', '--item-threshold', '1', '--import-threshold', '1',
+        str(baseline),
+        str(current)
+    ])
+    assert result.exit_code == 0
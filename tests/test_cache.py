@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock
+
+from niquests_cache.backends import MemoryBackend
+from youtube_unofficial.cache import (
+    HAS_ZSTD,
+    BoundedSQLiteBackend,
+    CacheMissError,
+    CachePolicy,
+    RequestClass,
+    YouTubeCachedSession,
+    ZstdSQLiteBackend,
+    cache_dir,
+    cache_namespace,
+)
+import niquests
+import pytest
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from niquests_cache.typing import CacheEntry
+    from pytest_mock import MockerFixture
+
+BROWSE_URL = 'https://www.youtube.com/youtubei/v1/browse?key=k'
+
+
+def _entry(ts: float) -> CacheEntry:
+    return {
+        'content': b'body',
+        'encoding': 'utf-8',
+        'headers': {
+            'content-type': 'text/html'
+        },
+        'status_code': 200,
+        'ts': ts,
+        'url': 'https://www.youtube.com/feed/history'
+    }
+
+
+def _response(url: str, content: bytes = b'{}', status_code: int = 200) -> niquests.Response:
+    resp = niquests.Response()
+    resp.status_code = status_code
+    resp._content = content  # ruff:ignore[private-member-access]
+    resp._content_consumed = True  # ruff:ignore[private-member-access]
+    resp.url = url
+    return resp
+
+
+def test_cache_namespace() -> None:
+    assert cache_namespace('chrome', 'Default') == 'chrome-Default'
+    assert cache_namespace('chrome', 'Profile 1', '42') == 'chrome-Profile_1-42'
+    assert cache_namespace('chrome', '../x') == 'chrome-.._x'
+
+
+def test_cache_dir() -> None:
+    assert cache_dir('chrome-Default').name == 'chrome-Default'
+
+
+def test_bounded_backend_get_set(tmp_path: Path) -> None:
+    backend = BoundedSQLiteBackend(tmp_path / 'sub/http.sqlite')
+    assert backend.get('a') is None
+    backend.set('a', _entry(1))
+    assert backend.get('a') == _entry(1)
+    assert len(backend) == 1
+    backend.close()
+
+
+def test_bounded_backend_evicts_oldest() -> None:
+    backend = BoundedSQLiteBackend(':memory:', max_entries=2)
+    backend.set('a', _entry(1))
+    backend.set('b', _entry(2))
+    backend.set('c', _entry(3))
+    assert len(backend) == 2
+    assert backend.get('a') is None
+    assert backend.get('c') is not None
+
+
+def test_bounded_backend_delete_urls() -> None:
+    backend = BoundedSQLiteBackend(':memory:')
+    backend.set('a', _entry(1))
+    backend.set('b', _entry(2) | {'url': 'https://www.youtube.com/youtubei/v1/browse?key=k'})
+    backend.set('c', _entry(3) | {'url': 'https://www.youtube.com/playlist?list=WL'})
+    assert backend.delete_urls('https://www.youtube.com/feed/history',
+                               'https://www.youtube.com/youtubei/v1/browse*') == 2
+    assert len(backend) == 1
+    assert backend.get('c') is not None
+
+
+@pytest.mark.parametrize(('method', 'url', 'expected'), [
+    ('GET', 'https://www.youtube.com/feed/history', RequestClass.BOOTSTRAP),
+    ('get', 'https://www.youtube.com/playlist?list=WL', RequestClass.BOOTSTRAP),
+    ('POST', BROWSE_URL, RequestClass.BROWSE),
+    ('POST', 'https://www.youtube.com/youtubei/v1/browse/edit_playlist',
+     RequestClass.EDIT_PLAYLIST),
+    ('post', 'https://www.youtube.com/youtubei/v1/feedback', RequestClass.FEEDBACK),
+    ('GET', 'https://www.youtube.com/', RequestClass.OTHER),
+    ('POST', 'https://www.youtube.com/playlist?list=WL', RequestClass.OTHER),
+])
+def test_cache_policy_classify(method: str, url: str, expected: RequestClass) -> None:
+    assert CachePolicy.classify(method, url) == expected
+
+
+def test_cache_policy_ttls() -> None:
+    policy = CachePolicy({
+        RequestClass.BROWSE: None,
+        RequestClass.FEEDBACK: timedelta(hours=1),
+    })
+    assert policy.ttls[RequestClass.BROWSE] is None
+    assert policy.ttls[RequestClass.FEEDBACK] is None
+    assert policy.ttls[RequestClass.BOOTSTRAP] == timedelta(minutes=10)
+
+
+def test_cache_policy_browse_cache_key() -> None:
+    key = CachePolicy.browse_cache_key(BROWSE_URL, {'continuation': 'a'})
+    assert key is not None
+    assert key == CachePolicy.browse_cache_key(BROWSE_URL.replace('k', 'other'), {
+        'continuation': 'a',
+        'context': {}
+    })
+    assert key != CachePolicy.browse_cache_key(BROWSE_URL, {'continuation': 'b'})
+    assert CachePolicy.browse_cache_key(BROWSE_URL, {'browseId': 'FEhistory'}) is None
+    assert CachePolicy.browse_cache_key(BROWSE_URL, None) is None
+
+
+def test_cache_policy_invalidated_urls() -> None:
+    assert CachePolicy.invalidated_urls(RequestClass.FEEDBACK,
+                                        {}) == ('https://www.youtube.com/feed/history',
+                                                'https://www.youtube.com/youtubei/v1/browse*')
+    assert CachePolicy.invalidated_urls(
+        RequestClass.EDIT_PLAYLIST,
+        {'playlistId': 'WL'}) == ('https://www.youtube.com/playlist?list=WL',
+                                  'https://www.youtube.com/youtubei/v1/browse*')
+    assert CachePolicy.invalidated_urls(RequestClass.BROWSE, {}) == ()
+
+
+@pytest.mark.anyio
+async def test_cached_session_browse(mocker: MockerFixture) -> None:
+    send = mocker.patch.object(niquests.AsyncSession,
+                               'request',
+                               new_callable=AsyncMock,
+                               side_effect=lambda *_, **__: _response(BROWSE_URL))
+    session = YouTubeCachedSession(backend=BoundedSQLiteBackend(':memory:'))
+    for _ in range(2):
+        resp = await session.request('POST', BROWSE_URL, json={'continuation': 'a'})
+        assert resp.json() == {}
+    await session.request('POST', BROWSE_URL, json={'continuation': 'b'})
+    await session.request('POST', BROWSE_URL, json={'browseId': 'FEhistory'})
+    assert send.await_count == 3
+
+
+@pytest.mark.anyio
+async def test_cached_session_browse_expired(mocker: MockerFixture) -> None:
+    send = mocker.patch.object(niquests.AsyncSession,
+                               'request',
+                               new_callable=AsyncMock,
+                               side_effect=lambda *_, **__: _response(BROWSE_URL))
+    session = YouTubeCachedSession(backend=BoundedSQLiteBackend(':memory:'),
+                                   cache_policy=CachePolicy(
+                                       {RequestClass.BROWSE: timedelta(seconds=-1)}))
+    await session.request('POST', BROWSE_URL, json={'continuation': 'a'})
+    await session.request('POST', BROWSE_URL, json={'continuation': 'a'})
+    assert send.await_count == 2
+
+
+@pytest.mark.anyio
+async def test_cached_session_mutation_invalidates(mocker: MockerFixture) -> None:
+    send = mocker.patch.object(niquests.AsyncSession,
+                               'request',
+                               new_callable=AsyncMock,
+                               side_effect=lambda _method, url, *_, **__: _response(url))
+    backend = BoundedSQLiteBackend(':memory:')
+    session = YouTubeCachedSession(backend=backend)
+    await session.request('POST', BROWSE_URL, json={'continuation': 'a'})
+    assert len(backend) == 1
+    await session.request('POST',
+                          'https://www.youtube.com/youtubei/v1/browse/edit_playlist',
+                          json={'playlistId': 'WL'})
+    assert len(backend) == 0
+    await session.request('POST', BROWSE_URL, json={'continuation': 'a'})
+    assert send.await_count == 3
+
+
+@pytest.mark.anyio
+async def test_cached_session_failed_mutation_keeps_cache(mocker: MockerFixture) -> None:
+    mocker.patch.object(niquests.AsyncSession,
+                        'request',
+                        new_callable=AsyncMock,
+                        side_effect=lambda _method, url, *_, **__: _response(
+                            url, status_code=200 if 'browse?' in url else 500))
+    backend = BoundedSQLiteBackend(':memory:')
+    session = YouTubeCachedSession(backend=backend)
+    await session.request('POST', BROWSE_URL, json={'continuation': 'a'})
+    await session.request('POST', 'https://www.youtube.com/youtubei/v1/feedback', json={})
+    assert len(backend) == 1
+
+
+@pytest.mark.anyio
+async def test_cached_session_invalidate_unsupported_backend(mocker: MockerFixture) -> None:
+    mocker.patch.object(niquests.AsyncSession,
+                        'request',
+                        new_callable=AsyncMock,
+                        side_effect=lambda _method, url, *_, **__: _response(url))
+    session = YouTubeCachedSession(backend=MemoryBackend())
+    resp = await session.request('POST', 'https://www.youtube.com/youtubei/v1/feedback', json={})
+    assert resp.status_code == 200
+
+
+@pytest.mark.anyio
+async def test_cached_session_get_uses_ttl(mocker: MockerFixture) -> None:
+    send = mocker.patch.object(
+        niquests.AsyncSession,
+        'request',
+        new_callable=AsyncMock,
+        side_effect=lambda _method, url, *_, **__: _response(url, b'<html></html>'))
+    session = YouTubeCachedSession(backend=BoundedSQLiteBackend(':memory:'))
+    for _ in range(2):
+        await session.request('GET', 'https://www.youtube.com/feed/history')
+    assert send.await_count == 1
+
+
+@pytest.mark.anyio
+async def test_cached_session_only_if_cached(mocker: MockerFixture) -> None:
+    send = mocker.patch.object(
+        niquests.AsyncSession,
+        'request',
+        new_callable=AsyncMock,
+        side_effect=lambda _method, url, *_, **__: _response(url, b'<html></html>'))
+    session = YouTubeCachedSession(backend=BoundedSQLiteBackend(':memory:'),
+                                   cache_policy=CachePolicy({
+                                       RequestClass.BOOTSTRAP: timedelta(seconds=-1),
+                                       RequestClass.BROWSE: timedelta(seconds=-1)
+                                   }))
+    await session.request('GET', 'https://www.youtube.com/feed/history')
+    await session.request('POST', BROWSE_URL, json={'continuation': 'a'})
+    assert send.await_count == 2
+    resp = await session.request('GET', 'https://www.youtube.com/feed/history', only_if_cached=True)
+    assert resp.text == '<html></html>'
+    resp = await session.request('POST',
+                                 BROWSE_URL,
+                                 json={'continuation': 'a'},
+                                 only_if_cached=True)
+    assert resp.text == '<html></html>'
+    assert send.await_count == 2
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(('method', 'url', 'json_data'), [
+    ('GET', 'https://www.youtube.com/feed/history', None),
+    ('POST', BROWSE_URL, {
+        'continuation': 'a'
+    }),
+    ('POST', BROWSE_URL, {
+        'browseId': 'FEhistory'
+    }),
+    ('POST', 'https://www.youtube.com/youtubei/v1/feedback', {}),
+])
+async def test_cached_session_only_if_cached_miss(mocker: MockerFixture, method: str, url: str,
+                                                  json_data: object) -> None:
+    send = mocker.patch.object(niquests.AsyncSession, 'request', new_callable=AsyncMock)
+    session = YouTubeCachedSession(backend=BoundedSQLiteBackend(':memory:'))
+    with pytest.raises(CacheMissError, match=r'^No cached response for '):
+        await session.request(method, url, json=json_data, only_if_cached=True)
+    send.assert_not_awaited()
+
+
+@pytest.mark.skipif(not HAS_ZSTD, reason='zstd is not available')
+def test_zstd_backend_get_set(tmp_path: Path) -> None:
+    backend = ZstdSQLiteBackend(tmp_path / 'http.zst.sqlite')
+    entry = _entry(1) | {'content': b'<html>' * 1000}
+    assert backend.get('a') is None
+    backend.set('a', entry)
+    assert backend.get('a') == entry
+    assert 0 < backend.size < len(entry['content'])
+    assert (backend.hits, backend.misses, backend.evictions) == (1, 1, 0)
+    backend.close()
+    backend.close()
+
+
+@pytest.mark.skipif(not HAS_ZSTD, reason='zstd is not available')
+def test_zstd_backend_evicts_least_recently_used() -> None:
+    backend = ZstdSQLiteBackend(':memory:', max_entries=2)
+    backend.set('a', _entry(1))
+    backend.set('b', _entry(2))
+    assert backend.get('a') is not None
+    backend.set('c', _entry(3))
+    assert backend.get('b') is None
+    assert backend.get('a') is not None
+    assert backend.evictions == 1
+
+
+@pytest.mark.skipif(not HAS_ZSTD, reason='zstd is not available')
+def test_zstd_backend_byte_budget() -> None:
+    backend = ZstdSQLiteBackend(':memory:', max_bytes=None)
+    backend.set('a', _entry(1))
+    entry_size = backend.size
+    backend.max_bytes = entry_size * 2
+    backend.set('b', _entry(2))
+    assert backend.get('a') is not None
+    backend.set('c', _entry(3))
+    assert len(backend) == 2
+    assert backend.get('b') is None
+    assert backend.size <= entry_size * 2
+    assert backend.evictions == 1
+
+
+@pytest.mark.skipif(not HAS_ZSTD, reason='zstd is not available')
+def test_zstd_backend_threads() -> None:
+    backend = ZstdSQLiteBackend(':memory:', max_entries=50)
+
+    def work(n: int) -> None:
+        for i in range(20):
+            backend.set(f'{n}-{i}', _entry(i))
+            backend.get(f'{n}-{i}')
+            backend.get(f'missing-{n}-{i}')
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(work, range(8)))
+    assert len(backend) == 50
+    assert backend.hits + backend.misses == 320
+    assert backend.misses >= 160
+    assert backend.evictions == 110
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING, cast
+import json
 
 from youtube_unofficial.download import download_page
 import pytest
@@ -41,7 +42,7 @@ async def test_download_page_text_empty(mocker: MockerFixture) -> None:
 async def test_download_page_json(mocker: MockerFixture) -> None:
     expected = {'key': 'value'}
     mock_resp = mocker.MagicMock()
-    mock_resp.json.return_value = expected
+    mock_resp.content = json.dumps(expected).encode()
     mock_resp.raise_for_status = mocker.MagicMock()
     mock_session = mocker.AsyncMock()
     mock_session.headers = {}
@@ -66,3 +67,17 @@ async def test_download_page_merges_headers(mocker: MockerFixture) -> None:
     assert 'Accept-Encoding' not in passed_headers
     assert passed_headers['X-Custom'] == 'val'
     assert passed_headers['User-Agent'] == 'test'
+
+
+@pytest.mark.anyio
+async def test_download_page_only_if_cached(mocker: MockerFixture) -> None:
+    mock_resp = mocker.MagicMock()
+    mock_resp.text = 'ok'
+    mock_session = mocker.AsyncMock()
+    mock_session.headers = {}
+    mock_session.request.return_value = mock_resp
+    sess = cast('niquests.AsyncSession', mock_session)
+    await download_page(sess, 'https://example.com', return_json=False)
+    assert 'only_if_cached' not in mock_session.request.call_args.kwargs
+    await download_page(sess, 'https://example.com', return_json=False, only_if_cached=True)
+    assert mock_session.request.call_args.kwargs['only_if_cached'] is True
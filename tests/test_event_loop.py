@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import asyncio
+import sys
+
+from youtube_unofficial.client import YouTubeClient
+from youtube_unofficial.event_loop import available_loops, backend_options
+from youtube_unofficial.main import main
+import anyio
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+    from click.testing import CliRunner
+    from pytest_mock import MockerFixture
+
+HAS_UVLOOP = 'uvloop' in available_loops()
+
+
+def test_backend_options(mocker: MockerFixture) -> None:
+    assert backend_options() == {}
+    with pytest.raises(ValueError, match='Unknown event loop'):
+        backend_options('trio')  # type: ignore[arg-type]
+    mocker.patch.dict(sys.modules, {'uvloop': None})
+    with pytest.raises(ImportError, match=r'youtube-unofficial\[uvloop\]'):
+        backend_options('uvloop')
+
+
+@pytest.mark.skipif(not HAS_UVLOOP, reason='uvloop is not installed')
+def test_backend_options_uvloop() -> None:
+    async def loop_module() -> str:
+        return type(asyncio.get_running_loop()).__module__
+
+    assert anyio.run(loop_module, backend_options=backend_options('uvloop')).startswith('uvloop')
+    assert anyio.run(loop_module, backend_options=backend_options()).startswith('asyncio')
+
+
+async def _history(self: YouTubeClient, *args: object,
+                   **kwargs: object) -> AsyncGenerator[str, None]:
+    yield type(asyncio.get_running_loop()).__module__.partition('.')[0]
+
+
+@pytest.mark.skipif(not HAS_UVLOOP, reason='uvloop is not installed')
+def test_main_loop(mocker: MockerFixture, runner: CliRunner, mock_build_session: None) -> None:
+    mocker.patch.object(YouTubeClient, 'get_history_video_ids', _history)
+    result = runner.invoke(main, ['print-history'])
+    assert result.exit_code == 0
+    assert result.output == 'asyncio\n'
+    result = runner.invoke(main, ['--loop', 'uvloop', 'print-history'])
+    assert result.exit_code == 0
+    assert result.output == 'uvloop\n'
+    result = runner.invoke(main, ['print-history'], env={'YOUTUBE_UNOFFICIAL_LOOP': 'uvloop'})
+    assert result.exit_code == 0
+    assert result.output == 'uvloop\n'
+
+
+def test_main_loop_not_installed(mocker: MockerFixture, runner: CliRunner,
+                                 mock_build_session: None) -> None:
+    mocker.patch.object(YouTubeClient, 'get_history_video_ids', _history)
+    mocker.patch.dict(sys.modules, {'uvloop': None})
+    result = runner.invoke(main, ['--loop', 'uvloop', 'print-history'])
+    assert result.exit_code == 1
+    assert 'uvloop is not installed' in result.output
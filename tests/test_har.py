@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+import json
+
+from youtube_unofficial.download import download_page
+from youtube_unofficial.har import REDACTED, RecordingMissError, RecordingSession, ReplaySession
+import niquests
+import pytest
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+BROWSE_URL = 'https://www.youtube.com/youtubei/v1/browse'
+
+
+def _response(text: str) -> niquests.Response:
+    resp = niquests.Response()
+    resp.status_code = 200
+    resp.reason = 'OK'
+    resp._content = text.encode()  # ruff:ignore[private-member-access]
+    resp.headers.update({'content-type': 'application/json', 'set-cookie': 'SID=secret'})
+    resp.encoding = 'utf-8'
+    return resp
+
+
+@pytest.fixture
+def recorder(mocker: MockerFixture) -> RecordingSession:
+    session = niquests.AsyncSession()
+    session.cookies.set('SAPISID', 'secret')  # type: ignore[no-untyped-call]
+    answers = iter(('{"page": 1}', '{"page": 2}', '<html></html>'))
+
+    async def request(*args: Any, **kwargs: Any) -> niquests.Response:
+        return _response(next(answers))
+
+    mocker.patch.object(session, 'request', side_effect=request)
+    return RecordingSession(session)
+
+
+async def _browse(session: niquests.AsyncSession) -> dict[str, Any]:
+    return await download_page(session,
+                               BROWSE_URL,
+                               method='post',
+                               params={'key': 'k'},
+                               headers={
+                                   'Authorization': 'SAPISIDHASH 1_abc',
+                                   'x-origin': 'https://www.youtube.com'
+                               },
+                               json={'continuation': 'a'},
+                               return_json=True)
+
+
+@pytest.mark.anyio
+async def test_recording_session(recorder: RecordingSession, tmp_path: Path) -> None:
+    assert await _browse(recorder) == {'page': 1}
+    assert await _browse(recorder) == {'page': 2}
+    assert await download_page(recorder, 'https://www.youtube.com/feed/history',
+                               return_json=False) == '<html></html>'
+    recorder.save(tmp_path / 'session.har')
+    har = json.loads((tmp_path / 'session.har').read_text(encoding='utf-8'))
+    assert har['log']['version'] == '1.2'
+    first, _, last = har['log']['entries']
+    assert first['request']['url'] == f'{BROWSE_URL}?key=k'
+    assert first['request']['postData']['text'] == '{"continuation":"a"}'
+    assert first['request']['cookies'] == [{'name': 'SAPISID', 'value': REDACTED}]
+    headers = {x['name']: x['value'] for x in first['request']['headers']}
+    assert headers['Authorization'] == REDACTED
+    assert headers['x-origin'] == 'https://www.youtube.com'
+    response_headers = {x['name']: x['value'] for x in first['response']['headers']}
+    assert response_headers['set-cookie'] == REDACTED
+    assert first['response']['content']['text'] == '{"page": 1}'
+    assert 'postData' not in last['request']
+    assert 'secret' not in (tmp_path / 'session.har').read_text(encoding='utf-8')
+
+
+@pytest.mark.anyio
+async def test_replay_session(recorder: RecordingSession, tmp_path: Path) -> None:
+    await _browse(recorder)
+    await _browse(recorder)
+    await download_page(recorder, 'https://www.youtube.com/feed/history', return_json=False)
+    recorder.save(tmp_path / 'session.har')
+    replay = ReplaySession(tmp_path / 'session.har')
+    assert replay.cookies.get('SAPISID') == REDACTED  # type: ignore[no-untyped-call]
+    assert await _browse(replay) == {'page': 1}
+    assert await _browse(replay) == {'page': 2}
+    assert await _browse(replay) == {'page': 2}
+    assert await download_page(replay, 'https://www.youtube.com/feed/history',
+                               return_json=False) == '<html></html>'
+    replay = ReplaySession(recorder.har())
+    assert await _browse(replay) == {'page': 1}
+    with pytest.raises(RecordingMissError,
+                       match=r'^No recorded response for GET https://www.youtube.com/\.$'):
+        await download_page(replay, 'https://www.youtube.com/', return_json=False)
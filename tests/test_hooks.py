@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from types import AsyncGeneratorType
+from typing import TYPE_CHECKING
+
+from youtube_unofficial.client import YouTubeClient
+from youtube_unofficial.download import download_page
+from youtube_unofficial.hooks import ItemEvent, MutationEvent, RequestEvent
+import niquests
+import pytest
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+    from youtube_unofficial.testing.server import InnerTubeServer
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return 'asyncio'
+
+
+@pytest.mark.anyio
+@pytest.mark.innertube_server(playlists={'WL': 3}, page_size=2)
+async def test_playlist_hooks(innertube_server: InnerTubeServer) -> None:
+    requests: list[RequestEvent] = []
+    items: list[ItemEvent] = []
+    mutations: list[MutationEvent] = []
+    async with innertube_server.session() as session:
+        client = YouTubeClient(session,
+                               on_request=requests.append,
+                               on_item=items.append,
+                               on_mutation=mutations.append)
+        video_ids = [x async for x in client.get_playlist_video_ids('WL')]
+        await client.clear_watch_later()
+    assert [(x.generator, x.position) for x in items
+            if x.generator == 'get_playlist_video_ids'] == [('get_playlist_video_ids', 0),
+                                                            ('get_playlist_video_ids', 1),
+                                                            ('get_playlist_video_ids', 2)]
+    assert [x.item for x in items if x.generator == 'get_playlist_video_ids'] == video_ids
+    # get_playlist_video_ids reads get_playlist_info without reporting its items again.
+    assert [x.generator
+            for x in items] == (['get_playlist_video_ids'] * 3 + ['get_playlist_info'] * 3)
+    assert mutations == [
+        MutationEvent('edit_playlist', succeeded=True, playlist_id='WL', video_id=x)
+        for x in video_ids
+    ]
+    assert [(x.phase, x.method, x.url) for x in requests[:4]
+            ] == [('start', 'GET', 'https://www.youtube.com/playlist?list=WL'),
+                  ('end', 'GET', 'https://www.youtube.com/playlist?list=WL'),
+                  ('start', 'POST', 'https://www.youtube.com/youtubei/v1/browse'),
+                  ('end', 'POST', 'https://www.youtube.com/youtubei/v1/browse')]
+    ends = [x for x in requests if x.phase == 'end']
+    assert len(ends) * 2 == len(requests)
+    assert all(x.status == 200 and x.duration > 0 and x.response_bytes > 0 for x in ends)
+    assert all(x.request_bytes > 0 for x in ends if x.method == 'POST')
+
+
+@pytest.mark.anyio
+@pytest.mark.innertube_server(history_size=5, page_size=10)
+async def test_history_mutation_hook(innertube_server: InnerTubeServer) -> None:
+    mutations: list[MutationEvent] = []
+    async with innertube_server.session() as session:
+        client = YouTubeClient(session, on_mutation=mutations.append)
+        video_ids = [x async for x in client.get_history_video_ids()]
+        assert await client.remove_video_ids_from_history(video_ids[:2])
+    assert mutations == [
+        MutationEvent('feedback', succeeded=True, video_id=x) for x in video_ids[:2]
+    ]
+
+
+def test_no_hooks_returns_generator(mocker: MockerFixture) -> None:
+    items = YouTubeClient(mocker.MagicMock()).get_history_info()
+    assert isinstance(items, AsyncGeneratorType)
+    assert items.ag_code.co_name == 'get_history_info'
+
+
+@pytest.mark.anyio
+async def test_download_page_request_hook(mocker: MockerFixture) -> None:
+    events: list[RequestEvent] = []
+    session = mocker.AsyncMock(spec=niquests.AsyncSession)
+    session.headers = {}
+    session.request.side_effect = niquests.ConnectionError
+    with pytest.raises(niquests.ConnectionError):
+        await download_page(session,
+                            'https://example.com/a',
+                            return_json=False,
+                            on_request=events.append)
+    assert [(x.phase, x.status) for x in events] == [('start', None), ('end', None)]
+    assert isinstance(events[1].error, niquests.ConnectionError)
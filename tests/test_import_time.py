@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import subprocess as sp
+import sys
+
+HEAVY_MODULES = frozenset({
+    'anyio', 'bascom', 'bs4', 'html5lib', 'niquests', 'niquests_cache', 'uvloop', 'yt_dlp',
+    'yt_dlp_utils'
+})
+# Cumulative import time of youtube_unofficial.main in microseconds. This is several times the
+# measured value so that slow CI machines do not fail, but well below the time it takes to import
+# bs4 and niquests.
+IMPORT_TIME_BUDGET_US = 150_000
+
+
+def _import_times(module: str) -> dict[str, int]:
+    proc = sp.run((sys.executable, '-X', 'importtime', '-c', f'import {module}'),
+                  capture_output=True,
+                  check=True,
+                  text=True)
+    times: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = (x.strip() for x in line.removeprefix('import time:').split('|'))
+        times[name] = int(cumulative)
+    return times
+
+
+def test_main_does_not_import_heavy_modules() -> None:
+    times = _import_times('youtube_unofficial.main')
+    assert not {name.split('.')[0] for name in times} & HEAVY_MODULES
+
+
+def test_main_import_time_budget() -> None:
+    times = _import_times('youtube_unofficial.main')
+    assert times['youtube_unofficial.main'] < IMPORT_TIME_BUDGET_US
+
+
+def test_package_lazy_attributes() -> None:
+    from youtube_unofficial.client import YouTubeClient
+    from youtube_unofficial.pool import ClientPool
+    from youtube_unofficial.session import build_youtube_session
+    import youtube_unofficial
+    assert youtube_unofficial.ClientPool is ClientPool
+    assert youtube_unofficial.YouTubeClient is YouTubeClient
+    assert youtube_unofficial.build_youtube_session is build_youtube_session
+    assert not hasattr(youtube_unofficial, 'missing')
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import logging
+import os
+import subprocess as sp
+import sys
+
+from youtube_unofficial.json_codec import CODEC_NAMES, LazyJSON, available_codecs, get_codec
+import pytest
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+    from youtube_unofficial.json_codec import CodecName
+
+OBJ = {'z': [1, 2.5, None, True], 'a': {'title': 'Café 日本'}}
+
+
+@pytest.mark.parametrize('name', available_codecs())
+def test_codecs_agree(name: CodecName) -> None:
+    codec = get_codec(name)
+    reference = get_codec('json')
+    assert codec.name == name
+    assert codec.loads(reference.dumps(OBJ)) == OBJ
+    assert codec.loads(reference.dumps(OBJ).encode()) == OBJ
+    assert codec.dumps(OBJ) == reference.dumps(OBJ)
+    assert codec.dumps(OBJ, sort_keys=True) == ('{"a":{"title":"Café 日本"},'
+                                                '"z":[1,2.5,null,true]}')
+    assert codec.dumps(OBJ, indent=True, sort_keys=True) == reference.dumps(OBJ,
+                                                                            indent=True,
+                                                                            sort_keys=True)
+
+
+@pytest.mark.parametrize('name', available_codecs())
+def test_codecs_raise_value_error(name: CodecName) -> None:
+    with pytest.raises(ValueError):  # ruff:ignore[pytest-raises-too-broad]
+        get_codec(name).loads('{"a": ')
+
+
+def test_get_codec_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv('YOUTUBE_UNOFFICIAL_JSON', 'json')
+    assert get_codec().name == 'json'
+    monkeypatch.setenv('YOUTUBE_UNOFFICIAL_JSON', 'yaml')
+    with pytest.raises(ValueError, match=r'^Unknown JSON codec: yaml\.$'):
+        get_codec()
+
+
+def test_get_codec_prefers_installed(mocker: MockerFixture,
+                                     monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv('YOUTUBE_UNOFFICIAL_JSON', raising=False)
+    mocker.patch.dict(sys.modules, {'orjson': None, 'msgspec': None, 'msgspec.json': None})
+    assert available_codecs() == ('json',)
+    assert get_codec().name == 'json'
+    assert CODEC_NAMES[-1] == 'json'
+
+
+def test_lazy_json() -> None:
+    assert str(LazyJSON({'b': 1, 'a': 'é'})) == '{"a":"é","b":1}'
+    assert str(LazyJSON(list(range(100)), max_length=10)) == '[0,1,2,3,4... (291 characters)'
+    assert len(str(LazyJSON(list(range(1000)), max_length=None))) == 3891
+
+
+def test_lazy_json_not_rendered_when_disabled(mocker: MockerFixture) -> None:
+    dumps = mocker.patch('youtube_unofficial.json_codec.dumps', return_value='{}')
+    log = logging.getLogger('test_lazy_json')
+    log.setLevel(logging.INFO)
+    log.debug('%s', LazyJSON({'a': 1}))
+    dumps.assert_not_called()
+    log.info('%s', LazyJSON({'a': 1}))
+    dumps.assert_called_once_with({'a': 1}, sort_keys=True)
+
+
+@pytest.mark.parametrize(('name', 'setup'), [('yaml', ''),
+                                             ('orjson', 'sys.modules["orjson"] = None; ')])
+def test_bad_codec_falls_back(name: str, setup: str) -> None:
+    code = (f'import sys; {setup}from youtube_unofficial.json_codec import codec; '
+            'from youtube_unofficial.main import main; print(codec.name)')
+    proc = sp.run((sys.executable, '-c', code),
+                  capture_output=True,
+                  check=True,
+                  env=os.environ | {'YOUTUBE_UNOFFICIAL_JSON': name},
+                  text=True)
+    assert proc.stdout == 'json\n'
+    assert 'Using the standard library JSON codec' in proc.stderr
+
+
+def test_bad_codec_help() -> None:
+    proc = sp.run((sys.executable, '-m', 'youtube_unofficial', '--help'),
+                  capture_output=True,
+                  check=False,
+                  env=os.environ | {'YOUTUBE_UNOFFICIAL_JSON': 'yaml'},
+                  text=True)
+    assert proc.returncode == 0
+    assert 'Usage:' in proc.stdout
@@ -2,30 +2,18 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, cast
 
+from youtube_unofficial import pool
 from youtube_unofficial.client import YouTubeClient
 from youtube_unofficial.main import main
-import niquests
-import pytest
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator
+    from collections.abc import AsyncGenerator, Iterable
+    from unittest.mock import MagicMock
 
     from click.testing import CliRunner
     from pytest_mock import MockerFixture
 
 
-@pytest.fixture
-def mock_build_session(mocker: MockerFixture) -> None:
-    mock_session = mocker.AsyncMock(spec=niquests.AsyncSession)
-    mock_session.__aenter__.return_value = mock_session
-    mock_session.__aexit__.return_value = None
-
-    async def _build(browser: str, profile: str) -> niquests.AsyncSession:
-        return cast('niquests.AsyncSession', mock_session)
-
-    mocker.patch('youtube_unofficial.commands.build_youtube_session', side_effect=_build)
-
-
 def test_main_help(runner: CliRunner, mock_build_session: None) -> None:
     result = runner.invoke(main, ['--help'])
     assert result.exit_code == 0
@@ -90,12 +78,47 @@ def test_print_history_json(mocker: MockerFixture, runner: CliRunner,
 
 def test_remove_history_entries(mocker: MockerFixture, runner: CliRunner,
                                 mock_build_session: None) -> None:
+    video_ids: list[str] = []
+
+    async def _remove(video_ids_: Iterable[str], *, batch_size: int) -> bool:
+        video_ids.extend(video_ids_)
+        return True
+
     method = mocker.patch('youtube_unofficial.client.YouTubeClient.remove_video_ids_from_history',
-                          mocker.AsyncMock(return_value=True))
+                          side_effect=_remove)
     result = runner.invoke(main, ['remove-history-entries', '1', '2'])
     assert result.exit_code == 0
     assert method.call_count == 1
-    method.assert_called_once_with(['1', '2'])
+    assert video_ids == ['1', '2']
+
+
+def test_remove_history_entries_stdin(mocker: MockerFixture, runner: CliRunner,
+                                      mock_build_session: None) -> None:
+    video_ids: list[str] = []
+    batch_sizes: list[int] = []
+
+    async def _remove(video_ids_: Iterable[str], *, batch_size: int) -> bool:
+        video_ids.extend(video_ids_)
+        batch_sizes.append(batch_size)
+        return True
+
+    mocker.patch('youtube_unofficial.client.YouTubeClient.remove_video_ids_from_history',
+                 side_effect=_remove)
+    result = runner.invoke(main, ['remove-history-entries', '--batch-size', '2', '1', '-'],
+                           input='2\n\n 3 \n')
+    assert result.exit_code == 0
+    assert video_ids == ['1', '2', '3']
+    assert batch_sizes == [2]
+
+
+def test_remove_video_id_from_file(mocker: MockerFixture, runner: CliRunner,
+                                   mock_build_session: None) -> None:
+    method = mocker.patch('youtube_unofficial.client.YouTubeClient.remove_video_id_from_playlist',
+                          mocker.AsyncMock(return_value=True))
+    result = runner.invoke(main, ['remove-video-id', 'id', '--from-file', '-'], input='1\n2\n')
+    assert result.exit_code == 0
+    assert method.call_count == 2
+    method.assert_called_with('id', '2', cache_values=True)
 
 
 def test_remove_watch_later_id(mocker: MockerFixture, runner: CliRunner,
@@ -155,3 +178,97 @@ def test_clear_watch_later(mocker: MockerFixture, runner: CliRunner,
     assert result.exit_code == 0
     assert method.call_count == 1
     assert 'Watch later queue cleared.' in result.output
+
+
+def test_print_watch_later_multiple_profiles(mocker: MockerFixture, runner: CliRunner,
+                                             mock_build_session: None) -> None:
+    mocker.patch.object(YouTubeClient, 'get_playlist_video_ids', _yield_one_str)
+    result = runner.invoke(main, ['print-watch-later', '-p', 'a', '-p', 'b'])
+    assert result.exit_code == 0
+    assert sorted(result.output.splitlines()) == ['a\t1234', 'b\t1234']
+
+
+def test_print_history_json_multiple_profiles(mocker: MockerFixture, runner: CliRunner,
+                                              mock_build_session: None) -> None:
+    mocker.patch.object(YouTubeClient, 'get_history_video_ids', _yield_one_dict)
+    result = runner.invoke(main, ['print-history', '--json', '-p', 'a', '-p', 'b'])
+    assert result.exit_code == 0
+    assert '{"fake": "object", "profile": "a", "z": 1}' in result.output
+    assert '{"fake": "object", "profile": "b", "z": 1}' in result.output
+
+
+def test_remove_history_entries_multiple_profiles(mocker: MockerFixture, runner: CliRunner,
+                                                  mock_build_session: None) -> None:
+    streams: list[Iterable[str]] = []
+
+    async def _remove(video_ids_: Iterable[str], *, batch_size: int) -> bool:
+        streams.append(video_ids_)
+        return True
+
+    mocker.patch('youtube_unofficial.client.YouTubeClient.remove_video_ids_from_history',
+                 side_effect=_remove)
+    result = runner.invoke(main, ['remove-history-entries', '-p', 'a', '-p', 'b', '-'],
+                           input='1\n2\n')
+    assert result.exit_code == 0
+    assert streams == [('1', '2'), ('1', '2')]
+
+
+def test_remove_watch_later_id_multiple_profiles(mocker: MockerFixture, runner: CliRunner,
+                                                 mock_build_session: None) -> None:
+    method = mocker.patch('youtube_unofficial.client.YouTubeClient.remove_video_id_from_playlist',
+                          mocker.AsyncMock(return_value=True))
+    result = runner.invoke(main, ['remove-watch-later-video-id', '-p', 'a', '-p', 'b', '-'],
+                           input='1\n2\n')
+    assert result.exit_code == 0
+    assert method.call_count == 4
+
+
+def test_clear_watch_later_multiple_profiles(mocker: MockerFixture, runner: CliRunner,
+                                             mock_build_session: None) -> None:
+    method = mocker.patch('youtube_unofficial.client.YouTubeClient.clear_watch_later',
+                          mocker.AsyncMock(return_value=None))
+    result = runner.invoke(main,
+                           ['clear-watch-later', '-p', 'a', '-p', 'b', '--request-interval', '1'])
+    assert result.exit_code == 0
+    assert method.call_count == 2
+    assert 'a: Watch later queue cleared.' in result.output
+    assert 'b: Watch later queue cleared.' in result.output
+
+
+def test_print_history_offline(mocker: MockerFixture, runner: CliRunner,
+                               mock_build_session: None) -> None:
+    async def _yield(self: YouTubeClient, *args: object,
+                     **kwargs: object) -> AsyncGenerator[str, None]:
+        assert self.cache_only
+        yield '1234'
+
+    mocker.patch.object(YouTubeClient, 'get_history_video_ids', _yield)
+    result = runner.invoke(main, ['print-history', '--offline'])
+    assert result.exit_code == 0
+    assert result.output == '1234\n'
+
+
+def test_print_watch_later_offline_miss(mocker: MockerFixture, runner: CliRunner,
+                                        mock_build_session: None) -> None:
+    from youtube_unofficial.cache import CacheMissError
+    mocker.patch('youtube_unofficial.pool.ClientPool.run',
+                 side_effect=CacheMissError('get', 'https://www.youtube.com/playlist?list=WL'))
+    result = runner.invoke(main, ['print-watch-later', '--offline'])
+    assert result.exit_code == 1
+    assert 'No cached response for GET https://www.youtube.com/playlist?list=WL.' in result.output
+
+
+def test_delegated_session_id(mocker: MockerFixture, runner: CliRunner,
+                              mock_build_session: None) -> None:
+    mocker.patch.object(YouTubeClient, 'get_history_video_ids', _yield_one_str)
+    result = runner.invoke(
+        main, ['--delegated-session-id', 'a=123', 'print-history', '-p', 'a', '-p', 'b'])
+    assert result.exit_code == 0
+    build = cast('MagicMock', vars(pool)['build_youtube_session'])
+    assert sorted(build.call_args_list) == [
+        mocker.call('chrome', 'a', delegated_session_id='123'),
+        mocker.call('chrome', 'b', delegated_session_id=None)
+    ]
+    result = runner.invoke(main, ['--delegated-session-id', '123', 'print-history'])
+    assert result.exit_code == 2
+    assert "Invalid --delegated-session-id '123'. Expected PROFILE=ID." in result.output
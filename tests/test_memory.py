@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from youtube_unofficial.client import YouTubeClient
+from youtube_unofficial.hooks import PageEvent
+from youtube_unofficial.main import main
+from youtube_unofficial.memory import MemoryTracer
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+    from click.testing import CliRunner
+    from pytest_mock import MockerFixture
+    from youtube_unofficial.testing.server import InnerTubeServer
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return 'asyncio'
+
+
+@pytest.mark.anyio
+@pytest.mark.innertube_server(history_size=25, page_size=10)
+async def test_memory_tracer(innertube_server: InnerTubeServer) -> None:
+    events: list[PageEvent] = []
+    tracer = MemoryTracer()
+
+    def on_page(event: PageEvent) -> None:
+        events.append(event)
+        tracer(event)
+
+    tracer.start()
+    async with innertube_server.session() as session:
+        retained = [x async for x in YouTubeClient(session, on_page=on_page).get_history_info()]
+    tracer.stop()
+    assert len(retained) == 25
+    assert [(x.page_index, x.items) for x in events] == [(0, 10), (1, 10), (2, 5)]
+    assert [x.page_index for x in tracer.pages] == [0, 1, 2]
+    assert all(x.current <= x.peak <= tracer.peak for x in tracer.pages)
+    assert all(x.top_site for x in tracer.pages)
+    assert tracer.top_sites(3)
+    report = tracer.report(3)
+    assert report.startswith('Peak traced memory:')
+    assert 'allocation site' in report
+
+
+@pytest.mark.anyio
+@pytest.mark.innertube_server(playlists={'WL': 250}, page_size=100)
+async def test_on_page_playlist(innertube_server: InnerTubeServer) -> None:
+    events: list[PageEvent] = []
+    async with innertube_server.session() as session:
+        video_ids = [
+            x async for x in YouTubeClient(session, on_page=events.append).get_playlist_video_ids(
+                'WL')
+        ]
+    assert len(video_ids) == 250
+    assert events == [
+        PageEvent('https://www.youtube.com/playlist?list=WL', 0, 100, 250),
+        PageEvent('/youtubei/v1/browse', 1, 100),
+        PageEvent('/youtubei/v1/browse', 2, 50)
+    ]
+
+
+def test_memory_tracer_not_started() -> None:
+    tracer = MemoryTracer()
+    tracer(PageEvent('https://www.youtube.com/feed/history', 0, 1))
+    tracer.stop()
+    assert not tracer.pages
+    assert not tracer.top_sites()
+
+
+async def _history(self: YouTubeClient, *args: object,
+                   **kwargs: object) -> AsyncGenerator[str, None]:
+    assert self.on_page is not None
+    self.on_page(PageEvent('https://www.youtube.com/feed/history', 0, 1))
+    yield '1234'
+
+
+def test_print_history_trace_memory(mocker: MockerFixture, runner: CliRunner,
+                                    mock_build_session: None) -> None:
+    mocker.patch.object(YouTubeClient, 'get_history_video_ids', _history)
+    result = runner.invoke(main, ['print-history', '--trace-memory'])
+    assert result.exit_code == 0
+    assert '1234\n' in result.output
+    assert 'Peak traced memory:' in result.output
+    assert 'retained KiB' in result.output
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from youtube_unofficial.client import YouTubeClient
+from youtube_unofficial.download import download_page
+from youtube_unofficial.main import main
+from youtube_unofficial.metrics import ClientMetrics, MetricsRegistry
+import niquests
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+    from pathlib import Path
+
+    from click.testing import CliRunner
+    from pytest_mock import MockerFixture
+    from youtube_unofficial.testing.server import InnerTubeServer
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return 'asyncio'
+
+
+def test_registry_render(tmp_path: Path) -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter('jobs_total', 'Jobs.', ('name',))
+    counter.inc(1, 'a"b\\c\n')
+    counter.inc(2, 'a"b\\c\n')
+    histogram = registry.histogram('duration_seconds', 'Duration.', buckets=(0.1, 1))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+    assert counter.value('a"b\\c\n') == 3
+    assert histogram.count() == 3
+    assert registry.render() == ('# HELP jobs_total Jobs.\n'
+                                 '# TYPE jobs_total counter\n'
+                                 'jobs_total{name="a\\"b\\\\c\\n"} 3\n'
+                                 '# HELP duration_seconds Duration.\n'
+                                 '# TYPE duration_seconds histogram\n'
+                                 'duration_seconds_bucket{le="0.1"} 1\n'
+                                 'duration_seconds_bucket{le="1"} 2\n'
+                                 'duration_seconds_bucket{le="+Inf"} 3\n'
+                                 'duration_seconds_sum 5.55\n'
+                                 'duration_seconds_count 3\n')
+    path = tmp_path / 'youtube.prom'
+    registry.write_textfile(path)
+    assert path.read_text() == registry.render()
+    assert [x.name for x in tmp_path.iterdir()] == ['youtube.prom']
+
+
+@pytest.mark.anyio
+@pytest.mark.innertube_server(history_size=25, page_size=10)
+async def test_client_metrics(innertube_server: InnerTubeServer) -> None:
+    metrics = ClientMetrics()
+    async with innertube_server.session() as session:
+        client = YouTubeClient(session, metrics=metrics)
+        video_ids = [x async for x in client.get_history_video_ids()]
+        assert await client.remove_video_ids_from_history(video_ids[:2])
+        innertube_server.faults.inject('server_error')
+        with pytest.raises(niquests.HTTPError):
+            await client.clear_watch_history()
+    assert metrics.requests.value('/feed/history', 'GET', '200') == 2
+    assert metrics.requests.value('/feed/history', 'GET', '503') == 1
+    assert metrics.requests.value('/youtubei/v1/browse', 'POST', '200') == 2
+    assert metrics.requests.value('/youtubei/v1/feedback', 'POST', '200') == 2
+    assert metrics.request_duration.count('/feed/history') == 3
+    assert metrics.request_bytes.value('/youtubei/v1/browse') > 0
+    assert metrics.response_bytes.value('/feed/history') > 0
+    assert metrics.items.value('get_history_video_ids') == 25
+    assert not metrics.items.value('get_history_info')
+    assert metrics.items_per_call.count('get_history_video_ids') == 1
+    assert metrics.mutations.value('feedback', 'succeeded') == 2
+    assert not metrics.cache.value('/feed/history', 'hit')
+    assert (
+        'youtube_unofficial_requests_total{endpoint="/feed/history",method="GET",status="200"} 2'
+        in metrics.registry.render())
+
+
+@pytest.mark.anyio
+async def test_download_page_metrics(mocker: MockerFixture) -> None:
+    metrics = ClientMetrics()
+    session = mocker.AsyncMock(spec=niquests.AsyncSession)
+    session.headers = {}
+    session.cache = object()
+    resp = niquests.Response()
+    resp.status_code = 200
+    resp._content = b'{}'  # ruff:ignore[private-member-access]
+    session.request.return_value = resp
+    assert await download_page(session, 'https://example.com/a', return_json=True,
+                               metrics=metrics) == {}
+    session.request.side_effect = niquests.ConnectionError
+    with pytest.raises(niquests.ConnectionError):
+        await download_page(session, 'https://example.com/a', return_json=False, metrics=metrics)
+    assert metrics.cache.value('/a', 'hit') == 1
+    assert metrics.requests.value('/a', 'GET', '200') == 1
+    assert metrics.requests.value('/a', 'GET', 'error') == 1
+
+
+async def _history(self: YouTubeClient, *args: object,
+                   **kwargs: object) -> AsyncGenerator[str, None]:
+    assert self.metrics is not None
+    self.metrics.items.inc(1, 'get_history_video_ids')
+    yield '1234'
+
+
+def test_main_metrics_file(mocker: MockerFixture, runner: CliRunner, mock_build_session: None,
+                           tmp_path: Path) -> None:
+    mocker.patch.object(YouTubeClient, 'get_history_video_ids', _history)
+    path = tmp_path / 'youtube.prom'
+    result = runner.invoke(main, ['--metrics-file', str(path), 'print-history'])
+    assert result.exit_code == 0
+    assert ('youtube_unofficial_items_total{generator="get_history_video_ids"} 1\n'
+            in path.read_text())
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+import threading
+
+from youtube_unofficial import client as client_module
+from youtube_unofficial.client import YouTubeClient
+from youtube_unofficial.main import main
+from youtube_unofficial.pool import ClientPool
+import anyio
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Callable
+
+    from click.testing import CliRunner
+    from pytest_mock import MockerFixture
+    from youtube_unofficial.testing.server import InnerTubeServer
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return 'asyncio'
+
+
+def _record_threads(mocker: MockerFixture, threads: dict[str, set[int]]) -> None:
+    def wrap(name: str) -> None:
+        func: Callable[..., Any] = getattr(client_module, name)
+
+        def record(*args: Any) -> Any:
+            threads.setdefault(name, set()).add(threading.get_ident())
+            return func(*args)
+
+        mocker.patch.object(client_module, name, record)
+
+    for name in ('Soup', 'find_ytcfg', 'initial_data', 'loads'):
+        wrap(name)
+
+
+@pytest.mark.anyio
+@pytest.mark.innertube_server(history_size=25, page_size=10, playlists={'WL': 5})
+async def test_parse_limiter(innertube_server: InnerTubeServer, mocker: MockerFixture) -> None:
+    async with innertube_server.session() as session:
+        expected = [x async for x in YouTubeClient(session).get_history_video_ids()]
+        threads: dict[str, set[int]] = {}
+        _record_threads(mocker, threads)
+        client = YouTubeClient(session, parse_limiter=anyio.CapacityLimiter(2))
+        assert [x async for x in client.get_history_video_ids()] == expected
+        await client.clear_watch_later()
+        with pytest.raises(KeyError, match='empty'):
+            [x async for x in client.get_playlist_video_ids('WL')]
+    assert threads.keys() == {'Soup', 'find_ytcfg', 'initial_data', 'loads'}
+    assert threading.get_ident() not in set().union(*threads.values())
+
+
+async def _history(self: YouTubeClient, *args: object,
+                   **kwargs: object) -> AsyncGenerator[str, None]:
+    assert self.parse_limiter is not None
+    yield str(self.parse_limiter.total_tokens)
+
+
+def test_main_parse_threads(mocker: MockerFixture, runner: CliRunner,
+                            mock_build_session: None) -> None:
+    mocker.patch.object(YouTubeClient, 'get_history_video_ids', _history)
+    result = runner.invoke(main, ['--parse-threads', '3', 'print-history'])
+    assert result.exit_code == 0
+    assert result.output == '3\n'
+
+
+@pytest.mark.anyio
+async def test_client_pool_parse_threads(mock_build_session: None) -> None:
+    async with ClientPool('chrome', ('a', 'b'), parse_threads=4) as pool:
+        limiters = {id(x.parse_limiter) for x in pool.clients.values()}
+        assert pool.clients['a'].parse_limiter is not None
+        assert pool.clients['a'].parse_limiter.total_tokens == 4
+    assert len(limiters) == 1
+    async with ClientPool('chrome', ('a',)) as pool:
+        assert pool.clients['a'].parse_limiter is None
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+import sys
+
+from youtube_unofficial.client import YouTubeClient
+from youtube_unofficial.main import main
+from youtube_unofficial.parsing import BootstrapPage, gil_enabled, parse_bootstrap
+from youtube_unofficial.pool import ClientPool
+from youtube_unofficial.testing.synthetic import SyntheticData
+import anyio
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+    from click.testing import CliRunner
+    from pytest_mock import MockerFixture
+    from youtube_unofficial.testing.server import InnerTubeServer
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return 'asyncio'
+
+
+def test_parse_bootstrap() -> None:
+    data = SyntheticData()
+    initial_data = data.history_initial_data(range(3), 'next')
+    html = data.page_html(initial_data | {'responseContext': {'a': 1}, 'topbar': {}})
+    html = html.replace('ytcfg.set({', 'ytcfg.set({"EXPERIMENT_FLAGS": {"a": true}, ', 1)
+    page = parse_bootstrap(html)
+    assert page == BootstrapPage(
+        data.ytcfg, {k: initial_data[k]
+                     for k in ('contents', 'header') if k in initial_data})
+    assert parse_bootstrap(html, with_initial_data=False) == BootstrapPage(data.ytcfg, {})
+    # Without the GIL these run in parallel.
+    with ThreadPoolExecutor(4) as executor:
+        assert all(x == page for x in executor.map(parse_bootstrap, [html] * 8))
+
+
+def test_gil_enabled(mocker: MockerFixture) -> None:
+    assert gil_enabled() is getattr(sys, '_is_gil_enabled', lambda: True)()
+    mocker.patch.object(sys, '_is_gil_enabled', return_value=False, create=True)
+    assert not gil_enabled()
+
+
+@pytest.mark.anyio
+@pytest.mark.innertube_server(history_size=25, page_size=10, playlists={'WL': 5, 'PL1': 3})
+async def test_parse_processes(innertube_server: InnerTubeServer, mocker: MockerFixture) -> None:
+    async with innertube_server.session() as session:
+        expected = [x async for x in YouTubeClient(session).get_history_video_ids()]
+        soup = mocker.patch('youtube_unofficial.client.Soup')
+        client = YouTubeClient(session,
+                               parse_limiter=anyio.CapacityLimiter(2),
+                               parse_processes=True)
+        assert [x async for x in client.get_history_video_ids()] == expected
+        assert len([x async for x in client.get_playlist_video_ids('PL1')]) == 3
+        await client.clear_watch_later()
+    soup.assert_not_called()
+    assert not innertube_server.playlists['WL']
+
+
+def test_client_pool_parse_processes() -> None:
+    with pytest.raises(ValueError, match='cannot be used together'):
+        ClientPool('chrome', ('a',), parse_threads=2, parse_processes=2)
+
+
+@pytest.mark.anyio
+async def test_client_pool_parse_processes_shared(mock_build_session: None) -> None:
+    async with ClientPool('chrome', ('a', 'b'), parse_processes=3) as pool:
+        limiters = {id(x.parse_limiter) for x in pool.clients.values()}
+        assert all(x.parse_processes for x in pool.clients.values())
+        assert pool.clients['a'].parse_limiter is not None
+        assert pool.clients['a'].parse_limiter.total_tokens == 3
+    assert len(limiters) == 1
+
+
+async def _history(self: YouTubeClient, *args: object,
+                   **kwargs: object) -> AsyncGenerator[str, None]:
+    assert self.parse_limiter is not None
+    yield f'{self.parse_processes} {self.parse_limiter.total_tokens}'
+
+
+def test_main_parse_processes(mocker: MockerFixture, runner: CliRunner,
+                              mock_build_session: None) -> None:
+    mocker.patch.object(YouTubeClient, 'get_history_video_ids', _history)
+    result = runner.invoke(main, ['--parse-processes', '2', 'print-history'])
+    assert result.exit_code == 0
+    assert result.output == 'True 2\n'
+    result = runner.invoke(main,
+                           ['--parse-processes', '2', '--parse-threads', '2', 'print-history'])
+    assert result.exit_code == 2
+    assert 'cannot be used together' in result.output
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, cast
+
+from youtube_unofficial.pool import ClientPool
+from youtube_unofficial.ratelimit import RateLimiter
+import anyio
+import anyio.lowlevel
+import niquests
+import pytest
+
+if TYPE_CHECKING:
+    from unittest.mock import AsyncMock
+
+    from pytest_mock import MockerFixture
+    from youtube_unofficial.client import YouTubeClient
+
+
+@pytest.fixture
+def mock_sessions(mocker: MockerFixture) -> dict[str, AsyncMock]:
+    sessions: dict[str, AsyncMock] = {}
+
+    async def _build(browser: str,
+                     profile: str,
+                     delegated_session_id: str | None = None) -> niquests.AsyncSession:
+        session = mocker.AsyncMock(spec=niquests.AsyncSession)
+        session.__aenter__.return_value = session
+        sessions[profile] = session
+        return cast('niquests.AsyncSession', session)
+
+    mocker.patch('youtube_unofficial.pool.build_youtube_session', side_effect=_build)
+    return sessions
+
+
+@pytest.mark.anyio
+async def test_client_pool_runs_every_profile(mock_sessions: dict[str, AsyncMock]) -> None:
+    async def _profile_of(profile: str, yt: YouTubeClient) -> str:
+        assert yt.session is mock_sessions[profile]
+        return profile
+
+    async with ClientPool('chrome', ('Default', 'Profile 1', 'Default')) as pool:
+        assert pool.profiles == ('Default', 'Profile 1')
+        assert pool.clients['Default'] is not pool.clients['Profile 1']
+        results = await pool.run(_profile_of)
+    assert results == {'Default': 'Default', 'Profile 1': 'Profile 1'}
+    for session in mock_sessions.values():
+        session.__aexit__.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_client_pool_runs_concurrently(mock_sessions: dict[str, AsyncMock]) -> None:
+    started = 0
+    all_started = anyio.Event()
+
+    async def _wait_for_all(profile: str, yt: YouTubeClient) -> None:
+        nonlocal started
+        started += 1
+        if started == 3:
+            all_started.set()
+        with anyio.fail_after(1):
+            await all_started.wait()
+
+    async with ClientPool('chrome', ('a', 'b', 'c')) as pool:
+        await pool.run(_wait_for_all)
+
+
+@pytest.mark.anyio
+async def test_client_pool_failure_does_not_cancel_others(
+        mock_sessions: dict[str, AsyncMock]) -> None:
+    finished: list[str] = []
+
+    async def _fail_first(profile: str, yt: YouTubeClient) -> None:
+        if profile == 'a':
+            msg = 'failed'
+            raise RuntimeError(msg)
+        await anyio.lowlevel.checkpoint()
+        finished.append(profile)
+
+    async with ClientPool('chrome', ('a', 'b')) as pool:
+        with pytest.raises(RuntimeError, match='failed'):
+            await pool.run(_fail_first)
+    assert finished == ['b']
+
+
+@pytest.mark.anyio
+async def test_client_pool_build_failure_closes_sessions(mocker: MockerFixture) -> None:
+    session = mocker.AsyncMock(spec=niquests.AsyncSession)
+    session.__aenter__.return_value = session
+
+    async def _build(browser: str,
+                     profile: str,
+                     delegated_session_id: str | None = None) -> niquests.AsyncSession:
+        if profile == 'bad':
+            msg = 'no cookies'
+            raise RuntimeError(msg)
+        return cast('niquests.AsyncSession', session)
+
+    mocker.patch('youtube_unofficial.pool.build_youtube_session', side_effect=_build)
+    with pytest.raises(RuntimeError, match='no cookies'):
+        async with ClientPool('chrome', ('good', 'bad')):
+            pass
+    session.__aexit__.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_rate_limiter_spaces_requests() -> None:
+    limiter = RateLimiter(0.05)
+    start = anyio.current_time()
+    for _ in range(3):
+        await limiter.wait()
+    assert anyio.current_time() - start >= 0.1
+
+
+@pytest.mark.anyio
+async def test_rate_limiter_disabled() -> None:
+    limiter = RateLimiter()
+    start = anyio.current_time()
+    for _ in range(100):
+        await limiter.wait()
+    assert anyio.current_time() - start < 0.05
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import pstats
+import time
+
+from youtube_unofficial.client import YouTubeClient
+from youtube_unofficial.main import main
+from youtube_unofficial.profiling import CProfiler, SamplingProfiler, create_profiler
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+    from pathlib import Path
+
+    from click.testing import CliRunner
+    from pytest_mock import MockerFixture
+
+
+def _busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sampling_profiler(tmp_path: Path) -> None:
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    _busy(0.1)
+    profiler.stop()
+    assert any(stack[-1].endswith(':_busy') for stack in profiler.stacks)
+    summary = profiler.summary()
+    assert 'samples' in summary
+    assert 'test_profiling:_busy' in summary
+    path = tmp_path / 'out.collapsed'
+    profiler.save(path)
+    stack, count = path.read_text().splitlines()[0].rsplit(' ', 1)
+    assert ';' in stack
+    assert int(count) > 0
+
+
+def test_cprofiler(tmp_path: Path) -> None:
+    profiler = create_profiler('cprofile')
+    assert isinstance(profiler, CProfiler)
+    profiler.start()
+    _busy(0.01)
+    profiler.stop()
+    assert '_busy' in profiler.summary()
+    path = tmp_path / 'out.prof'
+    profiler.save(path)
+    assert any(name == '_busy'
+               for _, _, name in pstats.Stats(str(path)).stats)  # type: ignore[attr-defined]
+
+
+async def _history(self: YouTubeClient, *args: object,
+                   **kwargs: object) -> AsyncGenerator[str, None]:
+    _busy(0.05)
+    yield '1234'
+
+
+@pytest.mark.parametrize(('kind', 'suffix'), [('cprofile', '.prof'), ('sampling', '.collapsed')])
+def test_main_profiler(mocker: MockerFixture, runner: CliRunner, mock_build_session: None,
+                       monkeypatch: pytest.MonkeyPatch, tmp_path: Path, kind: str,
+                       suffix: str) -> None:
+    mocker.patch.object(YouTubeClient, 'get_history_video_ids', _history)
+    monkeypatch.chdir(tmp_path)
+    result = runner.invoke(main, [f'--profiler={kind}', 'print-history'])
+    assert result.exit_code == 0
+    assert '1234\n' in result.output
+    assert f'Profile written to youtube-unofficial{suffix}.' in result.output
+    assert '_busy' in result.output
+    assert (tmp_path / f'youtube-unofficial{suffix}').exists()
+
+
+def test_main_profiler_output(mocker: MockerFixture, runner: CliRunner, mock_build_session: None,
+                              tmp_path: Path) -> None:
+    mocker.patch.object(YouTubeClient, 'get_history_video_ids', _history)
+    output = tmp_path / 'history.prof'
+    result = runner.invoke(
+        main, ['--profiler', 'cprofile', '--profiler-output',
+               str(output), 'print-history'])
+    assert result.exit_code == 0
+    assert pstats.Stats(str(output)).total_calls > 0  # type: ignore[attr-defined]
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from io import StringIO
+from typing import TYPE_CHECKING
+
+from youtube_unofficial.client import YouTubeClient
+from youtube_unofficial.hooks import MutationEvent, PageEvent
+from youtube_unofficial.main import main
+from youtube_unofficial.progress import Progress
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from click.testing import CliRunner
+    from pytest_mock import MockerFixture
+    from youtube_unofficial.testing.server import InnerTubeServer
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return 'asyncio'
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _removed(progress: Progress,
+             clock: _Clock,
+             times: Iterable[float],
+             *,
+             succeeded: bool = True) -> None:
+    for t in times:
+        clock.now = t
+        progress.on_mutation(MutationEvent('edit_playlist', succeeded=succeeded))
+
+
+def test_progress_plain() -> None:
+    clock = _Clock()
+    stream = StringIO()
+    progress = Progress(stream, interactive=False, clock=clock)
+    assert progress.interval == 10
+    clock.now = 102.0
+    progress.on_page(PageEvent('https://www.youtube.com/playlist?list=WL', 0, 100, 250))
+    clock.now = 104.0
+    progress.on_page(PageEvent('/youtubei/v1/browse', 1, 100))
+    _removed(progress, clock, (110, 111, 112, 113))
+    _removed(progress, clock, (114,), succeeded=False)
+    progress.close()
+    assert stream.getvalue().splitlines() == [
+        '1 page, 100 items (50.0/s), 0 of 250 removed',
+        '2 pages, 200 items (16.7/s), 3 of 250 removed, ETA 0:04:07',
+        '2 pages, 200 items (14.3/s), 4 of 250 removed, 1 failed, ETA 0:04:05'
+    ]
+    assert progress.remaining == 245
+
+
+def test_progress_interactive() -> None:
+    clock = _Clock()
+    stream = StringIO()
+    progress = Progress(stream, interactive=True, clock=clock)
+    assert progress.interval == pytest.approx(0.1)
+    clock.now = 101.0
+    progress.on_page(PageEvent('/feed/history', 0, 1000))
+    clock.now = 101.05
+    progress.on_page(PageEvent('/youtubei/v1/browse', 1, 5))
+    clock.now = 102.0
+    progress.on_page(PageEvent('/youtubei/v1/browse', 2, 5))
+    progress.close()
+    assert stream.getvalue() == ('\r1 page, 1000 items (1000.0/s)'
+                                 '\r3 pages, 1010 items (505.0/s)'
+                                 '\r3 pages, 1010 items (505.0/s)\n')
+    assert progress.eta() is None
+
+
+def test_progress_erases_longer_line() -> None:
+    stream = StringIO()
+    progress = Progress(stream, total=2, interactive=True, interval=0, clock=_Clock())
+    progress.on_mutation(MutationEvent('feedback', succeeded=False))
+    progress.on_page(PageEvent('/feed/history', 0, 0))
+    first, second = stream.getvalue().split('\r')[1:]
+    assert first == '0 pages, 0 items (0.0/s), 0 of 2 removed, 1 failed'
+    assert second == f'{"1 page, 0 items (0.0/s), 0 of 2 removed, 1 failed":<{len(first)}}'
+
+
+@pytest.mark.anyio
+@pytest.mark.innertube_server(playlists={'WL': 5}, page_size=2)
+async def test_progress_clear_watch_later(innertube_server: InnerTubeServer) -> None:
+    mutations: list[MutationEvent] = []
+    progress = Progress(StringIO(), interactive=False)
+    async with innertube_server.session() as session:
+        client = YouTubeClient(session, on_mutation=mutations.append)
+        progress.attach(client)
+        await client.clear_watch_later()
+    assert len(mutations) == 5
+    assert (progress.pages, progress.items, progress.total, progress.done) == (3, 5, 5, 5)
+    assert progress.remaining == 0
+    assert '5 of 5 removed' in progress.status()
+
+
+@pytest.mark.anyio
+@pytest.mark.innertube_server(history_size=5)
+async def test_progress_remove_history_absent(innertube_server: InnerTubeServer) -> None:
+    mutations: list[MutationEvent] = []
+    progress = Progress(StringIO(), total=3, interactive=False)
+    video_ids = [innertube_server.history[0], 'absent', innertube_server.history[1]]
+    async with innertube_server.session() as session:
+        client = YouTubeClient(session, on_mutation=mutations.append)
+        progress.attach(client)
+        assert await client.remove_video_ids_from_history(video_ids)
+    assert [(x.video_id, x.succeeded, x.found) for x in mutations] == [(video_ids[0], True, True),
+                                                                       ('absent', False, False),
+                                                                       (video_ids[2], True, True)]
+    assert (progress.total, progress.done, progress.failed) == (2, 2, 0)
+    assert progress.remaining == 0
+    assert '2 of 2 removed' in progress.status()
+
+
+async def _clear(self: YouTubeClient) -> None:
+    assert self.on_page is not None
+    assert self.on_mutation is not None
+    self.on_page(PageEvent('https://www.youtube.com/playlist?list=WL', 0, 1, 1))
+    self.on_mutation(MutationEvent('edit_playlist', succeeded=True, playlist_id='WL'))
+
+
+async def _remove(self: YouTubeClient, video_ids: Iterable[str], **kwargs: object) -> bool:
+    assert self.on_mutation is not None
+    self.on_mutation(MutationEvent('feedback', succeeded=True, video_id=next(iter(video_ids))))
+    return True
+
+
+def test_clear_watch_later_progress(mocker: MockerFixture, runner: CliRunner,
+                                    mock_build_session: None) -> None:
+    mocker.patch.object(YouTubeClient, 'clear_watch_later', _clear)
+    result = runner.invoke(main, ['clear-watch-later', '--progress'])
+    assert result.exit_code == 0
+    assert '1 page, 1 item (' in result.output
+    assert '1 of 1 removed\n' in result.output
+
+
+def test_remove_history_entries_progress(mocker: MockerFixture, runner: CliRunner,
+                                         mock_build_session: None) -> None:
+    mocker.patch.object(YouTubeClient, 'remove_video_ids_from_history', _remove)
+    result = runner.invoke(main,
+                           ['remove-history-entries', '--progress', '-p', 'a', '-p', 'b', '1', '2'])
+    assert result.exit_code == 0
+    assert ', 2 of 4 removed' in result.output.splitlines()[-1]
+    result = runner.invoke(main, ['remove-history-entries', '--progress', '-'], input='1\n')
+    assert result.exit_code == 0
+    assert result.output.endswith(', 1 removed\n')
@@ -2,25 +2,60 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from youtube_unofficial.cache import HAS_ZSTD, BoundedSQLiteBackend, ZstdSQLiteBackend
 from youtube_unofficial.constants import USER_AGENT
 from youtube_unofficial.session import build_youtube_session
 import pytest
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from pytest_mock import MockerFixture
 
 
 @pytest.mark.anyio
-async def test_build_youtube_session(mocker: MockerFixture) -> None:
+async def test_build_youtube_session(mocker: MockerFixture, tmp_path: Path) -> None:
     mock_sync_session = mocker.MagicMock()
     mock_sync_session.cookies = {'sid': 'val'}
     mocker.patch('youtube_unofficial.session.yt_dlp_utils.setup_session',
                  return_value=mock_sync_session)
+    mocker.patch('youtube_unofficial.session.cache_dir', side_effect=lambda ns: tmp_path / ns)
     mock_cached = mocker.MagicMock()
     mock_cached.cookies = mocker.MagicMock()
     mock_cached.headers = {}
-    mocker.patch('youtube_unofficial.session.cached_session', return_value=mock_cached)
+    mock_cls = mocker.patch('youtube_unofficial.session.YouTubeCachedSession',
+                            return_value=mock_cached)
     session = await build_youtube_session('chrome', 'Default')
     assert session is mock_cached
     assert session.headers['User-Agent'] == USER_AGENT
     mock_sync_session.close.assert_called_once()
+    backend = mock_cls.call_args.kwargs['backend']
+    assert isinstance(backend, BoundedSQLiteBackend)
+    assert (tmp_path / 'chrome-Default/http.sqlite').exists()
+
+
+@pytest.mark.anyio
+async def test_build_youtube_session_namespaces(mocker: MockerFixture, tmp_path: Path) -> None:
+    mocker.patch('youtube_unofficial.session.yt_dlp_utils.setup_session')
+    mocker.patch('youtube_unofficial.session.cache_dir', side_effect=lambda ns: tmp_path / ns)
+    mock_cls = mocker.patch('youtube_unofficial.session.YouTubeCachedSession')
+    await build_youtube_session('chrome', 'Profile 1', cache_max_entries=5)
+    await build_youtube_session('firefox', 'Profile 1', delegated_session_id='123')
+    first, second = (c.kwargs['backend'] for c in mock_cls.call_args_list)
+    assert first.max_entries == 5
+    assert second.max_entries == 1000
+    assert (tmp_path / 'chrome-Profile_1/http.sqlite').exists()
+    assert (tmp_path / 'firefox-Profile_1-123/http.sqlite').exists()
+
+
+@pytest.mark.anyio
+@pytest.mark.skipif(not HAS_ZSTD, reason='zstd is not available')
+async def test_build_youtube_session_zstd(mocker: MockerFixture, tmp_path: Path) -> None:
+    mocker.patch('youtube_unofficial.session.yt_dlp_utils.setup_session')
+    mocker.patch('youtube_unofficial.session.cache_dir', side_effect=lambda ns: tmp_path / ns)
+    mock_cls = mocker.patch('youtube_unofficial.session.YouTubeCachedSession')
+    await build_youtube_session('chrome', 'Default', cache_backend='zstd', cache_max_bytes=1024)
+    backend = mock_cls.call_args.kwargs['backend']
+    assert isinstance(backend, ZstdSQLiteBackend)
+    assert backend.max_bytes == 1024
+    assert (tmp_path / 'chrome-Default/http.zst.sqlite').exists()
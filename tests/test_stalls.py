@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import time
+
+from youtube_unofficial.client import YouTubeClient
+from youtube_unofficial.main import main
+from youtube_unofficial.stalls import Stall, StallDetector
+import anyio
+import anyio.lowlevel
+import click
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+    from click.testing import CliRunner
+    from pytest_mock import MockerFixture
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return 'asyncio'
+
+
+async def _parse() -> int:
+    time.sleep(0.3)  # ruff:ignore[blocking-sleep-in-async-function]
+    return 1
+
+
+async def _download() -> int:
+    await anyio.lowlevel.checkpoint()
+    return await _parse()
+
+
+@pytest.mark.anyio
+async def test_stall_detector() -> None:
+    stalls: list[Stall] = []
+    detector = StallDetector(0.05, on_stall=stalls.append)
+    assert await detector.run(_download) == 1
+    assert stalls == detector.stalls
+    (stall,) = stalls
+    assert stall.duration >= 0.05
+    assert stall.coroutine == 'test_stalls:_parse'
+    assert stall.task == 'test_stalls:test_stall_detector'
+    assert 'time.sleep(0.3)' in stall.stack
+    assert stall.stack.lstrip().startswith('File')
+    assert stall.report().startswith('Event loop stalled for ')
+    assert ' in test_stalls:_parse (task test_stalls:test_stall_detector):\n' in stall.report()
+    assert detector.summary().startswith('1 event loop stall, ')
+
+
+@pytest.mark.anyio
+async def test_stall_detector_no_stall() -> None:
+    detector = StallDetector(0.05)
+    await detector.run(anyio.sleep, 0.2)
+    assert not detector.stalls
+    assert detector.summary() == 'No event loop stall longer than 0.05 s.'
+
+
+def test_stall_report_callback() -> None:
+    stall = Stall(0.25, None, None, '  File "a.py", line 1, in f\n')
+    assert stall.report() == ('Event loop stalled for 0.250 s in a callback:\n'
+                              '  File "a.py", line 1, in f')
+
+
+async def _history(self: YouTubeClient, *args: object,
+                   **kwargs: object) -> AsyncGenerator[str, None]:
+    time.sleep(0.3)  # ruff:ignore[blocking-sleep-in-async-function]
+    yield '1234'
+
+
+def test_main_detect_stalls(mocker: MockerFixture, runner: CliRunner,
+                            mock_build_session: None) -> None:
+    mocker.patch.object(YouTubeClient, 'get_history_video_ids', _history)
+    result = runner.invoke(main, ['--detect-stalls', '0.05', 'print-history'])
+    assert result.exit_code == 0
+    assert '1234\n' in result.output
+    assert 'Event loop stalled for ' in result.output
+    assert 'in test_stalls:_history (task youtube_unofficial.' in result.output
+    assert '1 event loop stall, ' in result.output
+
+
+@pytest.mark.parametrize(('error', 'message'),
+                         [(click.Abort(), 'Aborted!\n'),
+                          (click.ClickException('Failed.'), 'Error: Failed.\n')])
+def test_main_detect_stalls_error(mocker: MockerFixture, runner: CliRunner,
+                                  mock_build_session: None, error: Exception, message: str) -> None:
+    mocker.patch.object(YouTubeClient, 'get_history_video_ids', side_effect=error)
+    for args in ([], ['--detect-stalls', '1']):
+        result = runner.invoke(main, [*args, 'print-history'])
+        assert result.exit_code == 1
+        assert message in result.output
+        assert isinstance(result.exception, SystemExit)
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import json
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from youtube_unofficial.client import YouTubeClient
+from youtube_unofficial.main import main
+from youtube_unofficial.tracing import (
+    NOOP_TRACER,
+    OpenTelemetryTracer,
+    RecordedSpan,
+    RecordingTracer,
+    current_span,
+    trace_items,
+)
+import niquests
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+    from pathlib import Path
+
+    from click.testing import CliRunner
+    from pytest_mock import MockerFixture
+    from youtube_unofficial.testing.server import InnerTubeServer
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return 'asyncio'
+
+
+def _children(tracer: RecordingTracer, parent: RecordedSpan) -> list[RecordedSpan]:
+    return sorted((x for x in tracer.spans if x.parent_span_id == parent.span_id),
+                  key=lambda x: x.start_time)
+
+
+def _only(tracer: RecordingTracer, name: str) -> RecordedSpan:
+    spans = [x for x in tracer.spans if x.name == name]
+    assert len(spans) == 1
+    return spans[0]
+
+
+@pytest.mark.anyio
+@pytest.mark.innertube_server(playlists={'WL': 5}, page_size=2)
+async def test_clear_playlist_spans(innertube_server: InnerTubeServer, tmp_path: Path) -> None:
+    tracer = RecordingTracer()
+    async with innertube_server.session() as session:
+        await YouTubeClient(session, tracer=tracer).clear_watch_later()
+    root = _only(tracer, 'YouTubeClient.clear_watch_later')
+    assert root.parent_span_id is None
+    clear = _only(tracer, 'YouTubeClient.clear_playlist')
+    assert clear.parent_span_id == root.span_id
+    assert clear.attributes == {'playlist_id': 'WL'}
+    info, batch = _children(tracer, clear)
+    assert info.name == 'YouTubeClient.get_playlist_info'
+    assert info.attributes == {'playlist_id': 'WL', 'page_count': 3, 'item_count': 5}
+    assert [(x.name, x.attributes.get('page_index'), x.attributes.get('item_count'))
+            for x in _children(tracer, info)] == [('bootstrap.download', None, None),
+                                                  ('bootstrap.parse', None, None),
+                                                  ('continuation', 1, 2), ('continuation', 2, 1)]
+    assert batch.name == 'mutation_batch'
+    assert batch.attributes == {'playlist_id': 'WL', 'batch_size': 5}
+    removals = _children(tracer, batch)
+    assert [x.name for x in removals] == ['YouTubeClient.remove_video_id_from_playlist'] * 5
+    assert {x.trace_id for x in tracer.spans} == {root.trace_id}
+    assert all(x.end_time is not None and x.end_time >= x.start_time for x in tracer.spans)
+    path = tmp_path / 'trace.jsonl'
+    tracer.write_jsonl(path)
+    lines = [json.loads(x) for x in path.read_text().splitlines()]
+    assert len(lines) == len(tracer.spans)
+    assert lines[-1]['name'] == 'YouTubeClient.clear_watch_later'
+    assert lines[-1]['status'] == 'UNSET'
+
+
+@pytest.mark.anyio
+@pytest.mark.innertube_server(history_size=25, page_size=10)
+async def test_history_spans(innertube_server: InnerTubeServer) -> None:
+    tracer = RecordingTracer()
+    async with innertube_server.session() as session:
+        client = YouTubeClient(session, tracer=tracer)
+        video_ids = [x async for x in client.get_history_video_ids()]
+        assert await client.remove_video_ids_from_history(video_ids[:3], batch_size=2)
+        innertube_server.faults.inject('server_error')
+        with pytest.raises(niquests.HTTPError):
+            await client.clear_watch_history()
+    ids = _only(tracer, 'YouTubeClient.get_history_video_ids')
+    assert ids.attributes == {'return_dict': False}
+    (info,) = _children(tracer, ids)
+    assert info.name == 'YouTubeClient.get_history_info'
+    assert info.attributes == {'page_count': 3, 'item_count': 25}
+    remove = _only(tracer, 'YouTubeClient.remove_video_ids_from_history')
+    assert remove.attributes['batch_size'] == 2
+    batches = [x for x in _children(tracer, remove) if x.name == 'mutation_batch']
+    assert [x.attributes for x in batches] == [{
+        'batch_index': 0,
+        'batch_size': 2,
+        'item_count': 2
+    }, {
+        'batch_index': 1,
+        'batch_size': 1,
+        'item_count': 1
+    }]
+    clear = _only(tracer, 'YouTubeClient.clear_watch_history')
+    assert clear.to_dict()['status'] == 'ERROR'
+    assert clear.events[0]['attributes']['exception.type'] == 'HTTPError'
+    assert _children(tracer, clear)[0].events
+
+
+@pytest.mark.anyio
+@pytest.mark.innertube_server(playlists={'WL': 3}, page_size=2)
+async def test_opentelemetry_tracer(innertube_server: InnerTubeServer) -> None:
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    tracer = OpenTelemetryTracer(provider.get_tracer(__name__))
+    async with innertube_server.session() as session:
+        video_ids = [
+            x async for x in YouTubeClient(session, tracer=tracer).get_playlist_video_ids('WL')
+        ]
+    assert len(video_ids) == 3
+    spans = {x.name: x for x in exporter.get_finished_spans()}
+    root = spans['YouTubeClient.get_playlist_video_ids']
+    assert root.parent is None
+    info = spans['YouTubeClient.get_playlist_info']
+    assert info.parent is not None
+    assert info.parent.span_id == root.context.span_id
+    assert info.attributes == {'playlist_id': 'WL', 'page_count': 2, 'item_count': 3}
+    assert spans['continuation'].parent is not None
+    assert spans['continuation'].parent.span_id == info.context.span_id
+
+
+@pytest.mark.anyio
+async def test_trace_items_current_span() -> None:
+    tracer = RecordingTracer()
+    outside: list[object] = []
+
+    async def items() -> AsyncGenerator[int, None]:
+        for i in range(2):
+            tracer.start_span('item', current_span(), {'index': i}).end()
+            yield i
+
+    async def consume(span: RecordedSpan) -> None:
+        outside.extend([current_span() async for _ in trace_items(span, items())])
+
+    root = tracer.start_span('root')
+    await consume(root)
+    assert [x.parent_span_id for x in tracer.spans if x.name == 'item'] == [root.span_id] * 2
+    assert tracer.spans[-1] is root
+    assert all(x is not root for x in outside)
+
+
+def test_default_tracer(mocker: MockerFixture) -> None:
+    client = YouTubeClient(mocker.MagicMock())
+    assert client.tracer is NOOP_TRACER
+    span = NOOP_TRACER.start_span('x')
+    span.set_attribute('a', 1)
+    span.record_exception(ValueError())
+    span.end()
+    assert current_span() is span
+
+
+async def _history(self: YouTubeClient, *args: object,
+                   **kwargs: object) -> AsyncGenerator[str, None]:
+    self.tracer.start_span('history').end()
+    yield '1234'
+
+
+def test_main_trace_file(mocker: MockerFixture, runner: CliRunner, mock_build_session: None,
+                         tmp_path: Path) -> None:
+    mocker.patch.object(YouTubeClient, 'get_history_video_ids', _history)
+    path = tmp_path / 'trace.jsonl'
+    result = runner.invoke(main, ['--trace-file', str(path), 'print-history'])
+    assert result.exit_code == 0
+    assert json.loads(path.read_text())['name'] == 'history'
+
+
+def test_main_trace_file_and_otel(runner: CliRunner) -> None:
+    result = runner.invoke(main, ['--trace-file', 'trace.jsonl', '--otel', 'print-history'])
+    assert result.exit_code == 2
+    assert 'cannot be used together' in result.output
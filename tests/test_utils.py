@@ -10,6 +10,7 @@ from youtube_unofficial.utils import (
     find_ytcfg,
     get_text_runs,
     initial_data,
+    playlist_video_count,
     ytcfg_headers,
 )
 import pytest
@@ -53,6 +54,15 @@ def test_initial_data(mocker: MockerFixture) -> None:
     assert result == {'key': 'value'}
 
 
+def test_playlist_video_count() -> None:
+    header = {'numVideosText': {'runs': [{'text': '1,234'}, {'text': ' videos'}]}}
+    assert playlist_video_count({'header': {'playlistHeaderRenderer': header}}) == 1234
+    assert playlist_video_count({'header': {'playlistHeaderRenderer': {}}}) is None
+    assert playlist_video_count({}) is None
+    no_videos = {'numVideosText': {'runs': [{'text': 'No videos'}]}}
+    assert playlist_video_count({'header': {'playlistHeaderRenderer': no_videos}}) is None
+
+
 def test_find_ytcfg(mocker: MockerFixture) -> None:
     mock_soup = mocker.MagicMock(spec=BeautifulSoup)
     mock_script = '<script>ytcfg.set({"INNERTUBE_CONTEXT_CLIENT_VERSION": "1.20230101"});</script>'
@@ -61,6 +71,27 @@ def test_find_ytcfg(mocker: MockerFixture) -> None:
     assert result == {'INNERTUBE_CONTEXT_CLIENT_VERSION': '1.20230101'}
 
 
+def test_find_ytcfg_terminator_in_string(mocker: MockerFixture) -> None:
+    mock_soup = mocker.MagicMock(spec=BeautifulSoup)
+    mock_script = ('<script>ytcfg.set({"A": "x})", "INNERTUBE_CONTEXT_CLIENT_VERSION": "1"}); '
+                   'window.f({"B": 1});</script>')
+    mocker.patch('youtube_unofficial.utils.extract_script_content', return_value=[mock_script])
+    assert find_ytcfg(mock_soup) == {'A': 'x})', 'INNERTUBE_CONTEXT_CLIENT_VERSION': '1'}
+
+
+def test_find_ytcfg_brackets_in_strings(mocker: MockerFixture) -> None:
+    mock_soup = mocker.MagicMock(spec=BeautifulSoup)
+    mock_script = (r'<script>ytcfg.set({"A": ["\"}]", {"B": "[{"}], '
+                   r'"INNERTUBE_CONTEXT_CLIENT_VERSION": "1"} ); f({"C": 1});})</script>')
+    mocker.patch('youtube_unofficial.utils.extract_script_content', return_value=[mock_script])
+    assert find_ytcfg(mock_soup) == {
+        'A': ['"}]', {
+            'B': '[{'
+        }],
+        'INNERTUBE_CONTEXT_CLIENT_VERSION': '1'
+    }
+
+
 def test_ytcfg_headers() -> None:
     ytcfg: YtcfgDict = {'USER_SESSION_ID': '12345'}
     result = ytcfg_headers(ytcfg)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from youtube_unofficial.client import YouTubeClient
+from youtube_unofficial.testing.server import Faults, InnerTubeServer
+import niquests
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Mapping
+
+    from youtube_unofficial.testing.server import StandInSession
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return 'asyncio'
+
+
+@pytest.fixture
+async def session(innertube_server: InnerTubeServer) -> AsyncIterator[StandInSession]:
+    session = innertube_server.session()
+    async with session:
+        yield session
+
+
+@pytest.mark.anyio
+@pytest.mark.innertube_server(history_size=250, page_size=100)
+async def test_history_pages(innertube_server: InnerTubeServer, session: StandInSession) -> None:
+    client = YouTubeClient(session)
+    assert [x async for x in client.get_history_video_ids()] == innertube_server.history
+    entries = [x async for x in client.get_history_video_ids(return_dict=True)]
+    assert entries[0]['video_id'] == innertube_server.history[0]
+    assert innertube_server.requests['/youtubei/v1/browse'] == 4
+
+
+@pytest.mark.anyio
+@pytest.mark.innertube_server(history_size=30, page_size=10)
+async def test_history_mutations(innertube_server: InnerTubeServer,
+                                 session: StandInSession) -> None:
+    client = YouTubeClient(session)
+    removed = innertube_server.history[5:25:5]
+    assert await client.remove_video_ids_from_history(removed, batch_size=2)
+    assert len(innertube_server.history) == 26
+    assert not set(removed) & set(innertube_server.history)
+    removed = innertube_server.history[20:2:-6]
+    assert await client.remove_video_ids_from_history(removed, batch_size=1)
+    assert len(innertube_server.history) == 23
+    assert not set(removed) & set(innertube_server.history)
+    assert await client.toggle_watch_history()
+    assert innertube_server.history_paused
+    assert await client.clear_watch_history()
+    assert not innertube_server.history
+    assert not await client.clear_watch_history()
+
+
+@pytest.mark.anyio
+@pytest.mark.innertube_server(history_size=50, page_size=10)
+async def test_history_removal_absent_ids(innertube_server: InnerTubeServer,
+                                          session: StandInSession) -> None:
+    client = YouTubeClient(session)
+    present = innertube_server.history[5:50:10]
+    video_ids = [x for i, video_id in enumerate(present) for x in (video_id, f'absent{i}')]
+    assert await client.remove_video_ids_from_history(video_ids, batch_size=2)
+    assert not set(present) & set(innertube_server.history)
+    # The first batch scans all 5 pages and finds that absent0 is not in history. The other
+    # absent IDs are then known to be absent, so the second batch starts again from the top and
+    # the following batches continue from where it stopped.
+    assert innertube_server.requests['/feed/history'] == 2
+    assert innertube_server.requests['/youtubei/v1/browse'] == 4 + 4
+
+
+@pytest.mark.anyio
+@pytest.mark.innertube_server(playlists={'WL': 25, 'PLx': 0}, page_size=10)
+async def test_playlists(innertube_server: InnerTubeServer, session: StandInSession) -> None:
+    client = YouTubeClient(session)
+    video_ids = [video_id for video_id, _ in innertube_server.playlists['WL']]
+    assert [x async for x in client.get_playlist_video_ids('WL')] == video_ids
+    assert await client.remove_set_video_id_from_playlist('WL',
+                                                          innertube_server.playlists['WL'][0][1])
+    assert not await client.remove_video_id_from_playlist('WL', video_ids[0])
+    await client.clear_watch_later()
+    assert not innertube_server.playlists['WL']
+    with pytest.raises(KeyError, match='empty'):
+        [x async for x in client.get_playlist_video_ids('PLx')]
+    with pytest.raises(niquests.HTTPError, match='404'):
+        [x async for x in client.get_playlist_video_ids('PLmissing')]
+
+
+@pytest.mark.anyio
+@pytest.mark.innertube_server(playlists={'WL': 2})
+async def test_playlist_capture_sink(innertube_server: InnerTubeServer,
+                                     session: StandInSession) -> None:
+    captured: list[tuple[str, Mapping[str, Any], Mapping[str, Any]]] = []
+    client = YouTubeClient(session, capture_sink=lambda *args: captured.append(args))
+    (video_id, _), (_, set_video_id) = innertube_server.playlists['WL']
+    assert await client.remove_video_id_from_playlist('WL', video_id)
+    assert await client.remove_set_video_id_from_playlist('WL', set_video_id)
+    assert [(url, request['actions'][0]['action'], response['status'])
+            for url, request, response in captured
+            ] == [('https://www.youtube.com/youtubei/v1/browse/edit_playlist',
+                   'ACTION_REMOVE_VIDEO_BY_VIDEO_ID', 'STATUS_SUCCEEDED'),
+                  ('https://www.youtube.com/youtubei/v1/browse/edit_playlist',
+                   'ACTION_REMOVE_VIDEO', 'STATUS_SUCCEEDED')]
+
+
+@pytest.mark.anyio
+@pytest.mark.innertube_server(faults=Faults(latency=0.01))
+async def test_faults(innertube_server: InnerTubeServer, session: StandInSession) -> None:
+    client = YouTubeClient(session)
+    innertube_server.faults.inject('rate_limit', 'server_error', 'truncate', None)
+    with pytest.raises(niquests.HTTPError, match='429') as e:
+        [x async for x in client.get_history_video_ids()]
+    assert e.value.response is not None
+    assert e.value.response.headers['Retry-After'] == '1'
+    with pytest.raises(niquests.HTTPError, match='503'):
+        [x async for x in client.get_history_video_ids()]
+    with pytest.raises(niquests.RequestException):
+        [x async for x in client.get_history_video_ids()]
+    assert len([x async for x in client.get_history_video_ids()]) == 100
+    assert innertube_server.requests['/feed/history'] == 4
+
+
+def test_fault_rates() -> None:
+    faults = Faults(rate_limit=0.25, server_error=0.25, truncate=0.25, seed=1)
+    drawn = [faults.next_fault() for _ in range(1000)]
+    assert {drawn.count(x) // 100 for x in ('rate_limit', 'server_error', 'truncate', None)} == {2}
+    again = Faults(rate_limit=0.25, server_error=0.25, truncate=0.25, seed=1)
+    assert drawn == [again.next_fault() for _ in range(1000)]
+
+
+@pytest.mark.anyio
+async def test_rejected_requests(innertube_server: InnerTubeServer,
+                                 session: StandInSession) -> None:
+    url = 'https://www.youtube.com/youtubei/v1/browse'
+    assert (await session.post(url, json={})).status_code == 401
+    headers = {'Authorization': 'SAPISIDHASH 1_a'}
+    assert (await session.post(url, params={'key': 'x'}, headers=headers)).status_code == 400
+    assert (await session.post(url, data=b'{', headers=headers)).status_code == 400
+    assert (await session.post(url, json={'continuation': 'x:y'},
+                               headers=headers)).status_code == 400
+    assert (await session.post(url, json={'continuation': 'playlist:PLmissing:0'},
+                               headers=headers)).status_code == 400
+    assert (await session.get('https://www.youtube.com/watch')).status_code == 404
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+import json
+
+from youtube_unofficial.testing.synthetic import SyntheticData
+import niquests
+import pytest
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+    from youtube_unofficial.client import YouTubeClient
+
+
+def _serve(mocker: MockerFixture, client: YouTubeClient, html: str,
+           continuations: dict[str, dict[str, Any]]) -> list[str]:
+    tokens: list[str] = []
+
+    async def request(method: str, url: str, **kwargs: Any) -> niquests.Response:
+        resp = niquests.Response()
+        resp.status_code = 200
+        if method == 'get':
+            resp._content = html.encode()  # ruff:ignore[private-member-access]
+        else:
+            tokens.append(kwargs['json']['continuation'])
+            resp._content = json.dumps(  # ruff:ignore[private-member-access]
+                continuations[tokens[-1]]).encode()
+        resp.encoding = 'utf-8'
+        return resp
+
+    client.session.headers = niquests.structures.CaseInsensitiveDict()
+    mocker.patch.object(client.session, 'request', side_effect=request)
+    return tokens
+
+
+def test_synthetic_data_is_deterministic() -> None:
+    assert SyntheticData(1).history_chain(300, continuations=2) == SyntheticData(1).history_chain(
+        300, continuations=2)
+    assert SyntheticData(1).playlist_renderer('WL', 7) == SyntheticData(1).playlist_renderer(
+        'WL', 7)
+    assert SyntheticData(1).history_renderer(5) != SyntheticData(2).history_renderer(5)
+    assert SyntheticData(1).video_id(5) != SyntheticData(1).video_id(5, 'WL')
+    assert len(SyntheticData(1).video_id(5)) == 11
+
+
+def test_feedback_tokens() -> None:
+    data = SyntheticData(3)
+    assert data.feedback_token_entry(data.feedback_token(1234)) == 1234
+    assert data.feedback_token_entry(data.clear_history_token) is None
+    assert data.feedback_token_entry('not base64!') is None
+
+
+@pytest.mark.anyio
+async def test_history_chain(client: YouTubeClient, mocker: MockerFixture) -> None:
+    html, continuations = SyntheticData(1).history_chain(1000, continuations=9)
+    assert len(continuations) == 9
+    tokens = _serve(mocker, client, html, continuations)
+    entries = [x async for x in client.get_history_video_ids(return_dict=True)]
+    assert tokens == list(continuations)
+    assert [x['video_id'] for x in entries] == [SyntheticData(1).video_id(n) for n in range(1000)]
+    entry: dict[str, Any] = dict(entries[0])
+    assert {
+        'description', 'length', 'length_accessible', 'long_byline_text', 'owner_text',
+        'short_byline_text', 'short_view_count_text', 'title', 'video_thumbnails',
+        'view_count_text', 'watch_url'
+    } <= entry.keys()
+    assert len(entry['video_thumbnails']) == 5
+    assert any('verified' in x for x in entries)
+    assert any('moving_thumbnails' in x for x in entries)
+
+
+@pytest.mark.anyio
+async def test_playlist_chain(client: YouTubeClient, mocker: MockerFixture) -> None:
+    data = SyntheticData(1)
+    html, continuations = data.playlist_chain('PLx', 250, continuations=2)
+    _serve(mocker, client, html, continuations)
+    entries = [x async for x in client.get_playlist_video_ids('PLx', return_dict=True)]
+    assert [x['video_id'] for x in entries] == [data.video_id(n, 'PLx') for n in range(250)]
+    assert all(x['owner'] and x['title'] for x in entries)
+
+
+@pytest.mark.anyio
+async def test_empty_playlist_chain(client: YouTubeClient, mocker: MockerFixture) -> None:
+    html, continuations = SyntheticData(1).playlist_chain('PLx', 0, continuations=5)
+    assert not continuations
+    _serve(mocker, client, html, continuations)
+    with pytest.raises(KeyError, match='empty'):
+        [x async for x in client.get_playlist_video_ids('PLx')]
@@ -1,8 +1,25 @@
 """Unofficial YouTube client."""
 from __future__ import annotations
 
-from .client import YouTubeClient
-from .session import build_youtube_session
+from typing import TYPE_CHECKING, Any
+import importlib
 
-__all__ = ('YouTubeClient', 'build_youtube_session')
+if TYPE_CHECKING:
+    from .client import YouTubeClient
+    from .pool import ClientPool
+    from .session import build_youtube_session
+
+__all__ = ('ClientPool', 'YouTubeClient', 'build_youtube_session')
 __version__ = 'v0.4.0'
+
+
+def __getattr__(name: str) -> Any:
+    # Loaded on first access so that importing the CLI does not pull in bs4 and niquests.
+    if name == 'ClientPool':
+        return importlib.import_module('.pool', __name__).ClientPool
+    if name == 'YouTubeClient':
+        return importlib.import_module('.client', __name__).YouTubeClient
+    if name == 'build_youtube_session':
+        return importlib.import_module('.session', __name__).build_youtube_session
+    msg = f'module {__name__!r} has no attribute {name!r}'
+    raise AttributeError(msg)
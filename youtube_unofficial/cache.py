@@ -0,0 +1,660 @@
+"""HTTP cache storage."""
+from __future__ import annotations
+
+from datetime import timedelta
+from enum import Enum
+from hashlib import sha256
+from http import HTTPStatus
+from pathlib import Path
+from time import time
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, cast
+from urllib.parse import urlparse
+import json
+import logging
+import re
+import sqlite3
+import sys
+import threading
+import weakref
+
+from niquests_cache import AsyncCachedSession
+from niquests_cache.backends import BaseBackend
+from typing_extensions import override
+import niquests
+import platformdirs
+
+from .constants import WATCH_HISTORY_URL
+
+try:
+    if sys.version_info >= (3, 14):
+        from compression.zstd import compress as zstd_compress, decompress as zstd_decompress
+    else:
+        from zstandard import compress as zstd_compress, decompress as zstd_decompress
+    HAS_ZSTD = True
+except ImportError:  # pragma: no cover
+    HAS_ZSTD = False
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from niquests_cache.typing import CacheEntry
+
+__all__ = ('DEFAULT_CACHE_MAX_BYTES', 'DEFAULT_CACHE_MAX_ENTRIES', 'DEFAULT_CACHE_TTLS',
+           'BoundedSQLiteBackend', 'CacheMissError', 'CachePolicy', 'RequestClass',
+           'YouTubeCachedSession', 'ZstdSQLiteBackend', 'cache_dir', 'cache_namespace')
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CACHE_MAX_ENTRIES = 1000
+"""Default maximum number of responses kept per cache namespace."""
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+"""Default budget in bytes of compressed bodies kept per cache namespace."""
+
+_SCHEMA = ('CREATE TABLE IF NOT EXISTS responses ('
+           'key TEXT PRIMARY KEY, '
+           'content BLOB NOT NULL, '
+           'encoding TEXT NOT NULL, '
+           'headers TEXT NOT NULL, '
+           'status_code INTEGER NOT NULL, '
+           'ts REAL NOT NULL, '
+           'url TEXT NOT NULL)')
+_SELECT = 'SELECT content, encoding, headers, status_code, ts, url FROM responses WHERE key = ?'
+_UPSERT = ('INSERT OR REPLACE INTO responses '
+           '(key, content, encoding, headers, status_code, ts, url) '
+           'VALUES (?, ?, ?, ?, ?, ?, ?)')
+_EVICT = ('DELETE FROM responses WHERE key IN '
+          '(SELECT key FROM responses ORDER BY ts DESC LIMIT -1 OFFSET ?)')
+_DELETE_GLOB = 'DELETE FROM responses WHERE url GLOB ?'
+_ZSTD_SCHEMA = ('CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, '
+                'content BLOB NOT NULL, '
+                'encoding TEXT NOT NULL, '
+                'headers TEXT NOT NULL, '
+                'status_code INTEGER NOT NULL, '
+                'ts REAL NOT NULL, '
+                'url TEXT NOT NULL, '
+                'size INTEGER NOT NULL, '
+                'atime REAL NOT NULL)')
+_ZSTD_UPSERT = ('INSERT OR REPLACE INTO responses '
+                '(key, content, encoding, headers, status_code, ts, url, size, atime) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)')
+_TOUCH = 'UPDATE responses SET atime = ? WHERE key = ?'
+_EVICT_LRU = ('DELETE FROM responses WHERE key IN '
+              '(SELECT key FROM responses ORDER BY atime DESC, rowid DESC LIMIT -1 OFFSET ?)')
+_EVICT_LRU_BYTES = ('DELETE FROM responses WHERE key IN '
+                    '(SELECT key FROM (SELECT key, SUM(size) OVER '
+                    '(ORDER BY atime DESC, rowid DESC) AS total FROM responses) WHERE total > ?)')
+_UNSAFE_CHARS_RE = re.compile(r'[^\w.-]+')
+_BROWSE_URL_GLOB = 'https://www.youtube.com/youtubei/v1/browse*'
+
+
+class CacheMissError(Exception):
+    """Raised when a cache-only request has no cached response."""
+    def __init__(self, method: str, url: str) -> None:
+        super().__init__(f'No cached response for {method.upper()} {url}.')
+
+
+def cache_namespace(browser: str, profile: str, delegated_session_id: str | None = None) -> str:
+    """
+    Get the cache namespace for an account.
+
+    Parameters
+    ----------
+    browser : str
+        Browser name.
+    profile : str
+        Browser profile name.
+    delegated_session_id : str | None
+        ``DELEGATED_SESSION_ID`` of a brand account, if known.
+
+    Returns
+    -------
+    str
+        A name safe to use as a directory name.
+    """
+    parts = (browser, profile) + ((delegated_session_id,) if delegated_session_id else ())
+    return '-'.join(_UNSAFE_CHARS_RE.sub('_', part) for part in parts)
+
+
+def cache_dir(namespace: str) -> Path:
+    """
+    Get the cache directory of a namespace.
+
+    Parameters
+    ----------
+    namespace : str
+        Namespace from :py:func:`cache_namespace`.
+
+    Returns
+    -------
+    Path
+        Directory under the user cache directory. It is not created.
+    """
+    return platformdirs.user_cache_path('youtube-unofficial', appauthor=False) / namespace
+
+
+class BoundedSQLiteBackend(BaseBackend):
+    """
+    Cache responses in a SQLite database holding at most ``max_entries`` entries.
+
+    When the limit is exceeded, the entries written longest ago are evicted. The backend may be
+    used from several threads. Each operation holds a lock, so the statements of one operation are
+    not interleaved with those of another and the counters are exact, including on free-threaded
+    builds of Python.
+    """
+    _schema = _SCHEMA
+
+    def __init__(self, database: str | Path, *, max_entries: int | None = None) -> None:
+        """
+        Initialise the backend.
+
+        Parameters
+        ----------
+        database : str | Path
+            Database path. ``':memory:'`` keeps the cache in memory.
+        max_entries : int | None
+            Maximum number of entries. ``None`` means no limit.
+        """
+        if database != ':memory:':
+            Path(database).parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        """Maximum number of entries, or ``None`` for no limit."""
+        # The finalizer runs in whichever thread collects the backend.
+        self._conn = sqlite3.connect(database, check_same_thread=False)
+        # Re-entrant because subclasses call the methods of this class while holding it.
+        self._lock = threading.RLock()
+        self._conn.execute(self._schema)
+        self._conn.commit()
+        self._finalizer = weakref.finalize(self, self._conn.close)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._finalizer()
+
+    def __len__(self) -> int:
+        """
+        Get the number of stored entries.
+
+        Returns
+        -------
+        int
+            Number of entries.
+        """
+        with self._lock:
+            return cast('int', self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0])
+
+    @override
+    def get(self, key: str) -> CacheEntry | None:
+        """
+        Look up a cached entry.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+
+        Returns
+        -------
+        CacheEntry | None
+            The stored entry, or ``None`` if not present.
+        """
+        with self._lock:
+            row: tuple[Any, ...] | None = self._conn.execute(_SELECT, (key,)).fetchone()
+        if row is None:
+            return None
+        content, encoding, headers, status_code, ts, url = row
+        return {
+            'content': bytes(content),
+            'encoding': encoding,
+            'headers': json.loads(headers),
+            'status_code': status_code,
+            'ts': ts,
+            'url': url
+        }
+
+    @override
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """
+        Persist a cache entry and evict old entries if over the limit.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        entry : CacheEntry
+            The entry to store.
+        """
+        headers = json.dumps(dict(entry['headers']))
+        with self._lock:
+            self._conn.execute(_UPSERT, (key, entry['content'], entry['encoding'], headers,
+                                         entry['status_code'], entry['ts'], entry['url']))
+            if self.max_entries is not None:
+                self._conn.execute(_EVICT, (self.max_entries,))
+            self._conn.commit()
+
+    def delete_urls(self, *url_globs: str) -> int:
+        """
+        Delete the entries whose response URL matches any of the patterns.
+
+        Parameters
+        ----------
+        *url_globs : str
+            SQLite ``GLOB`` patterns.
+
+        Returns
+        -------
+        int
+            Number of deleted entries.
+        """
+        with self._lock:
+            deleted = sum(self._conn.execute(_DELETE_GLOB, (x,)).rowcount for x in url_globs)
+            self._conn.commit()
+        return deleted
+
+
+class ZstdSQLiteBackend(BoundedSQLiteBackend):
+    """
+    Cache zstd-compressed responses in a SQLite database with a total byte budget.
+
+    When the budget (or ``max_entries``) is exceeded, the least recently used entries are evicted.
+    Hits, misses and evictions are counted from the creation of the backend.
+
+    Requires Python 3.14 or the ``zstandard`` package (the ``zstd`` extra).
+    """
+    _schema = _ZSTD_SCHEMA
+
+    def __init__(self,
+                 database: str | Path,
+                 *,
+                 max_bytes: int | None = DEFAULT_CACHE_MAX_BYTES,
+                 max_entries: int | None = None,
+                 level: int = 3) -> None:
+        """
+        Initialise the backend.
+
+        Parameters
+        ----------
+        database : str | Path
+            Database path. ``':memory:'`` keeps the cache in memory.
+        max_bytes : int | None
+            Maximum total size of the compressed bodies. ``None`` means no limit.
+        max_entries : int | None
+            Maximum number of entries. ``None`` means no limit.
+        level : int
+            zstd compression level.
+
+        Raises
+        ------
+        ImportError
+            If zstd is not available.
+        """
+        if not HAS_ZSTD:  # pragma: no cover
+            msg = ('zstd compression requires Python 3.14 or the zstandard package. Install '
+                   'youtube-unofficial[zstd].')
+            raise ImportError(msg)
+        super().__init__(database, max_entries=max_entries)
+        self.max_bytes = max_bytes
+        """Maximum total size of the compressed bodies, or ``None`` for no limit."""
+        self.level = level
+        """zstd compression level."""
+        self.hits = 0
+        """Number of lookups that found an entry."""
+        self.misses = 0
+        """Number of lookups that found no entry."""
+        self.evictions = 0
+        """Number of entries evicted to stay within the limits."""
+
+    @property
+    def size(self) -> int:
+        """Total size in bytes of the stored compressed bodies."""
+        with self._lock:
+            return cast(
+                'int',
+                self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0])
+
+    @override
+    def close(self) -> None:
+        """Log the statistics and close the database connection."""
+        if self._finalizer.alive:
+            log.debug('Cache: %d hits, %d misses, %d evictions.', self.hits, self.misses,
+                      self.evictions)
+        super().close()
+
+    @override
+    def get(self, key: str) -> CacheEntry | None:
+        """
+        Look up a cached entry and mark it as recently used.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+
+        Returns
+        -------
+        CacheEntry | None
+            The stored entry, or ``None`` if not present.
+        """
+        with self._lock:
+            if (entry := super().get(key)) is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(_TOUCH, (time(), key))
+            self._conn.commit()
+        return entry | {'content': zstd_decompress(entry['content'])}
+
+    @override
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """
+        Compress and persist a cache entry, then evict entries if over the limits.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        entry : CacheEntry
+            The entry to store.
+        """
+        # Compression does not need the lock, so several threads may compress at once.
+        content = zstd_compress(entry['content'], level=self.level)
+        headers = json.dumps(dict(entry['headers']))
+        with self._lock:
+            self._conn.execute(_ZSTD_UPSERT,
+                               (key, content, entry['encoding'], headers, entry['status_code'],
+                                entry['ts'], entry['url'], len(content), time()))
+            if self.max_entries is not None:
+                self.evictions += self._conn.execute(_EVICT_LRU, (self.max_entries,)).rowcount
+            if self.max_bytes is not None:
+                self.evictions += self._conn.execute(_EVICT_LRU_BYTES, (self.max_bytes,)).rowcount
+            self._conn.commit()
+
+
+class RequestClass(str, Enum):
+    """Kinds of requests the client makes, for caching purposes."""
+    BOOTSTRAP = 'bootstrap'
+    """HTML page carrying ``ytcfg`` and ``ytInitialData`` (history and playlist pages)."""
+    BROWSE = 'browse'
+    """``/youtubei/v1/browse`` continuation request."""
+    EDIT_PLAYLIST = 'edit_playlist'
+    """``/youtubei/v1/browse/edit_playlist`` mutation."""
+    FEEDBACK = 'feedback'
+    """``/youtubei/v1/feedback`` mutation."""
+    OTHER = 'other'
+    """Anything else."""
+
+
+DEFAULT_CACHE_TTLS: Mapping[RequestClass, timedelta | None] = MappingProxyType({
+    RequestClass.BOOTSTRAP: timedelta(minutes=10),
+    RequestClass.BROWSE: timedelta(minutes=10),
+    RequestClass.EDIT_PLAYLIST: None,
+    RequestClass.FEEDBACK: None,
+    RequestClass.OTHER: timedelta(minutes=10)
+})
+"""Default time-to-live per request class. ``None`` means never cached."""
+_MUTATIONS = frozenset({RequestClass.EDIT_PLAYLIST, RequestClass.FEEDBACK})
+
+
+class CachePolicy:
+    """
+    Decide what is cached, for how long, and what a mutation makes stale.
+
+    Mutations (:py:attr:`RequestClass.EDIT_PLAYLIST` and :py:attr:`RequestClass.FEEDBACK`) are never
+    cached. A successful ``edit_playlist`` call invalidates the cached page of the playlist it
+    changed, and a successful feedback call invalidates the cached history page. Both invalidate
+    all cached browse continuations, as their feedback tokens and continuation tokens may be stale.
+    """
+    def __init__(self, ttls: Mapping[RequestClass, timedelta | None] | None = None) -> None:
+        """
+        Initialise the policy.
+
+        Parameters
+        ----------
+        ttls : Mapping[RequestClass, timedelta | None] | None
+            Time-to-live overrides per request class. ``None`` disables caching for a class.
+            Overrides for mutation classes are ignored.
+        """
+        self.ttls: dict[RequestClass, timedelta | None] = dict(DEFAULT_CACHE_TTLS) | {
+            k: v
+            for k, v in (ttls or {}).items() if k not in _MUTATIONS
+        }
+        """Time-to-live per request class."""
+
+    @staticmethod
+    def classify(method: str, url: str) -> RequestClass:
+        """
+        Classify a request.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method.
+        url : str
+            Request URL.
+
+        Returns
+        -------
+        RequestClass
+            The class of the request.
+        """
+        path = urlparse(url).path
+        if path == '/youtubei/v1/browse/edit_playlist':
+            return RequestClass.EDIT_PLAYLIST
+        if path == '/youtubei/v1/feedback':
+            return RequestClass.FEEDBACK
+        method = method.upper()
+        if path == '/youtubei/v1/browse' and method == 'POST':
+            return RequestClass.BROWSE
+        if path in {'/feed/history', '/playlist'} and method == 'GET':
+            return RequestClass.BOOTSTRAP
+        return RequestClass.OTHER
+
+    @staticmethod
+    def browse_cache_key(url: str, json_data: Any) -> str | None:
+        """
+        Get the cache key of a browse continuation request.
+
+        Browse requests are POST requests whose result depends on the continuation token in the
+        body, so the key is derived from the URL and that token. Headers are ignored, as the
+        ``Authorization`` header differs on every request.
+
+        Parameters
+        ----------
+        url : str
+            Request URL.
+        json_data : Any
+            JSON body of the request.
+
+        Returns
+        -------
+        str | None
+            The key, or ``None`` if the request has no continuation token and must not be cached.
+        """
+        if not isinstance(json_data, dict) or not json_data.get('continuation'):
+            return None
+        path = urlparse(url).path
+        return sha256(f'POST {path} {json_data["continuation"]}'.encode()).hexdigest()
+
+    @staticmethod
+    def invalidated_urls(request_class: RequestClass, json_data: Any) -> tuple[str, ...]:
+        """
+        Get the cached URLs made stale by a successful mutation.
+
+        Parameters
+        ----------
+        request_class : RequestClass
+            Class of the mutation.
+        json_data : Any
+            JSON body of the mutation request.
+
+        Returns
+        -------
+        tuple[str, ...]
+            SQLite ``GLOB`` patterns of response URLs to drop from the cache.
+        """
+        if request_class == RequestClass.FEEDBACK:
+            return (WATCH_HISTORY_URL, _BROWSE_URL_GLOB)
+        if request_class == RequestClass.EDIT_PLAYLIST and isinstance(json_data, dict):
+            return (f'https://www.youtube.com/playlist?list={json_data.get("playlistId", "*")}',
+                    _BROWSE_URL_GLOB)
+        return ()
+
+
+def _response_from_entry(entry: CacheEntry) -> niquests.Response:
+    resp = niquests.Response()
+    resp.status_code = entry['status_code']
+    resp._content = entry['content']  # ruff:ignore[private-member-access]
+    resp.headers.update(entry['headers'])
+    resp.url = entry['url']
+    resp.encoding = entry['encoding']
+    return resp
+
+
+def _entry_from_response(resp: niquests.Response) -> CacheEntry:
+    return {
+        'content': resp.content or b'',
+        'encoding': resp.encoding or 'utf-8',
+        'headers': {
+            k: v if isinstance(v, str) else v.decode()
+            for k, v in dict(resp.headers).items()
+        },
+        'status_code': resp.status_code or 0,
+        'ts': time(),
+        'url': str(resp.url)
+    }
+
+
+class YouTubeCachedSession(AsyncCachedSession):
+    """Cached session that applies a :py:class:`CachePolicy` to every request."""
+    def __init__(self, *args: Any, cache_policy: CachePolicy | None = None, **kwargs: Any) -> None:
+        """
+        Initialise the session.
+
+        Parameters
+        ----------
+        *args : Any
+            Positional arguments for :py:class:`niquests_cache.AsyncCachedSession`.
+        cache_policy : CachePolicy | None
+            Caching rules. Defaults to :py:class:`CachePolicy` with default TTLs.
+        **kwargs : Any
+            Keyword arguments for :py:class:`niquests_cache.AsyncCachedSession`.
+        """
+        super().__init__(*args, **kwargs)
+        self.cache_policy = cache_policy or CachePolicy()
+        """Caching rules."""
+
+    @override
+    async def request(  # type: ignore[override]
+            self, method: str, url: str, *args: Any, **kwargs: Any) -> niquests.Response:
+        """
+        Send a request, using the cache as allowed by :py:attr:`cache_policy`.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method.
+        url : str
+            The URL.
+        *args : Any
+            Positional arguments forwarded to the parent.
+        **kwargs : Any
+            Keyword arguments forwarded to the parent. If ``only_if_cached`` is ``True``, the
+            response is served from the cache whatever its age and the network is never used.
+
+        Returns
+        -------
+        niquests.Response
+            The HTTP response.
+        """
+        request_class = self.cache_policy.classify(method, url)
+        if kwargs.pop('only_if_cached', False):
+            return await self._cached_response(request_class, method, url, *args, **kwargs)
+        ttl = None if self.settings.disabled else self.cache_policy.ttls.get(request_class)
+        if ttl is None:
+            resp = await self._uncached_request(method, url, *args, **kwargs)
+            if request_class in _MUTATIONS and resp.ok:
+                self.invalidate(
+                    *self.cache_policy.invalidated_urls(request_class, kwargs.get('json')))
+            return resp
+        if request_class == RequestClass.BROWSE:
+            if (key := self.cache_policy.browse_cache_key(url, kwargs.get('json'))) is None:
+                return await self._uncached_request(method, url, *args, **kwargs)
+            if ((entry := await self.cache.aget(key)) is not None
+                    and time() - entry['ts'] < ttl.total_seconds()):
+                log.debug('Cache hit: %s %s', method, url)
+                return _response_from_entry(entry)
+            resp = await self._uncached_request(method, url, *args, **kwargs)
+            if (getattr(resp, '_content_consumed', True)
+                    and resp.status_code in self.settings.allowable_codes
+                    and not self.settings.read_only):
+                await self.cache.aset(key, _entry_from_response(resp))
+            return resp
+        return await super().request(method, url, *args, expire_after=ttl, **kwargs)
+
+    def invalidate(self, *url_globs: str) -> None:
+        """
+        Drop cached responses whose URL matches any of the patterns.
+
+        Only backends with a ``delete_urls`` method (such as :py:class:`BoundedSQLiteBackend`)
+        support invalidation. Other backends rely on the time-to-live alone.
+
+        Parameters
+        ----------
+        *url_globs : str
+            SQLite ``GLOB`` patterns.
+        """
+        if (delete_urls := getattr(self.cache, 'delete_urls', None)) is None:
+            log.debug('Cache backend %s does not support invalidation.', type(self.cache).__name__)
+            return
+        log.debug('Invalidated %d cached response(s) matching %s.', delete_urls(*url_globs),
+                  ', '.join(url_globs))
+
+    async def _cached_response(self, request_class: RequestClass, method: str, url: str, *args: Any,
+                               **kwargs: Any) -> niquests.Response:
+        """
+        Get a response from the cache only.
+
+        Parameters
+        ----------
+        request_class : RequestClass
+            Class of the request.
+        method : str
+            The HTTP method.
+        url : str
+            The URL.
+        *args : Any
+            Positional arguments forwarded to the parent.
+        **kwargs : Any
+            Keyword arguments forwarded to the parent.
+
+        Returns
+        -------
+        niquests.Response
+            The cached response.
+
+        Raises
+        ------
+        CacheMissError
+            If there is no cached response, or the request is never cached.
+        """
+        if request_class == RequestClass.BROWSE:
+            key = self.cache_policy.browse_cache_key(url, kwargs.get('json'))
+            if key is not None and (entry := await self.cache.aget(key)) is not None:
+                return _response_from_entry(entry)
+        elif request_class not in _MUTATIONS and method.upper() in self.settings.allowable_methods:
+            resp = await super().request(method,
+                                         url,
+                                         *args,
+                                         expire_after=-1,
+                                         only_if_cached=True,
+                                         **kwargs)
+            if resp.status_code != HTTPStatus.GATEWAY_TIMEOUT:
+                return resp
+        raise CacheMissError(method, url)
+
+    async def _uncached_request(self, method: str, url: str, *args: Any,
+                                **kwargs: Any) -> niquests.Response:
+        # Skip the caching layer of AsyncCachedSession and send the request as is.
+        return cast('niquests.Response', await super(AsyncCachedSession, self).request(
+            method, url, *args, **kwargs))
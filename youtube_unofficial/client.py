@@ -2,16 +2,21 @@
 
 from __future__ import annotations
 
-from collections.abc import AsyncGenerator, Iterable, Mapping
+from collections.abc import AsyncGenerator, Awaitable, Callable, Iterable, Mapping, Sequence
 from datetime import datetime, timezone
+from functools import partial, wraps
+from inspect import signature
+from itertools import chain
 from operator import itemgetter
-from typing import TYPE_CHECKING, Any, Literal, cast
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, TypeVar, cast
 import hashlib
-import json
 import logging
 
 from bs4 import BeautifulSoup as Soup
+from more_itertools import chunked
 from typing_extensions import overload
+import anyio.to_process
+import anyio.to_thread
 
 from .constants import (
     EXTRACTED_THUMBNAIL_KEYS,
@@ -22,6 +27,10 @@ from .constants import (
     WATCH_LATER_URL,
 )
 from .download import download_page
+from .hooks import ItemEvent, MutationEvent, PageEvent
+from .json_codec import LazyJSON, loads
+from .parsing import BootstrapPage, parse_bootstrap
+from .tracing import NOOP_TRACER, current_span, start_span, trace_items, use_span
 from .typing.playlist import PlaylistVideoIDsEntry
 from .utils import (
     context_client_body,
@@ -29,19 +38,22 @@ from .utils import (
     find_ytcfg,
     get_text_runs,
     initial_data,
+    playlist_video_count,
     ytcfg_headers,
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
-
     import niquests
 
+    from .hooks import ItemHook, MutationHook, PageHook, RequestHook
+    from .metrics import ClientMetrics
+    from .ratelimit import RateLimiter
+    from .tracing import Tracer
     from .typing.history import DescriptionSnippet, HistoryVideoIDsEntry, MetadataBadgeRendererTop
     from .typing.playlist import PlaylistInfo, PlaylistVideoListRenderer
     from .typing.ytcfg import YtcfgDict
 
-__all__ = ('NoFeedbackToken', 'YouTubeClient')
+__all__ = ('CaptureSink', 'NoFeedbackToken', 'YouTubeClient')
 
 log = logging.getLogger(__name__)
 
@@ -60,6 +72,159 @@ def _require_ytcfg_playlist_api(ytcfg: YtcfgDict) -> None:
         raise KeyError(msg)
 
 
+def _count_history_items(sections: Iterable[Mapping[str, Any]]) -> int:
+    return sum(
+        len(x['itemSectionRenderer'].get('contents', ())) for x in sections
+        if 'itemSectionRenderer' in x)
+
+
+class _HistoryScan:
+    # A scan of the history for the feedback tokens of batches of video IDs. It keeps its position
+    # between batches and the IDs of the entries it passes, but not their tokens.
+    def __init__(self, page: BootstrapPage, history: AsyncGenerator[dict[str, Any], None]) -> None:
+        self.ytcfg = page.ytcfg
+        self.history = history
+        # Video IDs passed since history was last downloaded.
+        self.seen: set[str] = set()
+        # Every video ID in history, once a scan has reached its end.
+        self.known: set[str] | None = None
+
+    async def restart(self, page: BootstrapPage, history: AsyncGenerator[dict[str, Any],
+                                                                         None]) -> None:
+        await self.history.aclose()
+        self.ytcfg = page.ytcfg
+        self.history = history
+        self.seen = set()
+
+    async def read(self, tokens: dict[str, str], pending: set[str]) -> bool:
+        # Read the feedback tokens of pending video IDs until all are found or history ends.
+        # Returns True if history ended first.
+        async for entry in self.history:
+            renderer = entry.get('videoRenderer', {})
+            if (video_id := renderer.get('videoId')) is None:
+                continue
+            self.seen.add(video_id)
+            if video_id not in pending:
+                continue
+            pending.discard(video_id)
+            try:
+                tokens[video_id] = renderer['menu']['menuRenderer']['topLevelButtons'][0][
+                    'buttonRenderer']['serviceEndpoint']['feedbackEndpoint']['feedbackToken']
+            except (IndexError, KeyError):
+                log.debug('No feedback token for history entry %s.', video_id)
+            if not pending:
+                return False
+        self.known = self.seen
+        return True
+
+    def forget(self, video_id: str) -> None:
+        # Called once an entry is removed.
+        self.seen.discard(video_id)
+        if self.known is not None:
+            self.known.discard(video_id)
+
+
+CaptureSink = Callable[[str, Mapping[str, Any], Mapping[str, Any]], None]
+"""Called with the URL, the request JSON and the response JSON of every InnerTube API call."""
+
+_T = TypeVar('_T')
+_G = TypeVar('_G', bound=Callable[..., AsyncGenerator[Any, None]])
+_C = TypeVar('_C', bound=Callable[..., Awaitable[Any]])
+
+
+async def _emit_items(hook: ItemHook, generator: str,
+                      items: AsyncGenerator[_T, None]) -> AsyncGenerator[_T, None]:
+    position = 0
+    try:
+        async for item in items:
+            hook(ItemEvent(generator, position, item))
+            position += 1
+            yield item
+    finally:
+        await items.aclose()
+
+
+def _observe_items(func: _G) -> _G:
+    # Pass the items of a generator method to the on_item hook and count them in the metrics of the
+    # client. Without either, the generator is returned as is.
+    @wraps(func)
+    def wrapper(self: YouTubeClient, *args: Any, **kwargs: Any) -> AsyncGenerator[Any, None]:
+        items = func(self, *args, **kwargs)
+        if self.on_item is not None:
+            items = _emit_items(self.on_item, func.__name__, items)
+        return items if self.metrics is None else self.metrics.count_items(func.__name__, items)
+
+    return cast('_G', wrapper)
+
+
+def _unobserved(
+        method: Callable[..., AsyncGenerator[_T, None]]) -> Callable[..., AsyncGenerator[_T, None]]:
+    # Get a generator method decorated with _observe_items without its hooks and metrics, keeping
+    # its span. Observed methods that read another one use it so each item is reported once.
+    return cast('Callable[..., AsyncGenerator[_T, None]]', cast('Any', method).__wrapped__)
+
+
+def _span_attributes(func: Callable[..., Any],
+                     names: Sequence[str]) -> Callable[..., dict[str, Any]]:
+    # Get the arguments of a call of func that are in names.
+    bind = signature(func).bind
+
+    def attributes(*args: Any, **kwargs: Any) -> dict[str, Any]:
+        if not names:
+            return {}
+        bound = bind(*args, **kwargs)
+        bound.apply_defaults()
+        return {k: bound.arguments[k] for k in names}
+
+    return attributes
+
+
+def _traced_items(*names: str) -> Callable[[_G], _G]:
+    # Run a generator method in a span when the client has a tracer. The named arguments become
+    # attributes of the span.
+    def decorator(func: _G) -> _G:
+        attributes = _span_attributes(func, names)
+
+        @wraps(func)
+        def wrapper(self: YouTubeClient, *args: Any, **kwargs: Any) -> AsyncGenerator[Any, None]:
+            items = func(self, *args, **kwargs)
+            if self.tracer is NOOP_TRACER:
+                return items
+            return trace_items(
+                self.tracer.start_span(f'YouTubeClient.{func.__name__}', current_span(),
+                                       attributes(self, *args, **kwargs)), items)
+
+        return cast('_G', wrapper)
+
+    return decorator
+
+
+def _traced(*names: str) -> Callable[[_C], _C]:
+    # Run a coroutine method in a span that is the default parent of the spans it starts. The
+    # named arguments become attributes of the span.
+    def decorator(func: _C) -> _C:
+        attributes = _span_attributes(func, names)
+
+        @wraps(func)
+        async def wrapper(self: YouTubeClient, *args: Any, **kwargs: Any) -> Any:
+            if self.tracer is NOOP_TRACER:
+                return await func(self, *args, **kwargs)
+            with start_span(self.tracer, f'YouTubeClient.{func.__name__}',
+                            **attributes(self, *args, **kwargs)) as span, use_span(span):
+                return await func(self, *args, **kwargs)
+
+        return cast('_C', wrapper)
+
+    return decorator
+
+
+class _PlaylistEditConfig(NamedTuple):
+    # Replaced as a whole and never mutated, so a reader cannot see the ytcfg of one page with the
+    # headers of another, even without the GIL.
+    ytcfg: YtcfgDict
+    headers: dict[str, str]
+
+
 class NoFeedbackToken(Exception):
     """No feedback token found."""
     def __init__(self) -> None:
@@ -68,7 +233,20 @@ class NoFeedbackToken(Exception):
 
 class YouTubeClient:
     """YouTube client for managing playlists and history."""
-    def __init__(self, session: niquests.AsyncSession) -> None:
+    def __init__(self,
+                 session: niquests.AsyncSession,
+                 *,
+                 rate_limiter: RateLimiter | None = None,
+                 cache_only: bool = False,
+                 capture_sink: CaptureSink | None = None,
+                 on_page: PageHook | None = None,
+                 metrics: ClientMetrics | None = None,
+                 tracer: Tracer | None = None,
+                 on_request: RequestHook | None = None,
+                 on_item: ItemHook | None = None,
+                 on_mutation: MutationHook | None = None,
+                 parse_limiter: anyio.CapacityLimiter | None = None,
+                 parse_processes: bool = False) -> None:
         """
         Initialise the client.
 
@@ -77,11 +255,69 @@ class YouTubeClient:
         session : niquests.AsyncSession
             Authenticated async HTTP session (for example from
             :func:`~youtube_unofficial.session.build_youtube_session`).
+        rate_limiter : RateLimiter | None
+            Limiter awaited before every request made by this client.
+        cache_only : bool
+            If ``True``, every page is replayed from the HTTP cache of the session and the network
+            is never used. A page that is not cached raises
+            :py:class:`~youtube_unofficial.cache.CacheMissError`. Requires a
+            :py:class:`~youtube_unofficial.cache.YouTubeCachedSession`.
+        capture_sink : CaptureSink | None
+            Receives the full request and response payloads of every InnerTube API call. The debug
+            log only shows them cut short.
+        on_page : PageHook | None
+            Called with a :py:class:`~youtube_unofficial.hooks.PageEvent` for every history or
+            playlist page before its entries are yielded.
+        metrics : ClientMetrics | None
+            Metrics to record requests, yielded items and mutations in.
+        tracer : Tracer | None
+            Tracer of the spans of every public call, page and batch of removals. See
+            :py:mod:`youtube_unofficial.tracing`. Nothing is recorded by default.
+        on_request : RequestHook | None
+            Called with a :py:class:`~youtube_unofficial.hooks.RequestEvent` at the start and at
+            the end of every HTTP request.
+        on_item : ItemHook | None
+            Called with an :py:class:`~youtube_unofficial.hooks.ItemEvent` for every item yielded
+            by a public generator.
+        on_mutation : MutationHook | None
+            Called with a :py:class:`~youtube_unofficial.hooks.MutationEvent` with the result of
+            every removal or other change.
+        parse_limiter : anyio.CapacityLimiter | None
+            If set, bootstrap pages are parsed and their ytcfg and ``ytInitialData`` decoded in
+            worker threads, at most as many at once as the limiter has tokens, instead of on the
+            event loop. Clients may share a limiter.
+        parse_processes : bool
+            If ``True``, bootstrap pages are parsed in worker processes instead, which are not
+            limited by the GIL. See :py:mod:`youtube_unofficial.parsing`. ``parse_limiter`` then
+            limits the number of processes, which defaults to the number of CPUs.
         """
         self.session = session
         """Niquests :py:class:`~niquests.AsyncSession` instance."""
-        self._rsvi_cache: dict[str, Any] | None = None
+        self.rate_limiter = rate_limiter
+        """Limiter awaited before every request, if any."""
+        self.cache_only = cache_only
+        """If ``True``, only cached responses are used."""
+        self.capture_sink = capture_sink
+        """Receives the full payloads of InnerTube API calls, if set."""
+        self.on_page = on_page
+        """Called with every history or playlist page, if set."""
+        self.metrics = metrics
+        """Metrics of requests, items and mutations, if set."""
+        self.tracer: Tracer = tracer or NOOP_TRACER
+        """Tracer of operations, pages and requests."""
+        self.on_request = on_request
+        """Called at the start and end of every request, if set."""
+        self.on_item = on_item
+        """Called with every item yielded by a public generator, if set."""
+        self.on_mutation = on_mutation
+        """Called with the result of every mutation, if set."""
+        self.parse_limiter = parse_limiter
+        """Limiter of the worker threads or processes that parse bootstrap pages, if any."""
+        self.parse_processes = parse_processes
+        """Whether bootstrap pages are parsed in worker processes."""
+        self._rsvi_cache: _PlaylistEditConfig | None = None
 
+    @_traced('playlist_id', 'video_id')
     async def remove_video_id_from_playlist(self,
                                             playlist_id: str,
                                             video_id: str,
@@ -105,24 +341,13 @@ class YouTubeClient:
         bool
             ``True`` if the operation was successful, ``False`` otherwise.
         """
-        if cache_values and self._rsvi_cache:
-            soup = self._rsvi_cache['soup']
-            ytcfg = self._rsvi_cache['ytcfg']
-            headers = self._rsvi_cache['headers']
-        else:
-            soup = await self._download_page_soup(WATCH_LATER_URL)
-            ytcfg = find_ytcfg(soup)
-            headers = ytcfg_headers(ytcfg)
-        if cache_values:
-            self._rsvi_cache = {'soup': soup, 'ytcfg': ytcfg, 'headers': headers}
+        ytcfg = (await self._playlist_edit_config(cache_values=cache_values)).ytcfg
         action = {'removedVideoId': video_id, 'action': 'ACTION_REMOVE_VIDEO_BY_VIDEO_ID'}
         _require_ytcfg_playlist_api(ytcfg)
         delegated_session_id = ytcfg.get('DELEGATED_SESSION_ID')
         session_index = ytcfg.get('SESSION_INDEX')
-        resp = await self._download_page(
-            'https://www.youtube.com/youtubei/v1/browse/edit_playlist',
-            method='post',
-            params={'key': ytcfg['INNERTUBE_API_KEY']},
+        resp = await self._edit_playlist(
+            ytcfg,
             headers={
                 'Authorization': self._authorization_sapisidhash_header(),
                 'x-goog-authuser': f'{session_index or 0}',
@@ -135,7 +360,7 @@ class YouTubeClient:
             | ({
                 'x-goog-pageid': delegated_session_id
             } if delegated_session_id else {}),
-            json={
+            json_data={
                 'actions': [action],
                 'playlistId': playlist_id,
                 'params': 'CAFAAQ%3D%3D',
@@ -146,10 +371,15 @@ class YouTubeClient:
                         'internalExperimentFlags': []
                     }
                 }
-            },
-            return_json=True)
-        return bool(resp['status'] == 'STATUS_SUCCEEDED')
+            })
+        succeeded = resp['status'] == 'STATUS_SUCCEEDED'
+        self._mutation('edit_playlist',
+                       succeeded=succeeded,
+                       playlist_id=playlist_id,
+                       video_id=video_id)
+        return bool(succeeded)
 
+    @_traced('playlist_id')
     async def remove_set_video_id_from_playlist(self,
                                                 playlist_id: str,
                                                 set_video_id: str,
@@ -173,21 +403,10 @@ class YouTubeClient:
         bool
             ``True`` if the operation was successful, ``False`` otherwise.
         """
-        if cache_values and self._rsvi_cache:
-            soup = self._rsvi_cache['soup']
-            ytcfg = self._rsvi_cache['ytcfg']
-            headers = self._rsvi_cache['headers']
-        else:
-            soup = await self._download_page_soup(WATCH_LATER_URL)
-            ytcfg = find_ytcfg(soup)
-            headers = ytcfg_headers(ytcfg)
-        if cache_values:
-            self._rsvi_cache = {'soup': soup, 'ytcfg': ytcfg, 'headers': headers}
+        ytcfg = (await self._playlist_edit_config(cache_values=cache_values)).ytcfg
         _require_ytcfg_playlist_api(ytcfg)
-        resp = await self._download_page(
-            'https://www.youtube.com/youtubei/v1/browse/edit_playlist',
-            method='post',
-            params={'key': ytcfg['INNERTUBE_API_KEY']},
+        resp = await self._edit_playlist(
+            ytcfg,
             headers={
                 'Authorization': self._authorization_sapisidhash_header(),
                 'x-goog-authuser': f'{ytcfg.get("SESSION_INDEX", 0)}',
@@ -200,7 +419,7 @@ class YouTubeClient:
             | ({
                 'x-goog-pageid': ytcfg['DELEGATED_SESSION_ID']
             } if ytcfg.get('DELEGATED_SESSION_ID') else {}),
-            json={
+            json_data={
                 'actions': [{
                     'action': 'ACTION_REMOVE_VIDEO',
                     'setVideoId': set_video_id
@@ -218,10 +437,25 @@ class YouTubeClient:
                         'lockedSafetyMode': False
                     }
                 }
-            },
-            return_json=True)
-        return bool(resp['status'] == 'STATUS_SUCCEEDED')
+            })
+        succeeded = resp['status'] == 'STATUS_SUCCEEDED'
+        self._mutation('edit_playlist', succeeded=succeeded, playlist_id=playlist_id)
+        return bool(succeeded)
 
+    async def _edit_playlist(self, ytcfg: YtcfgDict, headers: Mapping[str, str],
+                             json_data: dict[str, Any]) -> dict[str, Any]:
+        api_url = 'https://www.youtube.com/youtubei/v1/browse/edit_playlist'
+        ret = await self._download_page(api_url,
+                                        method='post',
+                                        params={'key': ytcfg['INNERTUBE_API_KEY']},
+                                        headers=headers,
+                                        json=json_data,
+                                        return_json=True)
+        if self.capture_sink is not None:
+            self.capture_sink(api_url, json_data, ret)
+        return ret
+
+    @_traced()
     async def clear_watch_history(self) -> bool:
         """
         Clear watch history.
@@ -236,9 +470,7 @@ class YouTubeClient:
         NoFeedbackToken
             If the feedback token cannot be found in the page data.
         """
-        content = await self._download_page_soup(WATCH_HISTORY_URL)
-        ytcfg = find_ytcfg(content)
-        init_data = initial_data(content)
+        ytcfg, init_data = await self._download_bootstrap(WATCH_HISTORY_URL)
         # If there are no videos, there is no search and index is 0.
         browse_feed_actions_renderer = init_data['contents']['twoColumnBrowseResultsRenderer'][
             'secondaryContents']['browseFeedActionsRenderer']
@@ -256,6 +488,8 @@ class YouTubeClient:
             raise NoFeedbackToken from e
         return cast('bool', await self._single_feedback_api_call(ytcfg, feedback_token))
 
+    @_observe_items
+    @_traced_items('playlist_id')
     async def get_playlist_info(self, playlist_id: str) -> AsyncGenerator[PlaylistInfo, None]:
         """
         Get playlist information.
@@ -280,10 +514,8 @@ class YouTubeClient:
             If a continuation response is not a mapping.
         """
         url = f'https://www.youtube.com/playlist?list={playlist_id}'
-        content = await self._download_page_soup(url)
-        ytcfg = find_ytcfg(content)
+        ytcfg, yt_init_data = await self._download_bootstrap(url)
         ytcfg_headers(ytcfg)
-        yt_init_data = initial_data(content)
         video_list_renderer: PlaylistVideoListRenderer | None = None
         try:
             video_list_renderer = yt_init_data['contents']['twoColumnBrowseResultsRenderer'][
@@ -297,6 +529,13 @@ class YouTubeClient:
         if video_list_renderer is None:
             msg = 'Expected playlist video list renderer.'
             raise RuntimeError(msg)
+        span = current_span()
+        item_count = sum(
+            'playlistVideoRenderer' in x for x in video_list_renderer.get('contents', []))
+        span.set_attribute('page_count', 1)
+        span.set_attribute('item_count', item_count)
+        if self.on_page is not None:
+            self.on_page(PageEvent(url, 0, item_count, playlist_video_count(yt_init_data)))
         try:
             for item in video_list_renderer['contents']:
                 if 'playlistVideoRenderer' in item:
@@ -314,20 +553,33 @@ class YouTubeClient:
         except KeyError:
             pass
         if continuation and api_url:
+            page_index = 0
             while True:
-                contents = await self._single_feedback_api_call(
-                    ytcfg,
-                    api_url=api_url,
-                    merge_json={'continuation': continuation},
-                    return_is_processed=False)
-                if not isinstance(contents, dict):
-                    msg = 'Expected dict response from continuation API.'
-                    raise TypeError(msg)
-                if 'onResponseReceivedActions' not in contents:
-                    msg = 'Missing onResponseReceivedActions in continuation response.'
-                    raise KeyError(msg)
-                items = contents['onResponseReceivedActions'][0]['appendContinuationItemsAction'][
-                    'continuationItems']
+                page_index += 1
+                with start_span(self.tracer,
+                                'continuation',
+                                playlist_id=playlist_id,
+                                page_index=page_index) as page_span:
+                    contents = await self._single_feedback_api_call(
+                        ytcfg,
+                        api_url=api_url,
+                        merge_json={'continuation': continuation},
+                        return_is_processed=False)
+                    if not isinstance(contents, dict):
+                        msg = 'Expected dict response from continuation API.'
+                        raise TypeError(msg)
+                    if 'onResponseReceivedActions' not in contents:
+                        msg = 'Missing onResponseReceivedActions in continuation response.'
+                        raise KeyError(msg)
+                    items = contents['onResponseReceivedActions'][0][
+                        'appendContinuationItemsAction']['continuationItems']
+                    page_items = sum('playlistVideoRenderer' in x for x in items)
+                    page_span.set_attribute('item_count', page_items)
+                item_count += page_items
+                span.set_attribute('page_count', page_index + 1)
+                span.set_attribute('item_count', item_count)
+                if self.on_page is not None:
+                    self.on_page(PageEvent(api_url, page_index, page_items))
                 for item in items:
                     if 'playlistVideoRenderer' in item:
                         yield item
@@ -355,6 +607,8 @@ class YouTubeClient:
             return_dict: Literal[False]) -> AsyncGenerator[str, None]:  # pragma: no cover
         ...
 
+    @_observe_items
+    @_traced_items('playlist_id', 'return_dict')
     async def get_playlist_video_ids(
             self,
             playlist_id: str,
@@ -375,7 +629,7 @@ class YouTubeClient:
         str | PlaylistVideoIDsEntry
             The video IDs or dictionaries with video information.
         """
-        async for item in self.get_playlist_info(playlist_id):
+        async for item in _unobserved(YouTubeClient.get_playlist_info)(self, playlist_id):
             renderer = item['playlistVideoRenderer']
             if 'videoId' not in renderer:
                 continue
@@ -399,12 +653,16 @@ class YouTubeClient:
             else:
                 yield renderer['videoId']
 
+    @_traced('playlist_id')
     async def clear_playlist(self, playlist_id: str) -> None:
         """
         Remove all videos from the specified playlist.
 
         Use ``WL`` for Watch Later.
 
+        The ytcfg is fetched once for the whole run, as each removal invalidates the cached
+        playlist page.
+
         Parameters
         ----------
         playlist_id : str
@@ -418,18 +676,43 @@ class YouTubeClient:
         except KeyError:
             log.info('Caught KeyError. This probably means the playlist is empty.')
             return
-        for video_id in video_ids:
-            log.debug('Deleting from playlist: video_id = %s', video_id)
-            await self.remove_video_id_from_playlist(playlist_id, video_id)
+        with start_span(self.tracer,
+                        'mutation_batch',
+                        playlist_id=playlist_id,
+                        batch_size=len(video_ids)) as span, use_span(span):
+            for video_id in video_ids:
+                log.debug('Deleting from playlist: video_id = %s', video_id)
+                await self.remove_video_id_from_playlist(playlist_id, video_id, cache_values=True)
 
+    @_traced()
     async def clear_watch_later(self) -> None:
         """Remove all videos from the 'Watch Later' playlist."""
         await self.clear_playlist('WL')
 
+    @_observe_items
+    @_traced_items()
     async def get_history_info(self) -> AsyncGenerator[dict[str, Any], None]:
         """
         Get information about the History playlist.
 
+        Yields
+        ------
+        dict[str, Any]
+            The history information.
+        """
+        page = await self._download_bootstrap(WATCH_HISTORY_URL)
+        async for item in self._iter_history_info(page):
+            yield item
+
+    async def _iter_history_info(self, page: BootstrapPage) -> AsyncGenerator[dict[str, Any], None]:
+        """
+        Yield history entries starting from an already downloaded history page.
+
+        Parameters
+        ----------
+        page : BootstrapPage
+            Parsed history page.
+
         Yields
         ------
         dict[str, Any]
@@ -440,11 +723,15 @@ class YouTubeClient:
         RuntimeError
             If a continuation token cannot be found.
         """
-        content = await self._download_page_soup(WATCH_HISTORY_URL)
-        init_data = initial_data(content)
-        ytcfg = find_ytcfg(content)
+        ytcfg, init_data = page
         section_list_renderer = init_data['contents']['twoColumnBrowseResultsRenderer']['tabs'][0][
             'tabRenderer']['content']['sectionListRenderer']
+        span = current_span()
+        item_count = _count_history_items(section_list_renderer['contents'])
+        span.set_attribute('page_count', 1)
+        span.set_attribute('item_count', item_count)
+        if self.on_page is not None:
+            self.on_page(PageEvent(WATCH_HISTORY_URL, 0, item_count))
         next_continuation = None
         for section_list in section_list_renderer['contents']:
             try:
@@ -470,19 +757,30 @@ class YouTubeClient:
             'continuation': next_continuation['continuation'],
             'ctoken': next_continuation['continuation']
         }
+        page_index = 0
         while True:
-            resp = await self._single_feedback_api_call(
-                ytcfg,
-                api_url='/youtubei/v1/browse',
-                merge_json={'continuation': params['continuation']},
-                return_is_processed=False)
-            contents = cast('dict[str, Any]', resp)
-            try:
-                section_list_renderer = contents['onResponseReceivedActions'][0][
-                    'appendContinuationItemsAction']['continuationItems']
-            except KeyError as e:
-                log.debug('Caught KeyError: %s. Possible keys: %s', e, ', '.join(contents.keys()))
-                break
+            with start_span(self.tracer, 'continuation', page_index=page_index + 1) as page_span:
+                resp = await self._single_feedback_api_call(
+                    ytcfg,
+                    api_url='/youtubei/v1/browse',
+                    merge_json={'continuation': params['continuation']},
+                    return_is_processed=False)
+                contents = cast('dict[str, Any]', resp)
+                try:
+                    section_list_renderer = contents['onResponseReceivedActions'][0][
+                        'appendContinuationItemsAction']['continuationItems']
+                except KeyError as e:
+                    log.debug('Caught KeyError: %s. Possible keys: %s', e,
+                              ', '.join(contents.keys()))
+                    break
+                page_items = _count_history_items(section_list_renderer)
+                page_span.set_attribute('item_count', page_items)
+            page_index += 1
+            item_count += page_items
+            span.set_attribute('page_count', page_index + 1)
+            span.set_attribute('item_count', item_count)
+            if self.on_page is not None:
+                self.on_page(PageEvent('/youtubei/v1/browse', page_index, page_items))
             continuations = None
             for section_list in section_list_renderer:
                 try:
@@ -524,6 +822,8 @@ class YouTubeClient:
             return_dict: Literal[False] = False) -> AsyncGenerator[str, None]:  # pragma: no cover
         ...
 
+    @_observe_items
+    @_traced_items('return_dict')
     async def get_history_video_ids(  # ruff:ignore[complex-structure]
             self, *, return_dict: bool = False) -> AsyncGenerator[str | HistoryVideoIDsEntry, None]:
         """
@@ -550,7 +850,7 @@ class YouTubeClient:
                     return True
             return False
 
-        async for entry in self.get_history_info():
+        async for entry in _unobserved(YouTubeClient.get_history_info)(self):
             d: dict[str, Any] = {}
             if 'videoId' not in entry.get('videoRenderer', {}):
                 continue
@@ -599,35 +899,82 @@ class YouTubeClient:
             else:
                 yield entry['videoRenderer']['videoId']
 
-    async def remove_video_ids_from_history(self, video_ids: Sequence[str]) -> bool:
+    @_traced('batch_size')
+    async def remove_video_ids_from_history(self,
+                                            video_ids: Iterable[str],
+                                            *,
+                                            batch_size: int = 100) -> bool:
         """
-        Delete a history entry by video ID.
+        Delete history entries by video ID.
+
+        ``video_ids`` is consumed lazily in batches of ``batch_size``, so it may be a generator
+        reading from a file or a pipe. Each batch continues the history scan where the previous one
+        stopped, only as far as needed to find its entries, and only the feedback tokens of the
+        batch are kept, along with the IDs of the entries passed. Once the scan has reached the end
+        of history, video IDs it has not passed are known to be absent. Only video IDs it has
+        passed make it start again from a new history page, so video IDs in history order need the
+        fewest requests.
 
         Parameters
         ----------
-        video_ids : Sequence[str]
+        video_ids : Iterable[str]
             The video IDs to delete.
+        batch_size : int
+            Maximum number of video IDs to hold in memory at once.
 
         Returns
         -------
         bool
-            ``True`` if the operation was successful, ``False`` otherwise.
+            ``True`` if at least one entry was removed and no removal failed, ``False`` otherwise.
         """
-        if not video_ids:
+        batches = chunked(video_ids, batch_size)
+        if (first_batch := next(batches, None)) is None:
             return False
-        entries: list[dict[str, Any]] = [
-            x async for x in self.get_history_info() if x['videoRenderer']['videoId'] in video_ids
-        ]
-        content = await self._download_page_soup(WATCH_HISTORY_URL)
-        ytcfg = find_ytcfg(content)
-        if not entries:
-            return False
-        for entry in entries:
-            if not await self._single_feedback_api_call(
-                    ytcfg, entry['videoRenderer']['menu']['menuRenderer']['topLevelButtons'][0]
-                ['buttonRenderer']['serviceEndpoint']['feedbackEndpoint']['feedbackToken']):
-                return False
-        return True
+        page = await self._download_bootstrap(WATCH_HISTORY_URL)
+        scan = _HistoryScan(page, self._iter_history_info(page))
+        removed = False
+        try:
+            for batch_index, batch in enumerate(chain((first_batch,), batches)):
+                with start_span(self.tracer,
+                                'mutation_batch',
+                                batch_index=batch_index,
+                                batch_size=len(batch),
+                                item_count=0) as span:
+                    tokens = await self._batch_feedback_tokens(scan, batch)
+                    item_count = 0
+                    for video_id in batch:
+                        if (feedback_token := tokens.pop(video_id, None)) is None:
+                            log.debug('Video ID %s not found in history.', video_id)
+                            self._mutation('feedback',
+                                           succeeded=False,
+                                           video_id=video_id,
+                                           found=False)
+                            continue
+                        if not await self._single_feedback_api_call(
+                                scan.ytcfg, feedback_token, video_id=video_id):
+                            return False
+                        scan.forget(video_id)
+                        item_count += 1
+                        span.set_attribute('item_count', item_count)
+                        removed = True
+        finally:
+            await scan.history.aclose()
+        return removed
+
+    async def _batch_feedback_tokens(self, scan: _HistoryScan,
+                                     batch: Iterable[str]) -> dict[str, str]:
+        tokens: dict[str, str] = {}
+        # Once the scan has reached the end of history, the video IDs it has not passed are absent.
+        pending = set(batch) if scan.known is None else set(batch) & scan.known
+        if not pending or not await scan.read(tokens, pending):
+            return tokens
+        # History has ended, so what is left of the batch is absent or was passed before this batch.
+        # Only the latter needs a new scan from the top.
+        if pending := pending & scan.seen:
+            page = await self._download_bootstrap(WATCH_HISTORY_URL)
+            await scan.restart(page, self._iter_history_info(page))
+            await scan.read(tokens, pending)
+        return tokens
 
     def _authorization_sapisidhash_header(self, ytcfg: YtcfgDict | None = None) -> str:
         now = int(datetime.now(timezone.utc).timestamp())
@@ -660,7 +1007,8 @@ class YouTubeClient:
                                         merge_json: dict[str, Any] | None = None,
                                         click_tracking_params: str | None = None,
                                         *,
-                                        return_is_processed: bool = True) -> dict[str, Any] | bool:
+                                        return_is_processed: bool = True,
+                                        video_id: str | None = None) -> dict[str, Any] | bool:
         if not merge_json:
             merge_json = {}
         feedback_token_part = ({
@@ -695,37 +1043,63 @@ class YouTubeClient:
         }
                      | feedback_token_part
                      | merge_json)
-        log.debug('Request JSON: %s', json.dumps(json_data, indent=2, sort_keys=True))
+        log.debug('Request JSON: %s', LazyJSON(json_data))
         ret = await self._download_page(api_url,
                                         method='post',
                                         params={'prettyPrint': 'false'},
                                         headers=headers,
                                         json=json_data,
                                         return_json=True)
-        log.debug('Response JSON: %s', json.dumps(ret, indent=2, sort_keys=True))
+        log.debug('Response JSON: %s', LazyJSON(ret))
+        if self.capture_sink is not None:
+            self.capture_sink(api_url, json_data, ret)
         if (ret.get('responseContext', {}).get('mainAppWebResponseContext', {}).get(
                 'loggedOut', False)):
             msg = 'Response indicates logged out. Please check your cookies and try again.'
             raise RuntimeError(msg)
         if return_is_processed:
             try:
-                return cast('bool', ret['feedbackResponses'][0]['isProcessed'])
+                processed = cast('bool', ret['feedbackResponses'][0]['isProcessed'])
             except KeyError:
-                return False
+                processed = False
+            self._mutation('feedback', succeeded=processed, video_id=video_id)
+            return processed
         return ret
 
+    async def _playlist_edit_config(self, *, cache_values: bool | None) -> _PlaylistEditConfig:
+        # Read the attribute once. Concurrent removals may replace it but never change it.
+        if cache_values and (cached := self._rsvi_cache) is not None:
+            return cached
+        ytcfg = (await self._download_bootstrap(WATCH_LATER_URL, with_initial_data=False)).ytcfg
+        config = _PlaylistEditConfig(ytcfg, ytcfg_headers(ytcfg))
+        if cache_values:
+            self._rsvi_cache = config
+        return config
+
+    def _mutation(self,
+                  kind: Literal['feedback', 'edit_playlist'],
+                  *,
+                  succeeded: bool,
+                  playlist_id: str | None = None,
+                  video_id: str | None = None,
+                  found: bool = True) -> None:
+        if self.metrics is not None and found:
+            self.metrics.mutation(kind, succeeded=succeeded)
+        if self.on_mutation is not None:
+            self.on_mutation(MutationEvent(kind, succeeded, playlist_id, video_id, found))
+
     async def _toggle_history(self, page_url: str, contents_index: int) -> bool:
-        content = await self._download_page_soup(page_url)
-        ytcfg = find_ytcfg(content)
-        info = initial_data(content)['contents']['twoColumnBrowseResultsRenderer'][
-            'secondaryContents']['browseFeedActionsRenderer']['contents'][contents_index][
-                'buttonRenderer']['navigationEndpoint']['confirmDialogEndpoint']['content'][
-                    'confirmDialogRenderer']['confirmEndpoint']
+        ytcfg, init_data = await self._download_bootstrap(page_url)
+        info = init_data['contents']['twoColumnBrowseResultsRenderer']['secondaryContents'][
+            'browseFeedActionsRenderer']['contents'][contents_index]['buttonRenderer'][
+                'navigationEndpoint']['confirmDialogEndpoint']['content']['confirmDialogRenderer'][
+                    'confirmEndpoint']
         return cast(
             'bool', await self._single_feedback_api_call(
                 ytcfg, info['feedbackEndpoint']['feedbackToken'],
                 info['commandMetadata']['webCommandMetadata']['apiUrl']))
 
+    @_traced()
     async def toggle_watch_history(self) -> bool:
         """
         Pauses or resumes watch history depending on the current state.
@@ -770,7 +1144,13 @@ class YouTubeClient:
                              json: Any = None,
                              *,
                              return_json: bool = False) -> str | dict[str, Any]:
-        return await download_page(  # type: ignore[call-overload,no-any-return]
+        if self.rate_limiter is not None and not self.cache_only:
+            await self.rate_limiter.wait()
+        # Continuation pages are decoded in the parse threads too. Sending them to a process would
+        # cost about as much as decoding them.
+        decode_in_thread = (return_json and self.parse_limiter is not None
+                            and not self.parse_processes)
+        ret = await download_page(  # type: ignore[call-overload,misc]
             self.session,
             url,
             data,
@@ -778,11 +1158,45 @@ class YouTubeClient:
             headers,
             params,
             json,
-            return_json=return_json)
+            return_json=return_json and not decode_in_thread,
+            only_if_cached=self.cache_only,
+            metrics=self.metrics,
+            on_request=self.on_request)
+        if decode_in_thread:
+            return cast('dict[str, Any]', await self._parse(loads, ret))
+        return cast('str | dict[str, Any]', ret)
 
     async def _download_page_soup(self,
+                                  url: str,
                                   *args: Any,
                                   parser: str = 'html5lib',
                                   **kwargs: Any) -> Soup:
-        html = await self._download_page(*args, **kwargs)
-        return Soup(html, parser)
+        with start_span(self.tracer, 'bootstrap.download', url=url) as span:
+            html = await self._download_page(url, *args, **kwargs)
+            span.set_attribute('response_size', len(html))
+        with start_span(self.tracer, 'bootstrap.parse', parser=parser):
+            return await self._parse(Soup, html, parser)
+
+    async def _download_bootstrap(self,
+                                  url: str,
+                                  *,
+                                  with_initial_data: bool = True) -> BootstrapPage:
+        if not self.parse_processes:
+            content = await self._download_page_soup(url)
+            return BootstrapPage(
+                await self._parse(find_ytcfg, content),
+                await self._parse(initial_data, content) if with_initial_data else {})
+        with start_span(self.tracer, 'bootstrap.download', url=url) as span:
+            html = await self._download_page(url)
+            span.set_attribute('response_size', len(html))
+        with start_span(self.tracer, 'bootstrap.parse', parser='html5lib', process=True):
+            return await anyio.to_process.run_sync(partial(parse_bootstrap,
+                                                           with_initial_data=with_initial_data),
+                                                   html,
+                                                   limiter=self.parse_limiter)
+
+    async def _parse(self, func: Callable[..., _T], *args: Any) -> _T:
+        # Run CPU-bound parsing in a worker thread if the client has a parse limiter.
+        if self.parse_limiter is None:
+            return func(*args)
+        return await anyio.to_thread.run_sync(func, *args, limiter=self.parse_limiter)
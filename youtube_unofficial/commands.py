@@ -1,59 +1,295 @@
 """Commands."""
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, TypeVar
 import json
 import logging
 
-from bascom import setup_logging
-import anyio
 import click
 
-from .client import YouTubeClient
-from .session import build_youtube_session
-
 if TYPE_CHECKING:
-    from collections.abc import Iterable
-
-__all__ = ('clear_watch_history', 'clear_watch_later', 'print_history', 'print_playlist',
-           'print_watch_later', 'remove_history_entries', 'remove_video_id',
+    from collections.abc import Awaitable, Callable, Iterable, Iterator, Sequence
+    from typing import TextIO
+
+    from .client import YouTubeClient
+    from .event_loop import LoopName
+    from .memory import MemoryTracer
+    from .metrics import ClientMetrics
+    from .progress import Progress
+    from .stalls import StallDetector
+    from .tracing import Tracer
+
+__all__ = ('DELEGATED_SESSION_IDS_META_KEY', 'LOOP_META_KEY', 'METRICS_META_KEY',
+           'PARSE_PROCESSES_META_KEY', 'PARSE_THREADS_META_KEY', 'STALL_DETECTOR_META_KEY',
+           'TRACER_META_KEY', 'clear_watch_history', 'clear_watch_later', 'print_history',
+           'print_playlist', 'print_watch_later', 'remove_history_entries', 'remove_video_id',
            'remove_watch_later_video_id', 'toggle_watch_history')
 
+_T = TypeVar('_T')
+
+METRICS_META_KEY = 'youtube_unofficial.metrics'
+"""Key of the :py:class:`~youtube_unofficial.metrics.ClientMetrics` of a run in
+:py:attr:`click.Context.meta`."""
+TRACER_META_KEY = 'youtube_unofficial.tracer'
+"""Key of the :py:class:`~youtube_unofficial.tracing.Tracer` of a run in
+:py:attr:`click.Context.meta`."""
+STALL_DETECTOR_META_KEY = 'youtube_unofficial.stall_detector'
+"""Key of the :py:class:`~youtube_unofficial.stalls.StallDetector` of a run in
+:py:attr:`click.Context.meta`."""
+PARSE_THREADS_META_KEY = 'youtube_unofficial.parse_threads'
+"""Key of the number of page parsing threads of a run in :py:attr:`click.Context.meta`."""
+PARSE_PROCESSES_META_KEY = 'youtube_unofficial.parse_processes'
+"""Key of the number of page parsing processes of a run in :py:attr:`click.Context.meta`."""
+LOOP_META_KEY = 'youtube_unofficial.loop'
+"""Key of the :py:data:`~youtube_unofficial.event_loop.LoopName` of a run in
+:py:attr:`click.Context.meta`."""
+DELEGATED_SESSION_IDS_META_KEY = 'youtube_unofficial.delegated_session_ids'
+"""Key of the delegated session IDs of a run, keyed by profile, in :py:attr:`click.Context.meta`."""
+
+_PROFILE_HELP = ('Browser profile. May be given more than once to run the command for several '
+                 'accounts concurrently.')
+_REQUEST_INTERVAL_HELP = 'Minimum number of seconds between two requests of the same account.'
+_OFFLINE_HELP = ('Only replay responses from the HTTP cache, whatever their age. Fails if a page '
+                 'is not cached.')
+_TRACE_MEMORY_HELP = ('Trace memory with tracemalloc and print the peak, the bytes retained per '
+                      'page and the top allocation sites to standard error at exit.')
+_PROGRESS_HELP = ('Show pages fetched, items per second, removals done and left, and the estimated '
+                  'time left on standard error. If standard error is not a terminal, print a line '
+                  'every 10 seconds instead.')
+
+# Imports of the client, the session and their dependencies (bs4, html5lib, niquests, yt-dlp) are
+# deferred to the functions that need them so that ``youtube --help`` and shell completion stay
+# fast.
+
+
+def _run_async(func: Callable[..., Awaitable[None]], *args: Any) -> None:
+    import anyio
+
+    from .event_loop import backend_options
+    try:
+        options = backend_options(_context_loop())
+    except ImportError as e:
+        raise click.ClickException(str(e)) from e
+    if (detector := _context_stall_detector()) is not None:
+        anyio.run(detector.run, func, *args, backend_options=options)
+    else:
+        anyio.run(func, *args, backend_options=options)
+
+
+def _setup_logging(*, debug: bool) -> None:
+    from bascom import setup_logging
+    setup_logging(debug=debug,
+                  loggers={
+                      'youtube_unofficial': {
+                          'handlers': ('console',),
+                          'level': logging.DEBUG if debug else logging.INFO,
+                          'propagate': False
+                      }
+                  })
+
+
+def _read_video_ids(lines: Iterable[str]) -> Iterator[str]:
+    for line in lines:
+        if video_id := line.strip():
+            yield video_id
+
+
+def _iter_video_ids(video_ids: Iterable[str], from_file: TextIO | None) -> Iterator[str]:
+    """
+    Lazily yield video IDs from arguments, standard input and a file.
+
+    Parameters
+    ----------
+    video_ids : Iterable[str]
+        Video IDs given as arguments. ``-`` is replaced with the lines of standard input.
+    from_file : TextIO | None
+        File given with ``--from-file``, read after the arguments.
+
+    Yields
+    ------
+    str
+        Non-empty, stripped video IDs.
+    """
+    for video_id in video_ids:
+        if video_id == '-':
+            yield from _read_video_ids(click.open_file('-'))
+        else:
+            yield video_id
+    if from_file is not None:
+        yield from _read_video_ids(from_file)
+
+
+def _video_id_streams(profiles: Sequence[str],
+                      video_ids: Iterable[str]) -> dict[str, Iterable[str]]:
+    # One profile consumes the video IDs lazily. Profiles remove at their own pace, so sharing one
+    # stream between several would buffer it without bound. They get a copy read once instead.
+    if len(profiles) == 1:
+        return {profiles[0]: video_ids}
+    return dict.fromkeys(profiles, tuple(video_ids))
+
+
+async def _for_each_profile(browser: str,
+                            profiles: Sequence[str],
+                            request_interval: float,
+                            func: Callable[[str, YouTubeClient], Awaitable[_T]],
+                            *,
+                            offline: bool = False) -> dict[str, _T]:
+    from .cache import CacheMissError
+    from .pool import ClientPool
+    try:
+        async with ClientPool(browser,
+                              profiles,
+                              min_request_interval=request_interval,
+                              cache_only=offline,
+                              metrics=_context_metrics(),
+                              tracer=_context_tracer(),
+                              delegated_session_ids=_context_delegated_session_ids(),
+                              **_context_parse_workers()) as pool:
+            return await pool.run(func)
+    except CacheMissError as e:
+        raise click.ClickException(str(e)) from e
+
+
+@contextmanager
+def _memory_tracing(*, enabled: bool) -> Iterator[MemoryTracer | None]:
+    if not enabled:
+        yield None
+        return
+    from .memory import MemoryTracer
+    tracer = MemoryTracer()
+    tracer.start()
+    try:
+        yield tracer
+    finally:
+        tracer.stop()
+        click.echo(tracer.report(), err=True)
+
+
+@contextmanager
+def _progress(*, enabled: bool, total: int | None = None) -> Iterator[Progress | None]:
+    if not enabled:
+        yield None
+        return
+    from .progress import Progress
+    progress = Progress(total=total)
+    try:
+        yield progress
+    finally:
+        progress.close()
+
+
+def _context_metrics() -> ClientMetrics | None:
+    # Set by the --metrics-file option of the main group.
+    ctx = click.get_current_context(silent=True)
+    return None if ctx is None else ctx.meta.get(METRICS_META_KEY)
+
+
+def _context_tracer() -> Tracer | None:
+    # Set by the --trace-file and --otel options of the main group.
+    ctx = click.get_current_context(silent=True)
+    return None if ctx is None else ctx.meta.get(TRACER_META_KEY)
+
+
+def _context_parse_workers() -> dict[str, int]:
+    # Set by the --parse-threads and --parse-processes options of the main group.
+    ctx = click.get_current_context(silent=True)
+    meta = {} if ctx is None else ctx.meta
+    return {
+        'parse_threads': meta.get(PARSE_THREADS_META_KEY, 0),
+        'parse_processes': meta.get(PARSE_PROCESSES_META_KEY, 0)
+    }
+
+
+def _context_delegated_session_ids() -> dict[str, str]:
+    # Set by the --delegated-session-id option of the main group.
+    ctx = click.get_current_context(silent=True)
+    return {} if ctx is None else ctx.meta.get(DELEGATED_SESSION_IDS_META_KEY, {})
+
+
+def _context_loop() -> LoopName:
+    # Set by the --loop option of the main group.
+    ctx = click.get_current_context(silent=True)
+    return 'asyncio' if ctx is None else ctx.meta.get(LOOP_META_KEY, 'asyncio')
+
+
+def _context_stall_detector() -> StallDetector | None:
+    # Set by the --detect-stalls option of the main group.
+    ctx = click.get_current_context(silent=True)
+    return None if ctx is None else ctx.meta.get(STALL_DETECTOR_META_KEY)
+
+
+def _prefix(profile: str, profiles: Sequence[str]) -> str:
+    return f'{profile}: ' if len(profiles) > 1 else ''
+
+
+def _echo_entry(entry: Any, profile: str, profiles: Sequence[str], *, output_json: bool) -> None:
+    if output_json:
+        click.echo(
+            json.dumps(entry if len(profiles) == 1 else entry | {'profile': profile},
+                       sort_keys=True))
+    else:
+        click.echo(entry if len(profiles) == 1 else f'{profile}\t{entry}')
+
+
+async def _print_playlist_ids(browser: str, profiles: Sequence[str], playlist_id: str, *,
+                              output_json: bool, request_interval: float, offline: bool,
+                              trace_memory: bool) -> None:
+    with _memory_tracing(enabled=trace_memory) as tracer:
+
+        async def print_ids(profile: str, yt: YouTubeClient) -> None:
+            yt.on_page = tracer
+            async for entry in yt.get_playlist_video_ids(
+                    playlist_id, return_dict=output_json):  # type: ignore[call-overload]
+                _echo_entry(entry, profile, profiles, output_json=output_json)
 
-async def _print_playlist_ids(browser: str, profile: str, playlist_id: str, *,
-                              output_json: bool) -> None:
-    session = await build_youtube_session(browser, profile)
-    async with session:
-        yt = YouTubeClient(session)
-        async for entry in yt.get_playlist_video_ids(
-                playlist_id, return_dict=output_json):  # type: ignore[call-overload]
-            if output_json:
-                click.echo(json.dumps(entry, sort_keys=True))
-            else:
-                click.echo(entry)
+        await _for_each_profile(browser, profiles, request_interval, print_ids, offline=offline)
 
 
 def print_playlist_ids_callback(browser: str,
-                                profile: str,
+                                profiles: Sequence[str],
                                 playlist_id: str,
                                 *,
-                                output_json: bool = False) -> None:
+                                output_json: bool = False,
+                                request_interval: float = 0.0,
+                                offline: bool = False,
+                                trace_memory: bool = False) -> None:
     async def _run() -> None:
-        await _print_playlist_ids(browser, profile, playlist_id, output_json=output_json)
+        await _print_playlist_ids(browser,
+                                  profiles,
+                                  playlist_id,
+                                  output_json=output_json,
+                                  request_interval=request_interval,
+                                  offline=offline,
+                                  trace_memory=trace_memory)
 
-    anyio.run(_run)
+    _run_async(_run)
 
 
 @click.command(context_settings={'help_option_names': ('-h', '--help')})
 @click.option('-d', '--debug', is_flag=True, help='Enable debug output.')
 @click.option('-b', '--browser', default='chrome', help='Browser to read cookies from.')
-@click.option('-p', '--profile', default='Default', help='Browser profile.')
+@click.option('-p',
+              '--profile',
+              'profiles',
+              default=('Default',),
+              multiple=True,
+              help=_PROFILE_HELP)
+@click.option('--request-interval',
+              type=click.FloatRange(min=0),
+              default=0,
+              help=_REQUEST_INTERVAL_HELP)
 @click.option('-j', '--json', 'output_json', is_flag=True, help='Output in JSON format.')
+@click.option('--offline', is_flag=True, help=_OFFLINE_HELP)
+@click.option('--trace-memory', is_flag=True, help=_TRACE_MEMORY_HELP)
 def print_watch_later(browser: str,
-                      profile: str,
+                      profiles: tuple[str, ...],
+                      request_interval: float = 0,
                       *,
                       debug: bool = False,
-                      output_json: bool = False) -> None:
+                      output_json: bool = False,
+                      offline: bool = False,
+                      trace_memory: bool = False) -> None:
     """
     Print your Watch Later playlist.
 
@@ -72,30 +308,51 @@ def print_watch_later(browser: str,
            video_id: string
            watch_url: string
        }
+
+    If more than one profile is given, each line is prefixed with the profile name and a tab, or
+    the JSON object has an additional profile key.
+
+    With --offline, everything is read from the HTTP cache of a previous run and no request is
+    made.
+
+    With --trace-memory, a report of memory use per page is printed to standard error at exit.
     """  # ruff:ignore[escape-sequence-in-docstring]
-    setup_logging(debug=debug,
-                  loggers={
-                      'youtube_unofficial': {
-                          'handlers': ('console',),
-                          'level': logging.DEBUG if debug else logging.INFO,
-                          'propagate': False
-                      }
-                  })
-    print_playlist_ids_callback(browser, profile, 'WL', output_json=output_json)
+    _setup_logging(debug=debug)
+    print_playlist_ids_callback(browser,
+                                profiles,
+                                'WL',
+                                output_json=output_json,
+                                request_interval=request_interval,
+                                offline=offline,
+                                trace_memory=trace_memory)
 
 
 @click.command(context_settings={'help_option_names': ('-h', '--help')})
 @click.option('-d', '--debug', is_flag=True, help='Enable debug output.')
 @click.option('-b', '--browser', default='chrome', help='Browser to read cookies from.')
-@click.option('-p', '--profile', default='Default', help='Browser profile.')
+@click.option('-p',
+              '--profile',
+              'profiles',
+              default=('Default',),
+              multiple=True,
+              help=_PROFILE_HELP)
+@click.option('--request-interval',
+              type=click.FloatRange(min=0),
+              default=0,
+              help=_REQUEST_INTERVAL_HELP)
 @click.option('-j', '--json', 'output_json', is_flag=True, help='Output in JSON format.')
+@click.option('--offline', is_flag=True, help=_OFFLINE_HELP)
+@click.option('--trace-memory', is_flag=True, help=_TRACE_MEMORY_HELP)
 @click.argument('playlist_id')
 def print_playlist(browser: str,
-                   profile: str,
+                   profiles: tuple[str, ...],
                    playlist_id: str,
+                   request_interval: float = 0,
                    *,
                    debug: bool = False,
-                   output_json: bool = False) -> None:
+                   output_json: bool = False,
+                   offline: bool = False,
+                   trace_memory: bool = False) -> None:
     """
     Print a playlist.
 
@@ -114,34 +371,68 @@ def print_playlist(browser: str,
            video_id: string
            watch_url: string
        }
+
+    If more than one profile is given, each line is prefixed with the profile name and a tab, or
+    the JSON object has an additional profile key.
+
+    With --offline, everything is read from the HTTP cache of a previous run and no request is
+    made.
+
+    With --trace-memory, a report of memory use per page is printed to standard error at exit.
     """  # ruff:ignore[escape-sequence-in-docstring]
     logging.basicConfig(level=logging.DEBUG if debug else logging.INFO,
                         format='%(levelname)s:%(name)s:%(lineno)d:%(funcName)s:%(message)s')
-    print_playlist_ids_callback(browser, profile, playlist_id, output_json=output_json)
+    print_playlist_ids_callback(browser,
+                                profiles,
+                                playlist_id,
+                                output_json=output_json,
+                                request_interval=request_interval,
+                                offline=offline,
+                                trace_memory=trace_memory)
+
+
+async def _print_history(browser: str, profiles: Sequence[str], *, output_json: bool,
+                         request_interval: float, offline: bool, trace_memory: bool,
+                         progress: bool) -> None:
+    with _memory_tracing(enabled=trace_memory) as tracer, _progress(enabled=progress) as reporter:
 
+        async def print_ids(profile: str, yt: YouTubeClient) -> None:
+            yt.on_page = tracer
+            if reporter is not None:
+                reporter.attach(yt)
+            async for entry in yt.get_history_video_ids(
+                    return_dict=output_json):  # type: ignore[call-overload]
+                _echo_entry(entry, profile, profiles, output_json=output_json)
 
-async def _print_history(browser: str, profile: str, *, output_json: bool) -> None:
-    session = await build_youtube_session(browser, profile)
-    async with session:
-        yt = YouTubeClient(session)
-        async for entry in yt.get_history_video_ids(
-                return_dict=output_json):  # type: ignore[call-overload]
-            if output_json:
-                click.echo(json.dumps(entry, sort_keys=True))
-            else:
-                click.echo(entry)
+        await _for_each_profile(browser, profiles, request_interval, print_ids, offline=offline)
 
 
 @click.command(context_settings={'help_option_names': ('-h', '--help')})
 @click.option('-d', '--debug', is_flag=True, help='Enable debug output.')
 @click.option('-b', '--browser', default='chrome', help='Browser to read cookies from.')
-@click.option('-p', '--profile', default='Default', help='Browser profile.')
+@click.option('-p',
+              '--profile',
+              'profiles',
+              default=('Default',),
+              multiple=True,
+              help=_PROFILE_HELP)
+@click.option('--request-interval',
+              type=click.FloatRange(min=0),
+              default=0,
+              help=_REQUEST_INTERVAL_HELP)
 @click.option('-j', '--json', 'output_json', is_flag=True, help='Output in JSON format.')
+@click.option('--offline', is_flag=True, help=_OFFLINE_HELP)
+@click.option('--trace-memory', is_flag=True, help=_TRACE_MEMORY_HELP)
+@click.option('--progress', is_flag=True, help=_PROGRESS_HELP)
 def print_history(browser: str,
-                  profile: str,
+                  profiles: tuple[str, ...],
+                  request_interval: float = 0,
                   *,
                   debug: bool = False,
-                  output_json: bool = False) -> None:
+                  output_json: bool = False,
+                  offline: bool = False,
+                  trace_memory: bool = False,
+                  progress: bool = False) -> None:
     """Print your watch history.
 
     By default, this will print the video IDs of your watch history.
@@ -179,183 +470,292 @@ def print_history(browser: str,
                url: string
            }[]
         }
+
+    If more than one profile is given, each line is prefixed with the profile name and a tab, or
+    the JSON object has an additional profile key.
+
+    With --offline, everything is read from the HTTP cache of a previous run and no request is
+    made.
+
+    With --trace-memory, a report of memory use per page is printed to standard error at exit.
+
+    With --progress, the pages fetched and the entries per second are shown on standard error.
     """  # ruff:ignore[escape-sequence-in-docstring]
-    setup_logging(debug=debug,
-                  loggers={
-                      'youtube_unofficial': {
-                          'handlers': ('console',),
-                          'level': logging.DEBUG if debug else logging.INFO,
-                          'propagate': False
-                      }
-                  })
+    _setup_logging(debug=debug)
 
     async def _run() -> None:
-        await _print_history(browser, profile, output_json=output_json)
+        await _print_history(browser,
+                             profiles,
+                             output_json=output_json,
+                             request_interval=request_interval,
+                             offline=offline,
+                             trace_memory=trace_memory,
+                             progress=progress)
+
+    _run_async(_run)
+
 
-    anyio.run(_run)
+async def _remove_history_entries(browser: str,
+                                  profiles: Sequence[str],
+                                  video_ids: Iterable[str],
+                                  batch_size: int,
+                                  request_interval: float,
+                                  progress: Progress | None = None) -> None:
+    streams = _video_id_streams(profiles, video_ids)
 
+    async def remove(profile: str, yt: YouTubeClient) -> None:
+        if progress is not None:
+            progress.attach(yt)
+        await yt.remove_video_ids_from_history(streams[profile], batch_size=batch_size)
 
-async def _remove_history_entries(browser: str, profile: str, video_ids: tuple[str, ...]) -> None:
-    session = await build_youtube_session(browser, profile)
-    async with session:
-        yt = YouTubeClient(session)
-        await yt.remove_video_ids_from_history(list(video_ids))
+    await _for_each_profile(browser, profiles, request_interval, remove)
 
 
 @click.command(context_settings={'help_option_names': ('-h', '--help')})
 @click.option('-d', '--debug', is_flag=True, help='Enable debug output.')
 @click.option('-b', '--browser', default='chrome', help='Browser to read cookies from.')
-@click.option('-p', '--profile', default='Default', help='Browser profile.')
+@click.option('-p',
+              '--profile',
+              'profiles',
+              default=('Default',),
+              multiple=True,
+              help=_PROFILE_HELP)
+@click.option('--request-interval',
+              type=click.FloatRange(min=0),
+              default=0,
+              help=_REQUEST_INTERVAL_HELP)
+@click.option('-f',
+              '--from-file',
+              type=click.File('r'),
+              help='Read video IDs from a file, one per line. Use - for standard input.')
+@click.option('--batch-size',
+              type=click.IntRange(min=1),
+              default=100,
+              show_default=True,
+              help='Number of video IDs to look up in history at once.')
+@click.option('--progress', is_flag=True, help=_PROGRESS_HELP)
 @click.argument('video_ids', nargs=-1)
 def remove_history_entries(browser: str,
-                           profile: str,
+                           profiles: tuple[str, ...],
                            video_ids: tuple[str, ...],
+                           request_interval: float = 0,
+                           from_file: TextIO | None = None,
+                           batch_size: int = 100,
                            *,
-                           debug: bool = False) -> None:
-    """Remove videos from Watch History."""
-    setup_logging(debug=debug,
-                  loggers={
-                      'youtube_unofficial': {
-                          'handlers': ('console',),
-                          'level': logging.DEBUG if debug else logging.INFO,
-                          'propagate': False
-                      }
-                  })
-    anyio.run(_remove_history_entries, browser, profile, video_ids)
+                           debug: bool = False,
+                           progress: bool = False) -> None:
+    """
+    Remove videos from Watch History.
 
+    Pass - as a video ID to read IDs from standard input, one per line. With more than one
+    profile, all video IDs are read into memory before the first removal.
 
-async def _remove_svi(browser: str, profile: str, playlist_id: str,
-                      video_ids: Iterable[str]) -> None:
-    session = await build_youtube_session(browser, profile)
-    async with session:
-        yt = YouTubeClient(session)
-        for svi in video_ids:
-            await yt.remove_video_id_from_playlist(playlist_id, svi)
+    With --progress, the number of removals left is only shown if all video IDs are given as
+    arguments.
+    """
+    _setup_logging(debug=debug)
+    # Video IDs read from a stream are not counted in advance, so that they stay lazy.
+    total = (None if from_file is not None or '-' in video_ids else len(video_ids) * len(profiles))
+    with _progress(enabled=progress, total=total) as reporter:
+        _run_async(_remove_history_entries, browser, profiles, _iter_video_ids(
+            video_ids, from_file), batch_size, request_interval, reporter)
 
 
-def remove_svi_callback(browser: str, profile: str, playlist_id: str,
-                        video_ids: Iterable[str]) -> None:
-    anyio.run(_remove_svi, browser, profile, playlist_id, video_ids)
+async def _remove_svi(browser: str, profiles: Sequence[str], playlist_id: str,
+                      video_ids: Iterable[str], request_interval: float) -> None:
+    streams = _video_id_streams(profiles, video_ids)
+
+    async def remove(profile: str, yt: YouTubeClient) -> None:
+        for svi in streams[profile]:
+            await yt.remove_video_id_from_playlist(playlist_id, svi, cache_values=True)
+
+    await _for_each_profile(browser, profiles, request_interval, remove)
+
+
+def remove_svi_callback(browser: str,
+                        profiles: Sequence[str],
+                        playlist_id: str,
+                        video_ids: Iterable[str],
+                        request_interval: float = 0.0) -> None:
+    _run_async(_remove_svi, browser, profiles, playlist_id, video_ids, request_interval)
 
 
 @click.command(context_settings={'help_option_names': ('-h', '--help')})
 @click.option('-d', '--debug', is_flag=True, help='Enable debug output.')
 @click.option('-b', '--browser', default='chrome', help='Browser to read cookies from.')
-@click.option('-p', '--profile', default='Default', help='Browser profile.')
+@click.option('-p',
+              '--profile',
+              'profiles',
+              default=('Default',),
+              multiple=True,
+              help=_PROFILE_HELP)
+@click.option('--request-interval',
+              type=click.FloatRange(min=0),
+              default=0,
+              help=_REQUEST_INTERVAL_HELP)
+@click.option('-f',
+              '--from-file',
+              type=click.File('r'),
+              help='Read video IDs from a file, one per line. Use - for standard input.')
 @click.argument('video_ids', nargs=-1)
 def remove_watch_later_video_id(browser: str,
-                                profile: str,
+                                profiles: tuple[str, ...],
                                 video_ids: tuple[str, ...],
+                                request_interval: float = 0,
+                                from_file: TextIO | None = None,
                                 *,
                                 debug: bool = False) -> None:
-    """Remove videos from your Watch Later queue."""
-    setup_logging(debug=debug,
-                  loggers={
-                      'youtube_unofficial': {
-                          'handlers': ('console',),
-                          'level': logging.DEBUG if debug else logging.INFO,
-                          'propagate': False
-                      }
-                  })
-    remove_svi_callback(browser, profile, 'WL', video_ids)
+    """
+    Remove videos from your Watch Later queue.
+
+    Pass - as a video ID to read IDs from standard input, one per line. With more than one
+    profile, all video IDs are read into memory before the first removal.
+    """
+    _setup_logging(debug=debug)
+    remove_svi_callback(browser, profiles, 'WL', _iter_video_ids(video_ids, from_file),
+                        request_interval)
 
 
 @click.command(context_settings={'help_option_names': ('-h', '--help')})
 @click.option('-d', '--debug', is_flag=True, help='Enable debug output.')
 @click.option('-b', '--browser', default='chrome', help='Browser to read cookies from.')
-@click.option('-p', '--profile', default='Default', help='Browser profile.')
+@click.option('-p',
+              '--profile',
+              'profiles',
+              default=('Default',),
+              multiple=True,
+              help=_PROFILE_HELP)
+@click.option('--request-interval',
+              type=click.FloatRange(min=0),
+              default=0,
+              help=_REQUEST_INTERVAL_HELP)
+@click.option('-f',
+              '--from-file',
+              type=click.File('r'),
+              help='Read video IDs from a file, one per line. Use - for standard input.')
 @click.argument('playlist_id', nargs=1)
 @click.argument('video_ids', nargs=-1)
 def remove_video_id(browser: str,
-                    profile: str,
+                    profiles: tuple[str, ...],
                     playlist_id: str,
                     video_ids: tuple[str, ...],
+                    request_interval: float = 0,
+                    from_file: TextIO | None = None,
                     *,
                     debug: bool = False) -> None:
-    """Remove videos from a playlist."""
-    setup_logging(debug=debug,
-                  loggers={
-                      'youtube_unofficial': {
-                          'handlers': ('console',),
-                          'level': logging.DEBUG if debug else logging.INFO,
-                          'propagate': False
-                      }
-                  })
-    remove_svi_callback(browser, profile, playlist_id, video_ids)
+    """
+    Remove videos from a playlist.
 
+    Pass - as a video ID to read IDs from standard input, one per line. With more than one
+    profile, all video IDs are read into memory before the first removal.
+    """
+    _setup_logging(debug=debug)
+    remove_svi_callback(browser, profiles, playlist_id, _iter_video_ids(video_ids, from_file),
+                        request_interval)
 
-async def _toggle_watch_history(browser: str, profile: str) -> None:
-    session = await build_youtube_session(browser, profile)
-    async with session:
-        yt = YouTubeClient(session)
+
+async def _toggle_watch_history(browser: str, profiles: Sequence[str],
+                                request_interval: float) -> None:
+    async def toggle(profile: str, yt: YouTubeClient) -> bool:
         if not await yt.toggle_watch_history():
-            click.echo('Failed to toggle watch history.', err=True)
-            raise click.Abort
-    click.echo('Watch history toggled.')
+            click.echo(f'{_prefix(profile, profiles)}Failed to toggle watch history.', err=True)
+            return False
+        click.echo(f'{_prefix(profile, profiles)}Watch history toggled.')
+        return True
+
+    if not all((await _for_each_profile(browser, profiles, request_interval, toggle)).values()):
+        raise click.Abort
 
 
 @click.command(context_settings={'help_option_names': ('-h', '--help')})
 @click.option('-d', '--debug', is_flag=True, help='Enable debug output.')
 @click.option('-b', '--browser', default='chrome', help='Browser to read cookies from.')
-@click.option('-p', '--profile', default='Default', help='Browser profile.')
-def toggle_watch_history(browser: str, profile: str, *, debug: bool = False) -> None:
+@click.option('-p',
+              '--profile',
+              'profiles',
+              default=('Default',),
+              multiple=True,
+              help=_PROFILE_HELP)
+@click.option('--request-interval',
+              type=click.FloatRange(min=0),
+              default=0,
+              help=_REQUEST_INTERVAL_HELP)
+def toggle_watch_history(browser: str,
+                         profiles: tuple[str, ...],
+                         request_interval: float = 0,
+                         *,
+                         debug: bool = False) -> None:
     """Disable or enable watch history."""
-    setup_logging(debug=debug,
-                  loggers={
-                      'youtube_unofficial': {
-                          'handlers': ('console',),
-                          'level': logging.DEBUG if debug else logging.INFO,
-                          'propagate': False
-                      }
-                  })
-    anyio.run(_toggle_watch_history, browser, profile)
+    _setup_logging(debug=debug)
+    _run_async(_toggle_watch_history, browser, profiles, request_interval)
 
 
-async def _clear_watch_history(browser: str, profile: str) -> None:
-    session = await build_youtube_session(browser, profile)
-    async with session:
-        yt = YouTubeClient(session)
+async def _clear_watch_history(browser: str, profiles: Sequence[str],
+                               request_interval: float) -> None:
+    async def clear(profile: str, yt: YouTubeClient) -> None:
         await yt.clear_watch_history()
-    click.echo('Watch history cleared.')
+        click.echo(f'{_prefix(profile, profiles)}Watch history cleared.')
+
+    await _for_each_profile(browser, profiles, request_interval, clear)
 
 
 @click.command(context_settings={'help_option_names': ('-h', '--help')})
 @click.option('-d', '--debug', is_flag=True, help='Enable debug output.')
 @click.option('-b', '--browser', default='chrome', help='Browser to read cookies from.')
-@click.option('-p', '--profile', default='Default', help='Browser profile.')
-def clear_watch_history(browser: str, profile: str, *, debug: bool = False) -> None:
+@click.option('-p',
+              '--profile',
+              'profiles',
+              default=('Default',),
+              multiple=True,
+              help=_PROFILE_HELP)
+@click.option('--request-interval',
+              type=click.FloatRange(min=0),
+              default=0,
+              help=_REQUEST_INTERVAL_HELP)
+def clear_watch_history(browser: str,
+                        profiles: tuple[str, ...],
+                        request_interval: float = 0,
+                        *,
+                        debug: bool = False) -> None:
     """Clear watch history."""
-    setup_logging(debug=debug,
-                  loggers={
-                      'youtube_unofficial': {
-                          'handlers': ('console',),
-                          'level': logging.DEBUG if debug else logging.INFO,
-                          'propagate': False
-                      }
-                  })
-    anyio.run(_clear_watch_history, browser, profile)
+    _setup_logging(debug=debug)
+    _run_async(_clear_watch_history, browser, profiles, request_interval)
 
 
-async def _clear_watch_later(browser: str, profile: str) -> None:
-    session = await build_youtube_session(browser, profile)
-    async with session:
-        yt = YouTubeClient(session)
+async def _clear_watch_later(browser: str,
+                             profiles: Sequence[str],
+                             request_interval: float,
+                             progress: Progress | None = None) -> None:
+    async def clear(profile: str, yt: YouTubeClient) -> None:
+        if progress is not None:
+            progress.attach(yt)
         await yt.clear_watch_later()
-    click.echo('Watch later queue cleared.')
+        click.echo(f'{_prefix(profile, profiles)}Watch later queue cleared.')
+
+    await _for_each_profile(browser, profiles, request_interval, clear)
 
 
 @click.command(context_settings={'help_option_names': ('-h', '--help')})
 @click.option('-d', '--debug', is_flag=True, help='Enable debug output.')
 @click.option('-b', '--browser', default='chrome', help='Browser to read cookies from.')
-@click.option('-p', '--profile', default='Default', help='Browser profile.')
-def clear_watch_later(browser: str, profile: str, *, debug: bool = False) -> None:
+@click.option('-p',
+              '--profile',
+              'profiles',
+              default=('Default',),
+              multiple=True,
+              help=_PROFILE_HELP)
+@click.option('--request-interval',
+              type=click.FloatRange(min=0),
+              default=0,
+              help=_REQUEST_INTERVAL_HELP)
+@click.option('--progress', is_flag=True, help=_PROGRESS_HELP)
+def clear_watch_later(browser: str,
+                      profiles: tuple[str, ...],
+                      request_interval: float = 0,
+                      *,
+                      debug: bool = False,
+                      progress: bool = False) -> None:
     """Clear watch later queue."""
-    setup_logging(debug=debug,
-                  loggers={
-                      'youtube_unofficial': {
-                          'handlers': ('console',),
-                          'level': logging.DEBUG if debug else logging.INFO,
-                          'propagate': False
-                      }
-                  })
-    anyio.run(_clear_watch_later, browser, profile)
+    _setup_logging(debug=debug)
+    with _progress(enabled=progress) as reporter:
+        _run_async(_clear_watch_later, browser, profiles, request_interval, reporter)
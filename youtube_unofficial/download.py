@@ -2,20 +2,43 @@
 
 from __future__ import annotations
 
+from time import perf_counter
 from typing import TYPE_CHECKING, Any, Literal, cast
+from urllib.parse import urlsplit
 import logging
 
 from typing_extensions import overload
 
+from .hooks import RequestEvent
+from .json_codec import loads
+
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
     import niquests
 
+    from .hooks import RequestHook
+    from .metrics import ClientMetrics
+
 __all__ = ('download_page',)
 log = logging.getLogger(__name__)
 
 
+def _record(metrics: ClientMetrics, sess: niquests.AsyncSession, r: niquests.Response, url: str,
+            method: str, duration: float) -> None:
+    endpoint = urlsplit(url).path
+    metrics.requests.inc(1, endpoint, method.upper(), str(r.status_code))
+    metrics.request_duration.observe(duration, endpoint)
+    if body := getattr(r.request, 'body', None):
+        metrics.request_bytes.inc(len(body), endpoint)
+    metrics.response_bytes.inc(len(r.content or b''), endpoint)
+    # Responses served from the cache were never sent, so they have no raw response.
+    if getattr(sess, 'cache', None) is not None:
+        metrics.cache.inc(1, endpoint, 'miss' if r.raw is not None else 'hit')
+    if history := getattr(getattr(r.raw, 'retries', None), 'history', None):
+        metrics.retries.inc(len(history), endpoint)
+
+
 @overload
 async def download_page(sess: niquests.AsyncSession,
                         url: str,
@@ -25,20 +48,27 @@ async def download_page(sess: niquests.AsyncSession,
                         params: Mapping[str, str] | None = None,
                         json: Any = None,
                         *,
-                        return_json: Literal[False]) -> str:  # pragma: no cover
+                        return_json: Literal[False],
+                        only_if_cached: bool = False,
+                        metrics: ClientMetrics | None = None,
+                        on_request: RequestHook | None = None) -> str:  # pragma: no cover
     ...
 
 
 @overload
-async def download_page(sess: niquests.AsyncSession,
-                        url: str,
-                        data: Any = None,
-                        method: Literal['get', 'post'] = 'get',
-                        headers: Mapping[str, str] | None = None,
-                        params: Mapping[str, str] | None = None,
-                        json: Any = None,
-                        *,
-                        return_json: Literal[True]) -> dict[str, Any]:  # pragma: no cover
+async def download_page(
+        sess: niquests.AsyncSession,
+        url: str,
+        data: Any = None,
+        method: Literal['get', 'post'] = 'get',
+        headers: Mapping[str, str] | None = None,
+        params: Mapping[str, str] | None = None,
+        json: Any = None,
+        *,
+        return_json: Literal[True],
+        only_if_cached: bool = False,
+        metrics: ClientMetrics | None = None,
+        on_request: RequestHook | None = None) -> dict[str, Any]:  # pragma: no cover
     ...
 
 
@@ -50,7 +80,10 @@ async def download_page(sess: niquests.AsyncSession,
                         params: Mapping[str, str] | None = None,
                         json: Any = None,
                         *,
-                        return_json: bool = False) -> str | dict[str, Any]:
+                        return_json: bool = False,
+                        only_if_cached: bool = False,
+                        metrics: ClientMetrics | None = None,
+                        on_request: RequestHook | None = None) -> str | dict[str, Any]:
     """
     Download a page using the provided session.
 
@@ -72,6 +105,15 @@ async def download_page(sess: niquests.AsyncSession,
         Optional JSON body for the request.
     return_json : bool
         If ``True``, parse the response as JSON.
+    only_if_cached : bool
+        If ``True``, only use the cache of the session. The session must accept an
+        ``only_if_cached`` keyword argument, such as
+        :py:class:`~youtube_unofficial.cache.YouTubeCachedSession`.
+    metrics : ClientMetrics | None
+        Metrics to record the request in.
+    on_request : RequestHook | None
+        Called with a :py:class:`~youtube_unofficial.hooks.RequestEvent` at the start and at the end
+        of the request.
 
     Returns
     -------
@@ -82,9 +124,34 @@ async def download_page(sess: niquests.AsyncSession,
     if headers:
         merged.update(headers)
     merged.pop('Accept-Encoding', None)
-    r = await sess.request(method, url, data=data, params=params, json=json, headers=merged)
+    cache_kwargs: dict[str, Any] = {'only_if_cached': True} if only_if_cached else {}
+    if on_request is not None:
+        on_request(RequestEvent('start', method.upper(), url))
+    start = perf_counter()
+    try:
+        r = await sess.request(method,
+                               url,
+                               data=data,
+                               params=params,
+                               json=json,
+                               headers=merged,
+                               **cache_kwargs)
+    except Exception as e:
+        if metrics is not None:
+            metrics.requests.inc(1, urlsplit(url).path, method.upper(), 'error')
+        if on_request is not None:
+            on_request(
+                RequestEvent('end', method.upper(), url, duration=perf_counter() - start, error=e))
+        raise
+    duration = perf_counter() - start
+    if metrics is not None:
+        _record(metrics, sess, r, url, method, duration)
+    if on_request is not None:
+        on_request(
+            RequestEvent('end', method.upper(), url, r.status_code, duration,
+                         len(getattr(r.request, 'body', None) or b''), len(r.content or b'')))
     r.raise_for_status()
     if not return_json:
         text = r.text
         return text.strip() if text else ''
-    return cast('dict[str, Any]', r.json())
+    return cast('dict[str, Any]', loads(r.content or b''))
@@ -0,0 +1,75 @@
+"""
+Choice of the event loop.
+
+Commands run on the asyncio backend of anyio. By default it uses the event loop of the standard
+library. `uvloop <https://github.com/MagicStack/uvloop>`_ (the ``uvloop`` extra) is a drop-in
+replacement built on libuv that spends less time per task switch, callback and socket operation,
+which shows when many InnerTube requests run at once, for example with several profiles. Choose it
+with ``youtube --loop uvloop`` or by setting the ``YOUTUBE_UNOFFICIAL_LOOP`` environment variable
+to ``uvloop``.
+
+.. code-block:: python
+
+   anyio.run(main, backend_options=backend_options('uvloop'))
+"""
+from __future__ import annotations
+
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any, Literal
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+__all__ = ('LOOP_ENV_VAR', 'LOOP_NAMES', 'LoopName', 'available_loops', 'backend_options')
+
+LoopName = Literal['asyncio', 'uvloop']
+LOOP_NAMES: Sequence[LoopName] = ('asyncio', 'uvloop')
+"""Names of the supported event loops."""
+LOOP_ENV_VAR = 'YOUTUBE_UNOFFICIAL_LOOP'
+"""Environment variable read by ``youtube --loop``."""
+
+
+def available_loops() -> tuple[LoopName, ...]:
+    """
+    Get the names of the event loops that can be used.
+
+    Returns
+    -------
+    tuple[LoopName, ...]
+        ``asyncio``, followed by ``uvloop`` if it is installed.
+    """
+    return tuple(name for name in LOOP_NAMES if name == 'asyncio' or find_spec(name) is not None)
+
+
+def backend_options(name: LoopName = 'asyncio') -> dict[str, Any]:
+    """
+    Get the options of the asyncio backend of :py:func:`anyio.run` for an event loop.
+
+    Parameters
+    ----------
+    name : LoopName
+        Name of the event loop.
+
+    Returns
+    -------
+    dict[str, Any]
+        Value of the ``backend_options`` argument of :py:func:`anyio.run`.
+
+    Raises
+    ------
+    ImportError
+        If uvloop is requested but not installed.
+    ValueError
+        If the name is unknown.
+    """
+    if name not in LOOP_NAMES:
+        msg = f'Unknown event loop: {name}.'
+        raise ValueError(msg)
+    if name == 'asyncio':
+        return {}
+    try:
+        import uvloop  # ruff:ignore[import-outside-top-level]
+    except ImportError as e:
+        msg = 'uvloop is not installed. Install youtube-unofficial[uvloop].'
+        raise ImportError(msg) from e
+    return {'loop_factory': uvloop.new_event_loop}
@@ -0,0 +1,284 @@
+"""
+Recording and replay of client sessions in HTTP Archive (HAR) format.
+
+Wrap a session in :py:class:`RecordingSession` to record every request made through it (including
+browse continuations and other POST requests) and :py:meth:`RecordingSession.save` the result.
+Pass a :py:class:`ReplaySession` made from the file to
+:py:class:`~youtube_unofficial.client.YouTubeClient` to serve it back without a network.
+
+.. code-block:: python
+
+   recorder = RecordingSession(session)
+   async for _ in YouTubeClient(recorder).get_history_video_ids():
+       pass
+   recorder.save('history.har')
+
+   async for _ in YouTubeClient(ReplaySession('history.har')).get_history_video_ids():
+       pass
+
+Cookie values and the ``Authorization`` header (the SAPISID hash) are redacted.
+"""
+from __future__ import annotations
+
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, cast
+from urllib.parse import urlencode
+
+from typing_extensions import override
+import niquests
+
+from . import __version__
+from .json_codec import dumps, loads
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+__all__ = ('REDACTED', 'RecordingMissError', 'RecordingSession', 'ReplaySession')
+
+REDACTED = '[REDACTED]'
+"""Replacement for redacted values."""
+_REDACTED_HEADERS = frozenset({'authorization', 'cookie', 'set-cookie'})
+_VERSION = '1.2'
+
+
+class RecordingMissError(LookupError):
+    """Raised when a replayed session has no recorded response for a request."""
+    def __init__(self, method: str, url: str) -> None:
+        super().__init__(f'No recorded response for {method.upper()} {url}.')
+
+
+def _full_url(url: str, params: Mapping[str, str] | None) -> str:
+    if not params:
+        return url
+    return f'{url}{"&" if "?" in url else "?"}{urlencode(params)}'
+
+
+def _body_text(kwargs: Mapping[str, Any]) -> str | None:
+    if kwargs.get('json') is not None:
+        return dumps(kwargs['json'], sort_keys=True)
+    if (data := kwargs.get('data')) is not None:
+        return data.decode() if isinstance(data, bytes) else str(data)
+    return None
+
+
+def _har_headers(headers: Mapping[str, Any] | None) -> list[dict[str, str]]:
+    return [{
+        'name': str(name),
+        'value': REDACTED if str(name).lower() in _REDACTED_HEADERS else str(value)
+    } for name, value in (headers or {}).items()]
+
+
+def _entry_key(method: str, url: str, body: str | None) -> tuple[str, str, str | None]:
+    return method.upper(), url, body
+
+
+class RecordingSession(niquests.AsyncSession):
+    """
+    Session that sends requests with another session and records them.
+
+    Headers and cookies are those of the wrapped session. Closing this session does not close the
+    wrapped one.
+    """
+    def __init__(self, session: niquests.AsyncSession) -> None:
+        """
+        Initialise the recorder.
+
+        Parameters
+        ----------
+        session : niquests.AsyncSession
+            Session that sends the requests.
+        """
+        super().__init__()
+        self.session = session
+        """Session that sends the requests."""
+        self.headers = session.headers
+        self.cookies = session.cookies
+        self.entries: list[dict[str, Any]] = []
+        """Recorded HAR entries."""
+
+    @override
+    async def request(  # type: ignore[override]
+            self, method: str, url: str, *args: Any, **kwargs: Any) -> niquests.Response:
+        """
+        Send a request with the wrapped session and record it.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method.
+        url : str
+            The URL.
+        *args : Any
+            Positional arguments forwarded to the wrapped session.
+        **kwargs : Any
+            Keyword arguments forwarded to the wrapped session.
+
+        Returns
+        -------
+        niquests.Response
+            The HTTP response.
+        """
+        started = datetime.now(timezone.utc)
+        start = perf_counter()
+        resp = cast('niquests.Response', await self.session.request(method, url, *args, **kwargs))
+        elapsed_ms = (perf_counter() - start) * 1000
+        body = _body_text(kwargs)
+        post_data = {} if body is None else {
+            'postData': {
+                'mimeType': 'application/json' if kwargs.get('json') is not None else 'text/plain',
+                'text': body
+            }
+        }
+        self.entries.append({
+            'startedDateTime': started.isoformat(),
+            'time': elapsed_ms,
+            'request': {
+                'method': method.upper(),
+                'url': _full_url(url, kwargs.get('params')),
+                'httpVersion': 'HTTP/1.1',
+                'cookies': [{
+                    'name': cookie.name,
+                    'value': REDACTED
+                } for cookie in self.cookies],
+                'headers': _har_headers(kwargs.get('headers')),
+                'queryString': [{
+                    'name': k,
+                    'value': str(v)
+                } for k, v in (kwargs.get('params') or {}).items()],
+                'headersSize': -1,
+                'bodySize': -1 if body is None else len(body.encode()),
+            } | post_data,
+            'response': {
+                'status': resp.status_code,
+                'statusText': resp.reason or '',
+                'httpVersion': 'HTTP/1.1',
+                'cookies': [],
+                'headers': _har_headers(resp.headers),
+                'content': {
+                    'size': len(resp.content or b''),
+                    'mimeType': resp.headers.get('content-type', ''),
+                    'text': resp.text or ''
+                },
+                'redirectURL': '',
+                'headersSize': -1,
+                'bodySize': len(resp.content or b'')
+            },
+            'cache': {},
+            'timings': {
+                'send': 0,
+                'wait': elapsed_ms,
+                'receive': 0
+            }
+        })
+        return resp
+
+    def har(self) -> dict[str, Any]:
+        """
+        Get the recording.
+
+        Returns
+        -------
+        dict[str, Any]
+            HAR document.
+        """
+        return {
+            'log': {
+                'version': _VERSION,
+                'creator': {
+                    'name': 'youtube-unofficial',
+                    'version': __version__
+                },
+                'entries': self.entries
+            }
+        }
+
+    def save(self, path: str | Path) -> None:
+        """
+        Write the recording to a file.
+
+        Parameters
+        ----------
+        path : str | Path
+            Destination.
+        """
+        Path(path).write_text(dumps(self.har(), indent=True), encoding='utf-8')
+
+
+class ReplaySession(niquests.AsyncSession):
+    """
+    Session that serves recorded responses and never uses the network.
+
+    A request is matched on its method, URL with query string and body. Requests that were made
+    more than once are answered in recorded order, and the last answer is repeated once the
+    recording runs out. Volatile headers such as ``Authorization`` are not part of the match.
+
+    A placeholder ``SAPISID`` cookie is set so that the client can build its ``Authorization``
+    header.
+    """
+    def __init__(self, har: str | Path | Mapping[str, Any]) -> None:
+        """
+        Initialise the replay.
+
+        Parameters
+        ----------
+        har : str | Path | Mapping[str, Any]
+            Path to a HAR file, or a HAR document.
+        """
+        super().__init__()
+        document = (loads(Path(har).read_bytes()) if isinstance(har, str | Path) else har)
+        self._responses: defaultdict[tuple[str, str, str | None],
+                                     deque[dict[str, Any]]] = defaultdict(deque)
+        for entry in document['log']['entries']:
+            request = entry['request']
+            self._responses[_entry_key(request['method'], request['url'],
+                                       request.get('postData',
+                                                   {}).get('text'))].append(entry['response'])
+        self.cookies.set('SAPISID', REDACTED)  # type: ignore[no-untyped-call]
+
+    @override
+    async def request(  # type: ignore[override]
+            self, method: str, url: str, *args: Any, **kwargs: Any) -> niquests.Response:
+        """
+        Get the recorded response to a request.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method.
+        url : str
+            The URL.
+        *args : Any
+            Ignored.
+        **kwargs : Any
+            ``params``, ``json`` and ``data`` are used to match the request. Others are ignored.
+
+        Returns
+        -------
+        niquests.Response
+            The recorded response.
+
+        Raises
+        ------
+        RecordingMissError
+            If there is no recorded response for the request.
+        """
+        full_url = _full_url(url, kwargs.get('params'))
+        queue = self._responses.get(_entry_key(method, full_url, _body_text(kwargs)))
+        if not queue:
+            raise RecordingMissError(method, full_url)
+        recorded = queue.popleft() if len(queue) > 1 else queue[0]
+        resp = niquests.Response()
+        resp.status_code = recorded['status']
+        resp.reason = recorded.get('statusText', '')
+        resp._content = recorded['content'].get(  # ruff:ignore[private-member-access]
+            'text', '').encode()
+        resp.headers.update({
+            x['name']: x['value']
+            for x in recorded['headers'] if x['name'].lower() not in _REDACTED_HEADERS
+        })
+        resp.url = full_url
+        resp.encoding = 'utf-8'
+        return resp
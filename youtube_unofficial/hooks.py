@@ -0,0 +1,99 @@
+"""
+Events passed to the hooks of :py:class:`~youtube_unofficial.client.YouTubeClient`.
+
+Hooks are plain callables called synchronously on the event loop, so they should return quickly.
+A hook that is not set costs one ``is None`` check per event.
+
+.. code-block:: python
+
+   def on_request(event: RequestEvent) -> None:
+       if event.phase == 'end':
+           print(f'{event.method} {event.url} {event.status} {event.duration:.3f}s')
+
+   yt = YouTubeClient(session, on_request=on_request, on_mutation=print)
+   await yt.clear_watch_later()
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any, Literal, NamedTuple
+
+__all__ = ('ItemEvent', 'ItemHook', 'MutationEvent', 'MutationHook', 'PageEvent', 'PageHook',
+           'RequestEvent', 'RequestHook')
+
+
+class RequestEvent(NamedTuple):
+    """An HTTP request started or ended."""
+    phase: Literal['start', 'end']
+    """``start`` before the request is sent, ``end`` once the response is read or the request
+    failed."""
+    method: str
+    """HTTP method in upper case."""
+    url: str
+    """URL without the query string parameters."""
+    status: int | None = None
+    """Status code. ``None`` at the start or if no response was received."""
+    duration: float = 0.0
+    """Seconds from the start, including reading the body. ``0`` at the start."""
+    request_bytes: int = 0
+    """Size of the request body. ``0`` at the start."""
+    response_bytes: int = 0
+    """Size of the response body. ``0`` at the start."""
+    error: BaseException | None = None
+    """Exception raised if no response was received."""
+
+
+RequestHook = Callable[[RequestEvent], None]
+"""Called at the start and at the end of every HTTP request."""
+
+
+class PageEvent(NamedTuple):
+    """A page of a history or playlist listing was received and parsed."""
+    url: str
+    """URL of the bootstrap page, or of the InnerTube API for a continuation."""
+    page_index: int
+    """``0`` for the bootstrap page, then ``1`` for the first continuation and so on."""
+    items: int
+    """Number of entries on the page."""
+    total: int | None = None
+    """Number of entries in the whole listing as shown in the header of a playlist. Only set on the
+    bootstrap page of a playlist, and only if the header has a count."""
+
+
+PageHook = Callable[[PageEvent], None]
+"""Called with every page before its entries are yielded."""
+
+
+class ItemEvent(NamedTuple):
+    """A public generator of the client yielded an item."""
+    generator: str
+    """Name of the generator method, such as ``get_history_video_ids``. Generators built on
+    others, such as ``get_history_video_ids`` on ``get_history_info``, only emit events under
+    their own name, so each item is reported once."""
+    position: int
+    """``0`` for the first item of the call, then ``1`` and so on."""
+    item: Any
+    """The item."""
+
+
+ItemHook = Callable[[ItemEvent], None]
+"""Called with every item before it is yielded."""
+
+
+class MutationEvent(NamedTuple):
+    """A removal or another change was made."""
+    kind: Literal['feedback', 'edit_playlist']
+    """``feedback`` for history changes, ``edit_playlist`` for playlist removals."""
+    succeeded: bool
+    """Whether YouTube reported success."""
+    playlist_id: str | None = None
+    """Playlist changed by ``edit_playlist``."""
+    video_id: str | None = None
+    """Video removed, if known."""
+    found: bool = True
+    """``False`` if the video was not found, so no request was made and ``succeeded`` is
+    ``False``."""
+
+
+MutationHook = Callable[[MutationEvent], None]
+"""Called with the result of every mutation."""
@@ -0,0 +1,240 @@
+"""
+JSON encoding and decoding.
+
+The fastest installed library is used: `orjson <https://github.com/ijl/orjson>`_, then
+`msgspec <https://jcristharif.com/msgspec/>`_, then the standard library. Set the
+``YOUTUBE_UNOFFICIAL_JSON`` environment variable to ``orjson``, ``msgspec`` or ``json`` to choose
+one explicitly. If that library is not installed or the name is unknown, a warning is logged and
+the standard library is used.
+
+All codecs produce the same text: compact separators (``': '`` after keys when indenting) and
+non-ASCII characters left as is.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Literal, cast
+import json
+import logging
+import os
+
+from typing_extensions import override
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+__all__ = ('CODEC_NAMES', 'CodecName', 'JSONCodec', 'LazyJSON', 'available_codecs', 'codec',
+           'dumps', 'get_codec', 'loads')
+
+log = logging.getLogger(__name__)
+
+CodecName = Literal['orjson', 'msgspec', 'json']
+CODEC_NAMES: Sequence[CodecName] = ('orjson', 'msgspec', 'json')
+"""Codec names in order of preference."""
+
+
+class JSONCodec:
+    """Standard library codec. Subclasses wrap faster libraries."""
+    name: CodecName = 'json'
+    """Name of the codec."""
+    def __init__(self) -> None:
+        """Initialise the codec."""
+        self._json = json
+
+    def loads(self, data: str | bytes) -> Any:
+        """
+        Decode a JSON document.
+
+        Parameters
+        ----------
+        data : str | bytes
+            The document.
+
+        Returns
+        -------
+        Any
+            The decoded value.
+        """
+        return self._json.loads(data)
+
+    def dumps(self, obj: Any, *, indent: bool = False, sort_keys: bool = False) -> str:
+        """
+        Encode a value as JSON.
+
+        Parameters
+        ----------
+        obj : Any
+            The value.
+        indent : bool
+            If ``True``, indent with two spaces.
+        sort_keys : bool
+            If ``True``, sort the keys of objects.
+
+        Returns
+        -------
+        str
+            The document.
+        """
+        return self._json.dumps(obj,
+                                ensure_ascii=False,
+                                indent=2 if indent else None,
+                                separators=(',', ': ') if indent else (',', ':'),
+                                sort_keys=sort_keys)
+
+
+class _OrjsonCodec(JSONCodec):
+    name: CodecName = 'orjson'
+
+    def __init__(self) -> None:
+        import orjson  # ruff:ignore[import-outside-top-level]
+        super().__init__()
+        self._orjson = orjson
+
+    @override
+    def loads(self, data: str | bytes) -> Any:
+        return self._orjson.loads(data)
+
+    @override
+    def dumps(self, obj: Any, *, indent: bool = False, sort_keys: bool = False) -> str:
+        option = ((self._orjson.OPT_INDENT_2 if indent else 0)
+                  | (self._orjson.OPT_SORT_KEYS if sort_keys else 0))
+        return self._orjson.dumps(obj, option=option).decode()
+
+
+class _MsgspecCodec(JSONCodec):
+    name: CodecName = 'msgspec'
+
+    def __init__(self) -> None:
+        import msgspec.json  # ruff:ignore[import-outside-top-level]
+        super().__init__()
+        self._msgspec = msgspec
+
+    @override
+    def loads(self, data: str | bytes) -> Any:
+        try:
+            return self._msgspec.json.decode(data)
+        except self._msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    @override
+    def dumps(self, obj: Any, *, indent: bool = False, sort_keys: bool = False) -> str:
+        data = self._msgspec.json.encode(obj, order='sorted' if sort_keys else None)
+        if indent:
+            data = self._msgspec.json.format(data, indent=2)
+        return data.decode()
+
+
+_CODECS: dict[CodecName, type[JSONCodec]] = {
+    'orjson': _OrjsonCodec,
+    'msgspec': _MsgspecCodec,
+    'json': JSONCodec
+}
+
+
+def _try_codec(name: CodecName) -> JSONCodec | None:
+    try:
+        return _CODECS[name]()
+    except ImportError:
+        return None
+
+
+def available_codecs() -> tuple[CodecName, ...]:
+    """
+    Get the names of the codecs whose library is installed.
+
+    Returns
+    -------
+    tuple[CodecName, ...]
+        Names in order of preference.
+    """
+    return tuple(name for name in CODEC_NAMES if _try_codec(name) is not None)
+
+
+def get_codec(name: CodecName | None = None) -> JSONCodec:
+    """
+    Get a codec.
+
+    Parameters
+    ----------
+    name : CodecName | None
+        Codec name. If ``None``, the ``YOUTUBE_UNOFFICIAL_JSON`` environment variable is used if
+        set, otherwise the first installed codec of :py:data:`CODEC_NAMES`.
+
+    Returns
+    -------
+    JSONCodec
+        The codec.
+
+    Raises
+    ------
+    ValueError
+        If the name is unknown.
+    """
+    name = name or cast('CodecName | None', os.environ.get('YOUTUBE_UNOFFICIAL_JSON') or None)
+    if name is not None:
+        if name not in _CODECS:
+            msg = f'Unknown JSON codec: {name}.'
+            raise ValueError(msg)
+        return _CODECS[name]()
+    return next(x for x in map(_try_codec, CODEC_NAMES) if x is not None)
+
+
+def _default_codec() -> JSONCodec:
+    # Runs on import, so a bad environment variable must not stop the CLI from starting.
+    try:
+        return get_codec()
+    except (ImportError, ValueError) as e:
+        log.warning('Using the standard library JSON codec: %s', e)
+        return JSONCodec()
+
+
+codec = _default_codec()
+"""Codec used by this package."""
+loads = codec.loads
+dumps = codec.dumps
+
+
+class LazyJSON:
+    """
+    Value rendered as JSON only when converted to a string.
+
+    Use as a logging argument so that nothing is serialised unless the record is emitted:
+
+    .. code-block:: python
+
+       log.debug('Response JSON: %s', LazyJSON(response))
+    """
+    __slots__ = ('_text', 'max_length', 'obj')
+
+    def __init__(self, obj: Any, *, max_length: int | None = 2000) -> None:
+        """
+        Initialise the wrapper.
+
+        Parameters
+        ----------
+        obj : Any
+            The value.
+        max_length : int | None
+            Number of characters after which the rendering is cut. ``None`` means no limit.
+        """
+        self.obj = obj
+        """The value."""
+        self.max_length = max_length
+        """Number of characters after which the rendering is cut."""
+        self._text: str | None = None
+
+    def __str__(self) -> str:
+        """
+        Render the value.
+
+        The rendering is kept, so several log handlers serialise the value only once.
+
+        Returns
+        -------
+        str
+            Compact JSON with sorted keys, cut to :py:attr:`max_length` characters.
+        """
+        if self._text is None:
+            text = dumps(self.obj, sort_keys=True)
+            self._text = (text if self.max_length is None or len(text) <= self.max_length else
+                          f'{text[:self.max_length]}... ({len(text)} characters)')
+        return self._text
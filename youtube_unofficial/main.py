@@ -1,9 +1,19 @@
 """Entry point for the CLI."""
 from __future__ import annotations
 
+from pathlib import Path
+from typing import TYPE_CHECKING
+
 import click
 
 from .commands import (
+    DELEGATED_SESSION_IDS_META_KEY,
+    LOOP_META_KEY,
+    METRICS_META_KEY,
+    PARSE_PROCESSES_META_KEY,
+    PARSE_THREADS_META_KEY,
+    STALL_DETECTOR_META_KEY,
+    TRACER_META_KEY,
     clear_watch_history,
     clear_watch_later,
     print_history,
@@ -14,11 +24,145 @@ from .commands import (
     remove_watch_later_video_id,
     toggle_watch_history,
 )
+from .event_loop import LOOP_ENV_VAR, LOOP_NAMES
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .event_loop import LoopName
+    from .profiling import ProfilerKind
+
+
+def _start_profiler(ctx: click.Context, kind: ProfilerKind, output: Path | None) -> None:
+    from .profiling import create_profiler
+    profiler = create_profiler(kind)
+    output = output or Path(f'youtube-unofficial{profiler.suffix}')
+
+    def finish() -> None:
+        profiler.stop()
+        profiler.save(output)
+        click.echo(profiler.summary(), err=True)
+        click.echo(f'Profile written to {output}.', err=True)
+
+    ctx.call_on_close(finish)
+    profiler.start()
+
+
+def _start_metrics(ctx: click.Context, path: Path) -> None:
+    from .metrics import ClientMetrics
+    metrics = ctx.meta[METRICS_META_KEY] = ClientMetrics()
+    ctx.call_on_close(lambda: metrics.registry.write_textfile(path))
+
+
+def _start_tracing(ctx: click.Context, path: Path | None, *, otel: bool) -> None:
+    if path is not None and otel:
+        msg = '--trace-file and --otel cannot be used together.'
+        raise click.UsageError(msg, ctx)
+    if otel:
+        from .tracing import OpenTelemetryTracer
+        try:
+            ctx.meta[TRACER_META_KEY] = OpenTelemetryTracer()
+        except ImportError as e:
+            raise click.UsageError(str(e), ctx) from e
+    elif path is not None:
+        from .tracing import RecordingTracer
+        tracer = ctx.meta[TRACER_META_KEY] = RecordingTracer()
+        ctx.call_on_close(lambda: tracer.write_jsonl(path))
+
+
+def _start_stall_detector(ctx: click.Context, threshold: float) -> None:
+    from .stalls import StallDetector
+    detector = ctx.meta[STALL_DETECTOR_META_KEY] = StallDetector(
+        threshold, on_stall=lambda stall: click.echo(stall.report(), err=True))
+    ctx.call_on_close(lambda: click.echo(detector.summary(), err=True))
+
+
+def _parse_delegated_session_ids(ctx: click.Context, values: Iterable[str]) -> dict[str, str]:
+    ret: dict[str, str] = {}
+    for value in values:
+        profile, _, delegated_session_id = value.rpartition('=')
+        if not profile or not delegated_session_id:
+            ctx.fail(f'Invalid --delegated-session-id {value!r}. Expected PROFILE=ID.')
+        ret[profile] = delegated_session_id
+    return ret
 
 
 @click.group(context_settings={'help_option_names': ('-h', '--help')})
-def main() -> None:
+@click.option('--profiler',
+              type=click.Choice(('cprofile', 'sampling')),
+              help=('Profile the command with cProfile (pstats file) or a sampling profiler '
+                    '(collapsed stacks for flame graphs) and print the top functions.'))
+@click.option('--profiler-output',
+              type=click.Path(dir_okay=False, path_type=Path),
+              help=('File to write the profile to. Defaults to youtube-unofficial.prof or '
+                    'youtube-unofficial.collapsed in the current directory.'))
+@click.option('--metrics-file',
+              type=click.Path(dir_okay=False, path_type=Path),
+              help=('Write request, item and mutation metrics to this file in Prometheus text '
+                    'format at exit, for the textfile collector of node_exporter.'))
+@click.option('--trace-file',
+              type=click.Path(dir_okay=False, path_type=Path),
+              help=('Write a tracing span for every operation, page download, continuation request '
+                    'and batch of removals to this file as JSON lines at exit.'))
+@click.option('--otel',
+              is_flag=True,
+              help=('Send tracing spans to OpenTelemetry. Requires the otel extra and a configured '
+                    'SDK, for example by running under opentelemetry-instrument.'))
+@click.option('--detect-stalls',
+              metavar='SECONDS',
+              type=click.FloatRange(min=0, min_open=True),
+              help=('Report every event loop stall longer than SECONDS on standard error, with the '
+                    'coroutine and the stack that blocked the loop. For debugging.'))
+@click.option(
+    '--parse-threads',
+    type=click.IntRange(min=0),
+    default=0,
+    help=('Parse pages in a pool of this many worker threads instead of on the event loop, '
+          'so downloads and removals of other playlists and accounts keep going. 0 '
+          'parses on the event loop.'))
+@click.option(
+    '--parse-processes',
+    type=click.IntRange(min=0),
+    default=0,
+    help=('Parse pages in a pool of this many worker processes, which scales with the number of '
+          'cores when several playlists or accounts are read at once. Cannot be used with '
+          '--parse-threads.'))
+@click.option('--loop',
+              type=click.Choice(LOOP_NAMES),
+              default='asyncio',
+              envvar=LOOP_ENV_VAR,
+              show_default=True,
+              help=('Event loop to run the command on. uvloop requires the uvloop extra and costs '
+                    f'less per request when many run at once. Read from {LOOP_ENV_VAR} if not '
+                    'given.'))
+@click.option('--delegated-session-id',
+              'delegated_session_ids',
+              metavar='PROFILE=ID',
+              multiple=True,
+              help=('DELEGATED_SESSION_ID of the brand account used by a browser profile, so that '
+                    'its HTTP cache is kept apart from the other accounts of the profile. Can be '
+                    'given once per profile.'))
+@click.pass_context
+def main(ctx: click.Context, profiler: ProfilerKind | None, profiler_output: Path | None,
+         metrics_file: Path | None, trace_file: Path | None, detect_stalls: float | None,
+         parse_threads: int, parse_processes: int, loop: LoopName,
+         delegated_session_ids: tuple[str, ...], *, otel: bool) -> None:
     """Unofficial YouTube CLI."""
+    if parse_threads > 0 and parse_processes > 0:
+        ctx.fail('--parse-threads and --parse-processes cannot be used together.')
+    ctx.meta[DELEGATED_SESSION_IDS_META_KEY] = _parse_delegated_session_ids(
+        ctx, delegated_session_ids)
+    ctx.meta[PARSE_THREADS_META_KEY] = parse_threads
+    ctx.meta[PARSE_PROCESSES_META_KEY] = parse_processes
+    ctx.meta[LOOP_META_KEY] = loop
+    if detect_stalls is not None:
+        _start_stall_detector(ctx, detect_stalls)
+    if trace_file is not None or otel:
+        _start_tracing(ctx, trace_file, otel=otel)
+    if metrics_file is not None:
+        _start_metrics(ctx, metrics_file)
+    if profiler is not None:
+        _start_profiler(ctx, profiler, profiler_output)
 
 
 main.add_command(clear_watch_history)
@@ -0,0 +1,165 @@
+"""
+Memory tracing per history or playlist page.
+
+Pass a started :py:class:`MemoryTracer` as the ``on_page`` hook of
+:py:class:`~youtube_unofficial.client.YouTubeClient`. At every page it takes a :py:mod:`tracemalloc`
+snapshot and records how much memory is allocated, the peak so far and the bytes retained since the
+previous page, with the allocation site that grew the most. This tells whether growth comes from
+parse trees, decoded ``ytInitialData`` or whatever consumes the entries.
+
+.. code-block:: python
+
+   tracer = MemoryTracer()
+   tracer.start()
+   yt = YouTubeClient(session, on_page=tracer)
+   async for entry in yt.get_history_video_ids(return_dict=True):
+       ...
+   tracer.stop()
+   print(tracer.report())
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+import tracemalloc
+
+if TYPE_CHECKING:
+    from .hooks import PageEvent
+
+__all__ = ('MemoryTracer', 'PageMemory')
+
+_FILTERS = (tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__),
+            tracemalloc.Filter(inclusive=False, filename_pattern='<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(inclusive=False, filename_pattern='<unknown>'))
+
+
+class PageMemory(NamedTuple):
+    """Memory use when a page was received."""
+    url: str
+    """URL of the page."""
+    page_index: int
+    """Index of the page. See :py:class:`~youtube_unofficial.hooks.PageEvent`."""
+    current: int
+    """Bytes allocated."""
+    peak: int
+    """Highest number of bytes allocated so far."""
+    retained: int
+    """Bytes allocated since the previous page (or since :py:meth:`MemoryTracer.start`) and not
+    freed."""
+    top_site: str
+    """File and line that retained the most bytes since the previous page."""
+
+
+def _site(stat: tracemalloc.StatisticDiff | tracemalloc.Statistic) -> str:
+    frame = stat.traceback[0]
+    return f'{frame.filename}:{frame.lineno}'
+
+
+def _take_snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+
+class MemoryTracer:
+    """Hook that records memory use per page with :py:mod:`tracemalloc`."""
+    def __init__(self, frames: int = 1) -> None:
+        """
+        Initialise the tracer.
+
+        Parameters
+        ----------
+        frames : int
+            Number of frames of each allocation traceback to keep, if tracing is not already on.
+        """
+        self.frames = frames
+        """Number of frames of each allocation traceback to keep."""
+        self.pages: list[PageMemory] = []
+        """Memory use at each page in the order received."""
+        self._previous: tracemalloc.Snapshot | None = None
+        self._final: tracemalloc.Snapshot | None = None
+        self._started_tracing = False
+        self._peak = 0
+
+    def start(self) -> None:
+        """Start tracing, unless it is already on, and take the first snapshot."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self._previous = _take_snapshot()
+
+    def __call__(self, event: PageEvent) -> None:
+        """
+        Record memory use for a page.
+
+        Parameters
+        ----------
+        event : PageEvent
+            The page.
+        """
+        if self._previous is None:
+            return
+        current, self._peak = tracemalloc.get_traced_memory()
+        snapshot = _take_snapshot()
+        diff = snapshot.compare_to(self._previous, 'lineno')
+        self.pages.append(
+            PageMemory(event.url, event.page_index, current, self._peak,
+                       sum(x.size_diff for x in diff),
+                       _site(diff[0]) if diff else ''))
+        self._previous = snapshot
+
+    def stop(self) -> None:
+        """Take the final snapshot and stop tracing if :py:meth:`start` started it."""
+        if self._previous is None:
+            return
+        self._peak = tracemalloc.get_traced_memory()[1]
+        self._final = _take_snapshot()
+        self._previous = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @property
+    def peak(self) -> int:
+        """Highest number of bytes allocated while tracing."""
+        return self._peak
+
+    def top_sites(self, limit: int = 10) -> list[tracemalloc.Statistic]:
+        """
+        Get the allocation sites holding the most memory at :py:meth:`stop`.
+
+        Parameters
+        ----------
+        limit : int
+            Number of sites.
+
+        Returns
+        -------
+        list[tracemalloc.Statistic]
+            The sites, largest first. Empty before :py:meth:`stop`.
+        """
+        if self._final is None:
+            return []
+        return self._final.statistics('lineno')[:limit]
+
+    def report(self, limit: int = 10) -> str:
+        """
+        Get a summary of peak use, retained bytes per page and the top allocation sites.
+
+        Parameters
+        ----------
+        limit : int
+            Number of allocation sites.
+
+        Returns
+        -------
+        str
+            The summary.
+        """
+        lines = [
+            f'Peak traced memory: {self._peak / 2**20:.1f} MiB', '',
+            f'{"page":>5}{"current KiB":>13}{"retained KiB":>14}  top site'
+        ]
+        lines.extend(f'{x.page_index:>5}{x.current / 1024:>13,.0f}{x.retained / 1024:>14,.0f}  '
+                     f'{x.top_site}' for x in self.pages)
+        lines += ['', f'{"KiB":>10}{"blocks":>9}  allocation site']
+        lines.extend(
+            f'{x.size / 1024:>10,.0f}{x.count:>9}  {_site(x)}' for x in self.top_sites(limit))
+        return '\n'.join(lines)
@@ -0,0 +1,397 @@
+"""
+Counters and histograms of requests, items and mutations, with Prometheus text export.
+
+Pass a :py:class:`ClientMetrics` to :py:class:`~youtube_unofficial.client.YouTubeClient` (or
+:py:func:`~youtube_unofficial.download.download_page`) and write its registry with
+:py:meth:`MetricsRegistry.write_textfile` for the textfile collector of node_exporter:
+
+.. code-block:: python
+
+   metrics = ClientMetrics()
+   yt = YouTubeClient(session, metrics=metrics)
+   await yt.clear_watch_later()
+   metrics.registry.write_textfile('/var/lib/node_exporter/youtube_unofficial.prom')
+
+Metrics are safe to update from several threads.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from pathlib import Path
+from typing import TYPE_CHECKING, TypeVar
+import math
+import os
+import threading
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Iterable, Sequence
+
+__all__ = ('DEFAULT_BUCKETS', 'ClientMetrics', 'Counter', 'Histogram', 'MetricsRegistry')
+
+_T = TypeVar('_T')
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+"""Default upper bounds of histogram buckets, suited to durations in seconds."""
+_ITEM_BUCKETS = (0, 1, 10, 100, 1000, 10_000, 100_000)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return f'{{{",".join(pairs)}}}' if pairs else ''
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        """Name of the metric."""
+        self.documentation = documentation
+        """Help text."""
+        self.labelnames = tuple(labelnames)
+        """Names of the labels."""
+        self._lock = threading.Lock()
+
+    def _header(self) -> list[str]:
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+
+
+class Counter(_Metric):
+    """Value that only goes up, per combination of label values."""
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        """
+        Initialise the counter.
+
+        Parameters
+        ----------
+        name : str
+            Name of the metric. By convention it ends in ``_total``.
+        documentation : str
+            Help text.
+        labelnames : Sequence[str]
+            Names of the labels.
+        """
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, *labelvalues: str) -> None:
+        """
+        Increase the counter.
+
+        Parameters
+        ----------
+        amount : float
+            Amount to add.
+        *labelvalues : str
+            Values of the labels in the order of :py:attr:`labelnames`.
+        """
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        """
+        Get the value for some label values.
+
+        Parameters
+        ----------
+        *labelvalues : str
+            Values of the labels.
+
+        Returns
+        -------
+        float
+            The value, ``0`` if never increased.
+        """
+        return self._values.get(labelvalues, 0)
+
+    def render(self) -> list[str]:
+        """
+        Get the lines of the metric in Prometheus text format.
+
+        Returns
+        -------
+        list[str]
+            The lines.
+        """
+        with self._lock:
+            values = sorted(self._values.items())
+        return self._header() + [
+            f'{self.name}{_labels(self.labelnames, labels)} {_number(value)}'
+            for labels, value in values
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets, per combination of label values."""
+    kind = 'histogram'
+
+    def __init__(self,
+                 name: str,
+                 documentation: str,
+                 labelnames: Sequence[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        """
+        Initialise the histogram.
+
+        Parameters
+        ----------
+        name : str
+            Name of the metric.
+        documentation : str
+            Help text.
+        labelnames : Sequence[str]
+            Names of the labels.
+        buckets : Iterable[float]
+            Upper bounds of the buckets. A ``+Inf`` bucket is always added.
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(set(buckets) - {math.inf}))
+        """Upper bounds of the buckets, without ``+Inf``."""
+        # Per label values: count per bucket (the last is +Inf), sum.
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        """
+        Record a value.
+
+        Parameters
+        ----------
+        value : float
+            The value.
+        *labelvalues : str
+            Values of the labels in the order of :py:attr:`labelnames`.
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            if (entry := self._values.get(labelvalues)) is None:
+                entry = self._values[labelvalues] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def count(self, *labelvalues: str) -> int:
+        """
+        Get the number of observations for some label values.
+
+        Parameters
+        ----------
+        *labelvalues : str
+            Values of the labels.
+
+        Returns
+        -------
+        int
+            The number of observations.
+        """
+        return sum(entry[0]) if (entry := self._values.get(labelvalues)) else 0
+
+    def render(self) -> list[str]:
+        """
+        Get the lines of the metric in Prometheus text format.
+
+        Returns
+        -------
+        list[str]
+            The lines.
+        """
+        with self._lock:
+            values = sorted((k, (list(v[0]), v[1][0])) for k, v in self._values.items())
+        lines = self._header()
+        for labels, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(
+                    f'{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}')
+            lines += [
+                f'{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}',
+                f'{self.name}_count{_labels(self.labelnames, labels)} {cumulative}'
+            ]
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+    def __init__(self) -> None:
+        """Initialise the registry."""
+        self.metrics: dict[str, Counter | Histogram] = {}
+        """Metrics keyed by name."""
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """
+        Create and register a counter.
+
+        Parameters
+        ----------
+        name : str
+            Name of the metric.
+        documentation : str
+            Help text.
+        labelnames : Sequence[str]
+            Names of the labels.
+
+        Returns
+        -------
+        Counter
+            The counter.
+        """
+        self.metrics[name] = metric = Counter(name, documentation, labelnames)
+        return metric
+
+    def histogram(self,
+                  name: str,
+                  documentation: str,
+                  labelnames: Sequence[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        """
+        Create and register a histogram.
+
+        Parameters
+        ----------
+        name : str
+            Name of the metric.
+        documentation : str
+            Help text.
+        labelnames : Sequence[str]
+            Names of the labels.
+        buckets : Iterable[float]
+            Upper bounds of the buckets.
+
+        Returns
+        -------
+        Histogram
+            The histogram.
+        """
+        self.metrics[name] = metric = Histogram(name, documentation, labelnames, buckets)
+        return metric
+
+    def render(self) -> str:
+        """
+        Get all metrics in Prometheus text exposition format.
+
+        Returns
+        -------
+        str
+            The metrics.
+        """
+        return ''.join(f'{line}\n' for metric in self.metrics.values() for line in metric.render())
+
+    def write_textfile(self, path: str | Path) -> None:
+        """
+        Write all metrics to a file for the textfile collector of node_exporter.
+
+        The file is written next to its destination and renamed, so the collector never reads a
+        partial file.
+
+        Parameters
+        ----------
+        path : str | Path
+            Destination. It should end in ``.prom``.
+        """
+        path = Path(path)
+        temporary = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        temporary.write_text(self.render(), encoding='utf-8')
+        temporary.replace(path)
+
+
+class ClientMetrics:
+    """Metrics recorded by :py:class:`~youtube_unofficial.client.YouTubeClient`."""
+    def __init__(self,
+                 registry: MetricsRegistry | None = None,
+                 prefix: str = 'youtube_unofficial') -> None:
+        """
+        Register the metrics.
+
+        Parameters
+        ----------
+        registry : MetricsRegistry | None
+            Registry to add the metrics to. A new one is created if ``None``.
+        prefix : str
+            Prefix of the metric names.
+        """
+        self.registry = registry or MetricsRegistry()
+        """Registry of the metrics."""
+        self.requests = self.registry.counter(f'{prefix}_requests_total', 'HTTP requests.',
+                                              ('endpoint', 'method', 'status'))
+        """Requests by URL path, method and status code (``error`` if no response)."""
+        self.request_duration = self.registry.histogram(f'{prefix}_request_duration_seconds',
+                                                        'Duration of HTTP requests.', ('endpoint',))
+        """Duration of requests by URL path, including reading the body."""
+        self.request_bytes = self.registry.counter(f'{prefix}_request_bytes_total',
+                                                   'Bytes of HTTP request bodies.', ('endpoint',))
+        """Bytes sent in request bodies by URL path."""
+        self.response_bytes = self.registry.counter(f'{prefix}_response_bytes_total',
+                                                    'Bytes of HTTP response bodies.', ('endpoint',))
+        """Bytes received in response bodies by URL path."""
+        self.cache = self.registry.counter(f'{prefix}_cache_requests_total',
+                                           'Requests through the HTTP cache.',
+                                           ('endpoint', 'result'))
+        """Requests of a caching session by URL path and result (``hit`` or ``miss``)."""
+        self.retries = self.registry.counter(f'{prefix}_retries_total', 'Retries of HTTP requests.',
+                                             ('endpoint',))
+        """Retries made by the transport by URL path."""
+        self.items = self.registry.counter(f'{prefix}_items_total', 'Items yielded.',
+                                           ('generator',))
+        """Items yielded by each generator of the client."""
+        self.items_per_call = self.registry.histogram(f'{prefix}_items_per_call',
+                                                      'Items yielded per call of a generator.',
+                                                      ('generator',), _ITEM_BUCKETS)
+        """Items yielded per call of each generator of the client."""
+        self.mutations = self.registry.counter(f'{prefix}_mutations_total',
+                                               'Removals and other changes.', ('kind', 'result'))
+        """Mutations by kind (``feedback`` or ``edit_playlist``) and result (``succeeded`` or
+        ``failed``)."""
+
+    def mutation(self, kind: str, *, succeeded: bool) -> None:
+        """
+        Count a mutation.
+
+        Parameters
+        ----------
+        kind : str
+            ``feedback`` or ``edit_playlist``.
+        succeeded : bool
+            Whether it succeeded.
+        """
+        self.mutations.inc(1, kind, 'succeeded' if succeeded else 'failed')
+
+    async def count_items(self, generator: str,
+                          items: AsyncGenerator[_T, None]) -> AsyncGenerator[_T, None]:
+        """
+        Count the items of an async generator as they are yielded.
+
+        Parameters
+        ----------
+        generator : str
+            Name of the generator.
+        items : AsyncGenerator[_T, None]
+            The generator.
+
+        Yields
+        ------
+        _T
+            The items of ``items``.
+        """
+        count = 0
+        try:
+            async for item in items:
+                count += 1
+                self.items.inc(1, generator)
+                yield item
+        finally:
+            await items.aclose()
+            self.items_per_call.observe(count, generator)
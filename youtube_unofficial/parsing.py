@@ -0,0 +1,87 @@
+"""
+Parsing of bootstrap pages in worker processes.
+
+Parsing a history or playlist page with html5lib and decoding its ``ytInitialData`` is CPU-bound,
+so worker threads (see the ``parse_limiter`` argument of
+:py:class:`~youtube_unofficial.client.YouTubeClient`) are limited by the GIL. With
+``parse_processes=True``, the client sends the page text to :py:func:`parse_bootstrap` in a worker
+process with :py:func:`anyio.to_process.run_sync` and receives a :py:class:`BootstrapPage`. Only
+the ytcfg keys and ``ytInitialData`` subtrees the client reads are sent back, which is a small
+fraction of the page.
+
+Each listing is a chain of continuations, so the pool is kept busy by listings of several
+playlists or accounts at once, for example with :py:class:`~youtube_unofficial.pool.ClientPool`.
+
+On free-threaded builds of Python (such as ``python3.14t``), worker threads run in parallel and
+cost less than processes: nothing is pickled and continuation pages are decoded in the threads too.
+:py:func:`gil_enabled` tells which case applies.
+"""
+from __future__ import annotations
+
+from typing import Any, NamedTuple, cast
+import sys
+
+from bs4 import BeautifulSoup as Soup
+
+from .typing.ytcfg import YtcfgDict
+from .utils import find_ytcfg, initial_data
+
+__all__ = ('INITIAL_DATA_KEYS', 'BootstrapPage', 'gil_enabled', 'parse_bootstrap')
+
+INITIAL_DATA_KEYS = ('contents', 'header')
+"""Top-level keys of ``ytInitialData`` kept by :py:func:`parse_bootstrap`."""
+_YTCFG_KEYS = YtcfgDict.__required_keys__ | YtcfgDict.__optional_keys__
+
+
+class BootstrapPage(NamedTuple):
+    """Data the client reads from a bootstrap page."""
+    ytcfg: YtcfgDict
+    """The ytcfg."""
+    initial_data: dict[str, Any]
+    """The ``ytInitialData``. Empty if it was not requested."""
+
+
+def parse_bootstrap(html: str,
+                    *,
+                    with_initial_data: bool = True,
+                    parser: str = 'html5lib') -> BootstrapPage:
+    """
+    Parse a bootstrap page and keep only what the client reads.
+
+    This runs in a worker process, so its argument and return value are pickled.
+
+    Parameters
+    ----------
+    html : str
+        Text of the page.
+    with_initial_data : bool
+        Whether to decode ``ytInitialData``. Pages only used for their ytcfg skip it.
+    parser : str
+        BeautifulSoup parser.
+
+    Returns
+    -------
+    BootstrapPage
+        The keys of ytcfg declared in :py:class:`~youtube_unofficial.typing.ytcfg.YtcfgDict` and
+        the :py:data:`INITIAL_DATA_KEYS` of ``ytInitialData``.
+    """
+    soup = Soup(html, parser)
+    ytcfg = cast('YtcfgDict', {k: v for k, v in find_ytcfg(soup).items() if k in _YTCFG_KEYS})
+    if not with_initial_data:
+        return BootstrapPage(ytcfg, {})
+    data = initial_data(soup)
+    return BootstrapPage(ytcfg, {k: data[k] for k in INITIAL_DATA_KEYS if k in data})
+
+
+def gil_enabled() -> bool:
+    """
+    Tell whether the GIL is enabled.
+
+    Returns
+    -------
+    bool
+        ``False`` on a free-threaded build running without the GIL, in which case parsing in worker
+        threads scales with the number of cores. ``True`` otherwise.
+    """
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return True if is_gil_enabled is None else bool(is_gil_enabled())
@@ -0,0 +1,189 @@
+"""Concurrent access to several browser profiles."""
+from __future__ import annotations
+
+from contextlib import AsyncExitStack
+from typing import TYPE_CHECKING, TypeVar
+import logging
+
+from typing_extensions import Self
+import anyio
+
+from .client import YouTubeClient
+from .ratelimit import RateLimiter
+from .session import build_youtube_session
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable, Mapping
+    from types import TracebackType
+
+    from .metrics import ClientMetrics
+    from .tracing import Tracer
+
+__all__ = ('ClientPool',)
+
+_T = TypeVar('_T')
+log = logging.getLogger(__name__)
+
+
+class ClientPool:
+    """
+    Sessions and clients for several browser profiles.
+
+    Each profile gets its own session, :py:class:`~youtube_unofficial.client.YouTubeClient` and
+    :py:class:`~youtube_unofficial.ratelimit.RateLimiter`. Nothing read from a page (ytcfg,
+    ``DELEGATED_SESSION_ID``, cached bootstrap pages) is shared between clients, so every request
+    is made as the account that owns the profile.
+
+    Use as an async context manager:
+
+    .. code-block:: python
+
+       async with ClientPool('chrome', ('Default', 'Profile 1')) as pool:
+           await pool.run(lambda profile, yt: yt.clear_watch_later())
+    """
+    def __init__(self,
+                 browser: str,
+                 profiles: Iterable[str],
+                 *,
+                 min_request_interval: float = 0.0,
+                 cache_only: bool = False,
+                 metrics: ClientMetrics | None = None,
+                 tracer: Tracer | None = None,
+                 parse_threads: int = 0,
+                 parse_processes: int = 0,
+                 delegated_session_ids: Mapping[str, str] | None = None) -> None:
+        """
+        Initialise the pool.
+
+        Parameters
+        ----------
+        browser : str
+            Browser name for :py:func:`~youtube_unofficial.session.build_youtube_session`.
+        profiles : Iterable[str]
+            Browser profile names. Duplicates are ignored.
+        min_request_interval : float
+            Minimum number of seconds between two requests of the same account.
+        cache_only : bool
+            If ``True``, clients only replay cached responses. See
+            :py:class:`~youtube_unofficial.client.YouTubeClient`.
+        metrics : ClientMetrics | None
+            Metrics shared by all clients.
+        tracer : Tracer | None
+            Tracer shared by all clients.
+        parse_threads : int
+            If more than ``0``, all clients parse bootstrap pages in a shared pool of this many
+            worker threads instead of on the event loop. See the ``parse_limiter`` argument of
+            :py:class:`~youtube_unofficial.client.YouTubeClient`.
+        parse_processes : int
+            If more than ``0``, all clients parse bootstrap pages in a shared pool of this many
+            worker processes instead. See :py:mod:`youtube_unofficial.parsing`.
+        delegated_session_ids : Mapping[str, str] | None
+            ``DELEGATED_SESSION_ID`` of the brand account used by a profile, keyed by profile name.
+            See :py:func:`~youtube_unofficial.session.build_youtube_session`.
+
+        Raises
+        ------
+        ValueError
+            If both ``parse_threads`` and ``parse_processes`` are given.
+        """
+        if parse_threads > 0 and parse_processes > 0:
+            msg = 'parse_threads and parse_processes cannot be used together.'
+            raise ValueError(msg)
+        self.browser = browser
+        """Browser to read cookies from."""
+        self.profiles = tuple(dict.fromkeys(profiles))
+        """Browser profile names in the order given."""
+        self.clients: dict[str, YouTubeClient] = {}
+        """Clients keyed by profile name. Populated on entering the context."""
+        self._cache_only = cache_only
+        self._delegated_session_ids = dict(delegated_session_ids or {})
+        self._metrics = metrics
+        self._min_request_interval = min_request_interval
+        self._parse_workers = parse_threads or parse_processes
+        self._parse_processes = parse_processes > 0
+        self._tracer = tracer
+        self._exit_stack = AsyncExitStack()
+
+    async def __aenter__(self) -> Self:
+        """
+        Build the sessions of all profiles concurrently.
+
+        If any session cannot be built, the others are closed and the first exception is re-raised.
+
+        Returns
+        -------
+        Self
+            This pool.
+        """
+        errors: list[Exception] = []
+        parse_limiter = (anyio.CapacityLimiter(self._parse_workers)
+                         if self._parse_workers > 0 else None)
+
+        async def build(profile: str) -> None:
+            try:
+                session = await build_youtube_session(
+                    self.browser,
+                    profile,
+                    delegated_session_id=self._delegated_session_ids.get(profile))
+            except Exception as e:  # ruff:ignore[blind-except]
+                errors.append(e)
+                return
+            self.clients[profile] = YouTubeClient(
+                await self._exit_stack.enter_async_context(session),
+                rate_limiter=RateLimiter(self._min_request_interval),
+                cache_only=self._cache_only,
+                metrics=self._metrics,
+                tracer=self._tracer,
+                parse_limiter=parse_limiter,
+                parse_processes=self._parse_processes)
+
+        try:
+            async with anyio.create_task_group() as tg:
+                for profile in self.profiles:
+                    tg.start_soon(build, profile)
+        finally:
+            if errors:
+                await self._exit_stack.aclose()
+        if errors:
+            raise errors[0]
+        return self
+
+    async def __aexit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None,
+                        traceback: TracebackType | None) -> None:
+        """Close all sessions."""
+        await self._exit_stack.aclose()
+
+    async def run(self, func: Callable[[str, YouTubeClient], Awaitable[_T]]) -> dict[str, _T]:
+        """
+        Run ``func`` for every profile concurrently.
+
+        A failure for one profile does not cancel the others. Once all have finished, the first
+        exception raised by ``func`` is re-raised.
+
+        Parameters
+        ----------
+        func : Callable[[str, YouTubeClient], Awaitable[_T]]
+            Called with the profile name and its client.
+
+        Returns
+        -------
+        dict[str, _T]
+            Results keyed by profile name.
+        """
+        results: dict[str, _T] = {}
+        errors: list[Exception] = []
+
+        async def run_one(profile: str, client: YouTubeClient) -> None:
+            try:
+                results[profile] = await func(profile, client)
+            except Exception as e:
+                if len(self.clients) > 1:
+                    log.exception('Profile %s failed.', profile)
+                errors.append(e)
+
+        async with anyio.create_task_group() as tg:
+            for profile, client in self.clients.items():
+                tg.start_soon(run_one, profile, client)
+        if errors:
+            raise errors[0]
+        return {profile: results[profile] for profile in self.profiles}
@@ -0,0 +1,189 @@
+"""
+Profilers for the ``--profiler`` option of the CLI.
+
+:py:class:`CProfiler` records every call with :py:mod:`cProfile` and saves a :py:mod:`pstats` file,
+which can be read with ``python -m pstats`` or snakeviz. :py:class:`SamplingProfiler` records the
+stack of one thread at a fixed interval and saves it in the collapsed format read by
+``flamegraph.pl``, inferno and speedscope. It costs less per call, so it distorts timings less.
+
+Both see the coroutines of async tasks, because a running coroutine's frames are on the stack of
+the event loop thread. Work offloaded to other threads is not recorded.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+import cProfile
+import io
+import pstats
+import sys
+import threading
+
+if TYPE_CHECKING:
+    from types import FrameType
+
+__all__ = ('PROFILER_KINDS', 'CProfiler', 'ProfilerKind', 'SamplingProfiler', 'create_profiler')
+
+ProfilerKind = Literal['cprofile', 'sampling']
+"""Kind of profiler."""
+PROFILER_KINDS: tuple[ProfilerKind, ...] = ('cprofile', 'sampling')
+"""Kinds of profiler."""
+
+
+class CProfiler:
+    """Deterministic profiler that records every call."""
+    suffix = '.prof'
+    """Suffix of the saved file."""
+    def __init__(self) -> None:
+        """Initialise the profiler."""
+        self._profile = cProfile.Profile()
+
+    def start(self) -> None:
+        """Start recording."""
+        self._profile.enable()
+
+    def stop(self) -> None:
+        """Stop recording."""
+        self._profile.disable()
+
+    def save(self, path: str | Path) -> None:
+        """
+        Write the recording as a :py:mod:`pstats` file.
+
+        Parameters
+        ----------
+        path : str | Path
+            Destination.
+        """
+        self._profile.dump_stats(path)
+
+    def summary(self, limit: int = 20) -> str:
+        """
+        Get the functions with the highest cumulative time.
+
+        Parameters
+        ----------
+        limit : int
+            Number of functions.
+
+        Returns
+        -------
+        str
+            Table of the functions.
+        """
+        stream = io.StringIO()
+        pstats.Stats(self._profile, stream=stream).sort_stats('cumulative').print_stats(limit)
+        return stream.getvalue().strip()
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    return f'{frame.f_globals.get("__name__", "?")}:{getattr(code, "co_qualname", code.co_name)}'
+
+
+class SamplingProfiler:
+    """Statistical profiler that records the stack of one thread at an interval."""
+    suffix = '.collapsed'
+    """Suffix of the saved file."""
+    def __init__(self, interval: float = 0.001, thread_id: int | None = None) -> None:
+        """
+        Initialise the profiler.
+
+        Parameters
+        ----------
+        interval : float
+            Seconds between two samples.
+        thread_id : int | None
+            Identifier of the thread to sample. Defaults to the thread that calls :py:meth:`start`.
+        """
+        self.interval = interval
+        """Seconds between two samples."""
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        """Number of samples of each stack, from the outermost frame to the innermost."""
+        self._thread_id = thread_id
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        if self._thread_id is None:
+            self._thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(  # ruff:ignore[private-member-access]
+                self._thread_id or 0)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def save(self, path: str | Path) -> None:
+        """
+        Write the samples in collapsed stack format, one ``frame;frame;frame count`` per line.
+
+        Parameters
+        ----------
+        path : str | Path
+            Destination.
+        """
+        Path(path).write_text(''.join(
+            f'{";".join(stack)} {count}\n' for stack, count in self.stacks.most_common()),
+                              encoding='utf-8')
+
+    def summary(self, limit: int = 20) -> str:
+        """
+        Get the functions seen in the most samples.
+
+        Parameters
+        ----------
+        limit : int
+            Number of functions.
+
+        Returns
+        -------
+        str
+            Table of the functions with the share of samples in which each was running (self) or
+            on the stack (total).
+        """
+        total = sum(self.stacks.values())
+        own: Counter[str] = Counter()
+        inclusive: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for name in set(stack):
+                inclusive[name] += count
+        lines = [f'{total} samples', f'{"self":>7}{"total":>8}  function']
+        lines.extend(f'{own[name] / total:>7.1%}{inclusive[name] / total:>8.1%}  {name}'
+                     for name, _ in own.most_common(limit))
+        return '\n'.join(lines)
+
+
+def create_profiler(kind: ProfilerKind) -> CProfiler | SamplingProfiler:
+    """
+    Create a profiler.
+
+    Parameters
+    ----------
+    kind : ProfilerKind
+        Kind of profiler.
+
+    Returns
+    -------
+    CProfiler | SamplingProfiler
+        The profiler. It is not started.
+    """
+    return CProfiler() if kind == 'cprofile' else SamplingProfiler()
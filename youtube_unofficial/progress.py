@@ -0,0 +1,236 @@
+"""
+Progress of long listings and removals on standard error.
+
+:py:class:`Progress` receives the ``on_page`` and ``on_mutation`` hooks of
+:py:class:`~youtube_unofficial.client.YouTubeClient` and shows the pages fetched, the entries per
+second, the removals done and, when the total is known, the removals left and the estimated time
+left. The total is taken from the count in the header of a playlist, or given by the caller.
+
+On a terminal the status line is redrawn in place. Otherwise a plain line is written every
+``interval`` seconds, so logs of unattended runs stay readable.
+
+.. code-block:: python
+
+   progress = Progress(sys.stderr)
+   yt = YouTubeClient(session)
+   progress.attach(yt)
+   await yt.clear_watch_later()
+   progress.close()
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+import sys
+import time
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from typing import TextIO, TypeVar
+
+    from .client import YouTubeClient
+    from .hooks import MutationEvent, PageEvent
+
+    _E = TypeVar('_E')
+
+__all__ = ('Progress',)
+
+_INTERACTIVE_INTERVAL = 0.1
+_PLAIN_INTERVAL = 10.0
+
+
+def _chain(first: Callable[[_E], None] | None, second: Callable[[_E],
+                                                                None]) -> Callable[[_E], None]:
+    if first is None:
+        return second
+
+    def hook(event: _E) -> None:
+        first(event)
+        second(event)
+
+    return hook
+
+
+class Progress:
+    """Reporter of pages, entries and removals."""
+    def __init__(self,
+                 stream: TextIO | None = None,
+                 *,
+                 total: int | None = None,
+                 interactive: bool | None = None,
+                 interval: float | None = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialise the reporter. The clock starts now.
+
+        Parameters
+        ----------
+        stream : TextIO | None
+            Where to write. Defaults to standard error.
+        total : int | None
+            Number of removals expected, if known in advance. Counts from playlist headers are
+            added to it.
+        interactive : bool | None
+            Whether to redraw a single line. Defaults to whether ``stream`` is a terminal.
+        interval : float | None
+            Minimum number of seconds between two writes. Defaults to 0.1 on a terminal and 10
+            otherwise.
+        clock : Callable[[], float]
+            Monotonic clock in seconds.
+        """
+        self.stream = stream or sys.stderr
+        """Where the progress is written."""
+        self.interactive = self.stream.isatty() if interactive is None else interactive
+        """Whether the status line is redrawn in place."""
+        self.interval = ((_INTERACTIVE_INTERVAL if self.interactive else _PLAIN_INTERVAL)
+                         if interval is None else interval)
+        """Minimum number of seconds between two writes."""
+        self.pages = 0
+        """Pages fetched."""
+        self.items = 0
+        """Entries on the pages fetched."""
+        self.total = total
+        """Number of removals expected, or ``None`` if unknown."""
+        self.done = 0
+        """Successful removals."""
+        self.failed = 0
+        """Removals YouTube did not process."""
+        self._clock = clock
+        self._start = clock()
+        self._first_mutation: float | None = None
+        self._last_write: float | None = None
+        self._width = 0
+
+    def attach(self, client: YouTubeClient) -> None:
+        """
+        Receive the page and mutation events of a client, after its existing hooks.
+
+        Parameters
+        ----------
+        client : YouTubeClient
+            The client.
+        """
+        client.on_page = _chain(client.on_page, self.on_page)
+        client.on_mutation = _chain(client.on_mutation, self.on_mutation)
+
+    def on_page(self, event: PageEvent) -> None:
+        """
+        Count a page. Use as the ``on_page`` hook of a client.
+
+        Parameters
+        ----------
+        event : PageEvent
+            The page.
+        """
+        self.pages += 1
+        self.items += event.items
+        if event.total is not None:
+            self.total = (self.total or 0) + event.total
+        self._update()
+
+    def on_mutation(self, event: MutationEvent) -> None:
+        """
+        Count a removal. Use as the ``on_mutation`` hook of a client.
+
+        A video that was not found is taken off the total instead.
+
+        Parameters
+        ----------
+        event : MutationEvent
+            The removal.
+        """
+        now = self._clock()
+        if not event.found:
+            if self.total is not None:
+                self.total = max(self.total - 1, 0)
+            self._update(now)
+            return
+        if self._first_mutation is None:
+            # Removals start after the listing, so their rate is measured from the first one.
+            self._first_mutation = now
+        if event.succeeded:
+            self.done += 1
+        else:
+            self.failed += 1
+        self._update(now)
+
+    @property
+    def remaining(self) -> int | None:
+        """Removals left, or ``None`` if the total is unknown."""
+        return None if self.total is None else max(self.total - self.done - self.failed, 0)
+
+    def eta(self, now: float | None = None) -> float | None:
+        """
+        Estimate the seconds left from the rate of removals so far.
+
+        Parameters
+        ----------
+        now : float | None
+            Time of the clock. Defaults to the current time.
+
+        Returns
+        -------
+        float | None
+            The estimate, or ``None`` if the total is unknown or no removal was made yet.
+        """
+        remaining = self.remaining
+        if remaining is None or self._first_mutation is None:
+            return None
+        mutations = self.done + self.failed
+        elapsed = (self._clock() if now is None else now) - self._first_mutation
+        if mutations <= 1 or elapsed <= 0:
+            return None
+        # The first removal only starts the clock.
+        return remaining * elapsed / (mutations - 1)
+
+    def status(self, now: float | None = None) -> str:
+        """
+        Format the progress.
+
+        Parameters
+        ----------
+        now : float | None
+            Time of the clock. Defaults to the current time.
+
+        Returns
+        -------
+        str
+            A line such as ``3 pages, 250 items (125.0/s), 40 of 250 removed, ETA 0:01:05``.
+        """
+        now = self._clock() if now is None else now
+        elapsed = now - self._start
+        rate = self.items / elapsed if elapsed > 0 else 0.0
+        parts = [
+            f'{self.pages} page{"" if self.pages == 1 else "s"}',
+            f'{self.items} item{"" if self.items == 1 else "s"} ({rate:.1f}/s)'
+        ]
+        if self.total is not None:
+            parts.append(f'{self.done} of {self.total} removed')
+        elif self.done or self.failed:
+            parts.append(f'{self.done} removed')
+        if self.failed:
+            parts.append(f'{self.failed} failed')
+        if (eta := self.eta(now)) is not None:
+            parts.append(f'ETA {timedelta(seconds=round(eta))}')
+        return ', '.join(parts)
+
+    def close(self) -> None:
+        """Write the final status and end the line."""
+        self._write(self._clock(), final=True)
+
+    def _update(self, now: float | None = None) -> None:
+        now = self._clock() if now is None else now
+        if self._last_write is None or now - self._last_write >= self.interval:
+            self._write(now)
+
+    def _write(self, now: float, *, final: bool = False) -> None:
+        line = self.status(now)
+        if self.interactive:
+            # Pad to erase the end of a longer previous line.
+            end = '\n' if final else ''
+            self.stream.write(f'\r{line:<{self._width}}{end}')
+            self._width = len(line)
+        else:
+            self.stream.write(f'{line}\n')
+        self.stream.flush()
+        self._last_write = now
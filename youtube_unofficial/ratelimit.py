@@ -0,0 +1,39 @@
+"""Request rate limiting."""
+from __future__ import annotations
+
+import anyio
+
+__all__ = ('RateLimiter',)
+
+
+class RateLimiter:
+    """
+    Enforce a minimum interval between requests.
+
+    One instance is meant to be used per account. Concurrent callers are serialised so the interval
+    holds across tasks sharing the limiter.
+    """
+    def __init__(self, min_interval: float = 0.0) -> None:
+        """
+        Initialise the limiter.
+
+        Parameters
+        ----------
+        min_interval : float
+            Minimum number of seconds between the start of two requests. ``0`` disables limiting.
+        """
+        self.min_interval = min_interval
+        """Minimum number of seconds between the start of two requests."""
+        self._lock = anyio.Lock()
+        self._next_request_at = 0.0
+
+    async def wait(self) -> None:
+        """Wait until the next request is allowed to start."""
+        if self.min_interval <= 0:
+            return
+        async with self._lock:
+            now = anyio.current_time()
+            if (delay := self._next_request_at - now) > 0:
+                await anyio.sleep(delay)
+                now = self._next_request_at
+            self._next_request_at = now + self.min_interval
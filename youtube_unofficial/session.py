@@ -2,36 +2,76 @@
 
 from __future__ import annotations
 
-from asyncio import to_thread
-from typing import TYPE_CHECKING, Any
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Literal
 
-from niquests_cache import cached_session
+import anyio.to_thread
 import yt_dlp_utils
 
-if TYPE_CHECKING:
-    from niquests_cache.session import AsyncCachedSession
-
+from .cache import (
+    DEFAULT_CACHE_MAX_BYTES,
+    DEFAULT_CACHE_MAX_ENTRIES,
+    BoundedSQLiteBackend,
+    YouTubeCachedSession,
+    ZstdSQLiteBackend,
+    cache_dir,
+    cache_namespace,
+)
 from .constants import USER_AGENT
 
+if TYPE_CHECKING:
+    from .cache import CachePolicy
+
 __all__ = ('build_youtube_session',)
 
+_CACHE_EXPIRE_AFTER = timedelta(minutes=10)
 
-async def build_youtube_session(browser: str, profile: str) -> AsyncCachedSession:
+
+async def build_youtube_session(
+        browser: str,
+        profile: str,
+        *,
+        delegated_session_id: str | None = None,
+        cache_max_entries: int | None = DEFAULT_CACHE_MAX_ENTRIES,
+        cache_policy: CachePolicy | None = None,
+        cache_backend: Literal['sqlite', 'zstd'] = 'sqlite',
+        cache_max_bytes: int | None = DEFAULT_CACHE_MAX_BYTES) -> YouTubeCachedSession:
     """
     Build a cached async session with cookies from the browser profile.
 
     Browser cookie extraction runs in a worker thread so the event loop is not blocked.
 
+    Every account gets its own cache namespace (a separate database under the user cache
+    directory) keyed by browser, profile and ``delegated_session_id``, so responses of one account
+    are never served to another and one account cannot evict the entries of another.
+
+    What is cached and for how long is decided per request class by ``cache_policy``. Mutations
+    are never cached and invalidate the pages they change.
+
     Parameters
     ----------
     browser : str
         Browser name for :func:`yt_dlp_utils.setup_session`.
     profile : str
         Browser profile name.
+    delegated_session_id : str | None
+        ``DELEGATED_SESSION_ID`` of the brand account in use, if known.
+    cache_max_entries : int | None
+        Maximum number of responses kept in this account's cache. ``None`` means no limit.
+    cache_policy : CachePolicy | None
+        Caching rules. Defaults to :py:class:`~youtube_unofficial.cache.CachePolicy` with default
+        TTLs.
+    cache_backend : Literal['sqlite', 'zstd']
+        ``sqlite`` stores bodies as is. ``zstd`` compresses them, evicts the least recently used
+        entries to stay within ``cache_max_bytes`` and counts hits, misses and evictions (see
+        :py:class:`~youtube_unofficial.cache.ZstdSQLiteBackend`). The two use separate databases.
+    cache_max_bytes : int | None
+        Maximum total size of the compressed bodies with the ``zstd`` backend. ``None`` means no
+        limit.
 
     Returns
     -------
-    AsyncCachedSession
+    YouTubeCachedSession
         Session ready for ``async with`` or immediate use.
     """
     def _sync_setup() -> Any:
@@ -40,9 +80,20 @@ async def build_youtube_session(browser: str, profile: str) -> AsyncCachedSessio
                                           domains={'.youtube.com'},
                                           setup_retry=True)
 
-    rs = await to_thread(_sync_setup)
+    rs = await anyio.to_thread.run_sync(_sync_setup)
     try:
-        session = cached_session(aio=True, app_name='youtube-unofficial')
+        directory = cache_dir(cache_namespace(browser, profile, delegated_session_id))
+        backend: BoundedSQLiteBackend
+        if cache_backend == 'zstd':
+            backend = ZstdSQLiteBackend(directory / 'http.zst.sqlite',
+                                        max_bytes=cache_max_bytes,
+                                        max_entries=cache_max_entries)
+        else:
+            backend = BoundedSQLiteBackend(directory / 'http.sqlite', max_entries=cache_max_entries)
+        session = YouTubeCachedSession(backend=backend,
+                                       expire_after=_CACHE_EXPIRE_AFTER,
+                                       match_headers=True,
+                                       cache_policy=cache_policy)
         session.cookies.update(rs.cookies)  # type: ignore[no-untyped-call]
         session.headers['User-Agent'] = USER_AGENT
         return session
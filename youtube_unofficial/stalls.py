@@ -0,0 +1,221 @@
+"""
+Detection of event loop stalls.
+
+Code that runs on the event loop without awaiting, such as parsing a page with html5lib or decoding
+``ytInitialData``, delays every other task: concurrent downloads and removals do not move forward
+until it returns. :py:class:`StallDetector` runs a heartbeat task on the loop and a watchdog thread.
+When the heartbeat is late by more than ``threshold`` seconds, the watchdog records the stack of
+the loop thread, and the stall is reported with its duration once the loop runs again.
+
+.. code-block:: python
+
+   detector = StallDetector(0.05, on_stall=lambda stall: print(stall.report()))
+   await detector.run(yt.clear_watch_later)
+   print(detector.summary())
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, NamedTuple, TypeVar, cast
+import inspect
+import sys
+import threading
+import time
+import traceback
+
+import anyio
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+    from types import FrameType
+
+__all__ = ('Stall', 'StallDetector', 'StallHook')
+
+_T = TypeVar('_T')
+_ASYNC_FLAGS = inspect.CO_COROUTINE | inspect.CO_ASYNC_GENERATOR | inspect.CO_ITERABLE_COROUTINE
+# Coroutines of these packages wrap those of tasks, so they are not reported as the task.
+_LOOP_PACKAGES = frozenset({'anyio', 'asyncio', 'sniffio', 'trio'})
+
+
+class Stall(NamedTuple):
+    """The event loop did not run other tasks for longer than the threshold."""
+    duration: float
+    """Seconds the heartbeat was late."""
+    coroutine: str | None
+    """Innermost coroutine or async generator on the stack, which was running instead of
+    awaiting. ``None`` if the loop was running a plain callback or code of anyio or asyncio."""
+    task: str | None
+    """Outermost coroutine on the stack outside of anyio and asyncio, which is usually the
+    coroutine the task was started with."""
+    stack: str
+    """Stack of the loop thread from the coroutine of the task inwards, as formatted by
+    :py:mod:`traceback`."""
+    def report(self) -> str:
+        """
+        Format the stall for humans.
+
+        Returns
+        -------
+        str
+            A header line with the duration and the coroutine, followed by the stack.
+        """
+        where = (f' in {self.coroutine} (task {self.task})'
+                 if self.coroutine is not None else ' in a callback')
+        return f'Event loop stalled for {self.duration:.3f} s{where}:\n{self.stack.rstrip()}'
+
+
+StallHook = Callable[[Stall], None]
+"""Called on the event loop with every stall."""
+
+
+def _module(frame: FrameType) -> str:
+    return cast('str', frame.f_globals.get('__name__', '?'))
+
+
+def _name(frame: FrameType) -> str:
+    code = frame.f_code
+    return f'{_module(frame)}:{getattr(code, "co_qualname", code.co_name)}'
+
+
+def _sample(frame: FrameType | None) -> tuple[str | None, str | None, str]:
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    async_frames = [
+        x for x in frames
+        if x.f_code.co_flags & _ASYNC_FLAGS and _module(x).partition('.')[0] not in _LOOP_PACKAGES
+    ]
+    if async_frames:
+        frames = frames[frames.index(async_frames[0]):]
+    stack = ''.join(traceback.StackSummary.extract((x, x.f_lineno) for x in frames).format())
+    if not async_frames:
+        return None, None, stack
+    return _name(async_frames[-1]), _name(async_frames[0]), stack
+
+
+class StallDetector:
+    """Reports when the event loop is blocked for longer than a threshold."""
+    def __init__(self,
+                 threshold: float = 0.1,
+                 *,
+                 on_stall: StallHook | None = None,
+                 interval: float | None = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialise the detector.
+
+        Parameters
+        ----------
+        threshold : float
+            Seconds the loop may be blocked without a report.
+        on_stall : StallHook | None
+            Called with every stall, in addition to adding it to :py:attr:`stalls`.
+        interval : float | None
+            Seconds between two heartbeats and two checks of the watchdog. Defaults to a quarter
+            of ``threshold``.
+        clock : Callable[[], float]
+            Monotonic clock in seconds.
+        """
+        self.threshold = threshold
+        """Seconds the loop may be blocked without a report."""
+        self.interval = threshold / 4 if interval is None else interval
+        """Seconds between two heartbeats."""
+        self.on_stall = on_stall
+        """Called with every stall."""
+        self.stalls: list[Stall] = []
+        """Stalls so far."""
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_beat = 0.0
+        self._pending: tuple[str | None, str | None, str] | None = None
+        self._thread_id = 0
+
+    async def run(self, func: Callable[..., Awaitable[_T]], *args: Any) -> _T:
+        """
+        Run a coroutine function while watching the loop it runs on.
+
+        Parameters
+        ----------
+        func : Callable[..., Awaitable[_T]]
+            The coroutine function.
+        *args : Any
+            Arguments of ``func``.
+
+        Returns
+        -------
+        _T
+            What ``func`` returned.
+        """
+        self._thread_id = threading.get_ident()
+        self._last_beat = self._clock()
+        stopped = threading.Event()
+        watchdog = threading.Thread(target=self._watch,
+                                    args=(stopped,),
+                                    name='stall-detector',
+                                    daemon=True)
+        watchdog.start()
+        error: Exception | None = None
+        try:
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(self._heartbeat)
+                try:
+                    result = await func(*args)
+                except Exception as e:  # ruff:ignore[blind-except]
+                    # Raised again outside the task group so that it is not wrapped in an
+                    # ExceptionGroup.
+                    error = e
+                tg.cancel_scope.cancel()
+        finally:
+            stopped.set()
+            watchdog.join()
+            # A stall at the very end is not followed by a heartbeat.
+            self._beat()
+        if error is not None:
+            raise error
+        return result
+
+    def summary(self) -> str:
+        """
+        Summarise the stalls so far.
+
+        Returns
+        -------
+        str
+            The number of stalls, their total and the longest.
+        """
+        if not self.stalls:
+            return f'No event loop stall longer than {self.threshold} s.'
+        total = sum(x.duration for x in self.stalls)
+        longest = max(self.stalls, key=lambda x: x.duration)
+        return (f'{len(self.stalls)} event loop stall{"" if len(self.stalls) == 1 else "s"}, '
+                f'{total:.3f} s in total, longest {longest.duration:.3f} s in '
+                f'{longest.coroutine or "a callback"}.')
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await anyio.sleep(self.interval)
+            self._beat()
+
+    def _beat(self) -> None:
+        with self._lock:
+            now = self._clock()
+            late = now - self._last_beat - self.interval
+            self._last_beat = now
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            stall = Stall(late, *pending)
+            self.stalls.append(stall)
+            if self.on_stall is not None:
+                self.on_stall(stall)
+
+    def _watch(self, stopped: threading.Event) -> None:
+        while not stopped.wait(self.interval):
+            with self._lock:
+                # Sample once per stall, while the loop thread is still inside the blocking code.
+                if (self._pending is None
+                        and self._clock() - self._last_beat - self.interval > self.threshold):
+                    self._pending = _sample(
+                        sys._current_frames().get(  # ruff:ignore[private-member-access]
+                            self._thread_id))
@@ -0,0 +1 @@
+"""Helpers for testing and benchmarking without YouTube."""
@@ -0,0 +1,49 @@
+"""
+Pytest plugin with an :py:class:`~youtube_unofficial.testing.server.InnerTubeServer` fixture.
+
+Enable it in ``conftest.py``:
+
+.. code-block:: python
+
+   pytest_plugins = ('youtube_unofficial.testing.pytest_plugin',)
+
+The ``innertube_server`` marker passes keyword arguments to the server:
+
+.. code-block:: python
+
+   @pytest.mark.innertube_server(history_size=10_000, faults=Faults(rate_limit=0.1))
+   async def test_history(innertube_server: InnerTubeServer) -> None: ...
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from .server import InnerTubeServer
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+__all__ = ('innertube_server',)
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the ``innertube_server`` marker."""
+    config.addinivalue_line(
+        'markers', 'innertube_server(**kwargs): arguments of the innertube_server fixture.')
+
+
+@pytest.fixture
+def innertube_server(request: pytest.FixtureRequest) -> Iterator[InnerTubeServer]:
+    """
+    Run an :py:class:`~youtube_unofficial.testing.server.InnerTubeServer` for the test.
+
+    Yields
+    ------
+    InnerTubeServer
+        The running server.
+    """
+    marker = request.node.get_closest_marker('innertube_server')
+    with InnerTubeServer(**(marker.kwargs if marker else {})) as server:
+        yield server
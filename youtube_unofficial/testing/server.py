@@ -0,0 +1,503 @@
+"""
+Local stand-in for the YouTube endpoints used by the client.
+
+:py:class:`InnerTubeServer` serves the history and playlist pages (HTML with ``ytcfg.set`` and
+``ytInitialData``), browse continuations, feedback and ``edit_playlist`` from generated data held in
+memory. Removals change that data, so a client run against it behaves like one against YouTube.
+Latency, rate limiting (429), server errors (503) and truncated bodies can be injected with
+:py:class:`Faults`.
+
+.. code-block:: python
+
+   with InnerTubeServer(history_size=5000, faults=Faults(latency=0.05)) as server:
+       async with server.session() as session:
+           async for video_id in YouTubeClient(session).get_history_video_ids():
+               ...
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter, deque
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import TYPE_CHECKING, Any, Literal
+from urllib.parse import parse_qs, urlsplit
+import logging
+import random
+import time
+
+from typing_extensions import Self, override
+import niquests
+
+from ..json_codec import dumps, loads
+from .synthetic import BROWSE_API_URL, FEEDBACK_API_URL, SyntheticData
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+    from types import TracebackType
+
+__all__ = ('FaultKind', 'Faults', 'InnerTubeServer', 'StandInSession')
+
+FaultKind = Literal['rate_limit', 'server_error', 'truncate']
+log = logging.getLogger(__name__)
+_YOUTUBE = 'https://www.youtube.com'
+_EDIT_PLAYLIST_API_URL = '/youtubei/v1/browse/edit_playlist'
+_Response = tuple[int, str, bytes]
+
+
+class Faults:
+    """
+    Faults injected into the responses of an :py:class:`InnerTubeServer`.
+
+    Each response gets at most one fault. Faults queued with :py:meth:`inject` come first, then
+    faults are drawn at random with the given rates.
+    """
+    def __init__(self,
+                 *,
+                 latency: float = 0.0,
+                 rate_limit: float = 0.0,
+                 server_error: float = 0.0,
+                 truncate: float = 0.0,
+                 seed: int = 0) -> None:
+        """
+        Initialise the faults.
+
+        Parameters
+        ----------
+        latency : float
+            Seconds to wait before every response.
+        rate_limit : float
+            Share of responses that are ``429 Too Many Requests`` with a ``Retry-After`` header.
+        server_error : float
+            Share of responses that are ``503 Service Unavailable``.
+        truncate : float
+            Share of responses whose connection is closed after half of the body.
+        seed : int
+            Seed of the random draws.
+        """
+        self.latency = latency
+        """Seconds to wait before every response."""
+        self.rates: dict[FaultKind, float] = {
+            'rate_limit': rate_limit,
+            'server_error': server_error,
+            'truncate': truncate
+        }
+        """Share of responses with each fault."""
+        self._lock = Lock()
+        self._queued: deque[FaultKind | None] = deque()
+        self._random = random.Random(seed)  # ruff:ignore[suspicious-non-cryptographic-random-usage]
+
+    def inject(self, *faults: FaultKind | None) -> None:
+        """
+        Queue faults for the next responses.
+
+        Parameters
+        ----------
+        *faults : FaultKind | None
+            One fault per response. ``None`` means a normal response.
+        """
+        with self._lock:
+            self._queued.extend(faults)
+
+    def next_fault(self) -> FaultKind | None:
+        """
+        Get the fault of the next response.
+
+        Returns
+        -------
+        FaultKind | None
+            The fault, or ``None`` for a normal response.
+        """
+        with self._lock:
+            if self._queued:
+                return self._queued.popleft()
+            roll = self._random.random()
+        for kind, rate in self.rates.items():
+            if roll < rate:
+                return kind
+            roll -= rate
+        return None
+
+
+class StandInSession(niquests.AsyncSession):
+    """Session that sends the requests for YouTube to an :py:class:`InnerTubeServer`."""
+    def __init__(self, base_url: str) -> None:
+        """
+        Initialise the session.
+
+        Parameters
+        ----------
+        base_url : str
+            URL of the server.
+        """
+        super().__init__()
+        self.base_url = base_url
+        """URL of the server."""
+        self.cookies.set('SAPISID', 'stand-in')  # type: ignore[no-untyped-call]
+
+    @override
+    async def request(  # type: ignore[override]
+            self, method: str, url: str, *args: Any, **kwargs: Any) -> niquests.Response:
+        """
+        Send a request, to the server if it is for YouTube.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method.
+        url : str
+            The URL.
+        *args : Any
+            Positional arguments of :py:meth:`niquests.AsyncSession.request`.
+        **kwargs : Any
+            Keyword arguments of :py:meth:`niquests.AsyncSession.request`.
+
+        Returns
+        -------
+        niquests.Response
+            The HTTP response.
+        """
+        if url.startswith(_YOUTUBE):
+            url = f'{self.base_url}{url.removeprefix(_YOUTUBE)}'
+        return await super().request(method, url, *args, **kwargs)  # type: ignore[no-any-return]
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    innertube: InnerTubeServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: _HTTPServer
+
+    def do_GET(self) -> None:
+        self._handle(b'')
+
+    def do_POST(self) -> None:
+        self._handle(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+
+    @override
+    def log_message(self, format: str, *args: Any) -> None:
+        log.debug(format, *args)
+
+    def _handle(self, body: bytes) -> None:
+        innertube = self.server.innertube
+        url = urlsplit(self.path)
+        with innertube.lock:
+            innertube.requests[url.path] += 1
+        if innertube.faults.latency > 0:
+            time.sleep(innertube.faults.latency)
+        fault = innertube.faults.next_fault()
+        if fault == 'rate_limit':
+            self._send(HTTPStatus.TOO_MANY_REQUESTS, 'text/plain', b'Too many requests.',
+                       {'Retry-After': '1'})
+            return
+        if fault == 'server_error':
+            self._send(HTTPStatus.SERVICE_UNAVAILABLE, 'text/plain', b'Service unavailable.')
+            return
+        status, content_type, content = innertube.respond(self.command,
+                                                          url.path, parse_qs(url.query),
+                                                          dict(self.headers), body)
+        if fault == 'truncate':
+            self._send(status, content_type, content, truncate=True)
+            return
+        self._send(status, content_type, content)
+
+    def _send(self,
+              status: int,
+              content_type: str,
+              content: bytes,
+              headers: Mapping[str, str] | None = None,
+              *,
+              truncate: bool = False) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content[:len(content) // 2] if truncate else content)
+        if truncate:
+            self.close_connection = True
+
+
+class InnerTubeServer:
+    """
+    HTTP server that imitates the YouTube endpoints used by the client.
+
+    The server runs in a background thread from :py:meth:`start` (or entering the context) to
+    :py:meth:`close`. Use :py:meth:`session` to get a session that sends the client's requests to
+    it. POST requests without an ``Authorization`` header or with the wrong API key are rejected.
+
+    Pages are built from :py:class:`~youtube_unofficial.testing.synthetic.SyntheticData` when they
+    are requested, so large histories and playlists cost little memory.
+    """
+    def __init__(self,
+                 *,
+                 history_size: int = 100,
+                 playlists: Mapping[str, int] | None = None,
+                 page_size: int = 100,
+                 faults: Faults | None = None,
+                 seed: int = 0,
+                 host: str = '127.0.0.1',
+                 port: int = 0) -> None:
+        """
+        Initialise the server.
+
+        Parameters
+        ----------
+        history_size : int
+            Number of history entries.
+        playlists : Mapping[str, int] | None
+            Number of videos keyed by playlist ID. Defaults to 100 videos in ``WL`` (Watch Later).
+        page_size : int
+            Number of entries on the bootstrap page and in each continuation.
+        faults : Faults | None
+            Faults to inject. Defaults to none.
+        seed : int
+            Seed of the generated data.
+        host : str
+            Address to listen on.
+        port : int
+            Port to listen on. ``0`` picks a free port.
+        """
+        self.data = SyntheticData(seed)
+        """Builder of the pages."""
+        self.page_size = page_size
+        """Number of entries on the bootstrap page and in each continuation."""
+        self.faults = faults or Faults()
+        """Faults to inject."""
+        self.history_paused = False
+        """Whether watch history is paused."""
+        self.requests: Counter[str] = Counter()
+        """Number of requests received per path."""
+        self.lock = Lock()
+        """Lock held while the data is read or changed."""
+        # Entries are kept as their sorted numbers. Continuation tokens hold the number of the next
+        # entry so that removals do not shift later pages.
+        self._history = list(range(history_size))
+        self._playlists = {
+            playlist_id: list(range(size))
+            for playlist_id, size in (playlists if playlists is not None else {
+                'WL': 100
+            }).items()
+        }
+        self._playlist_numbers = {
+            playlist_id: {
+                key: n
+                for n in numbers
+                for key in (self.data.video_id(n, playlist_id),
+                            self.data.set_video_id(playlist_id, n))
+            }
+            for playlist_id, numbers in self._playlists.items()
+        }
+        self._httpd = _HTTPServer((host, port), _Handler, bind_and_activate=False)
+        self._httpd.innertube = self
+        self._thread: Thread | None = None
+
+    @property
+    def history(self) -> list[str]:
+        """Video IDs of the history entries, most recent first."""
+        with self.lock:
+            return [self.data.video_id(n) for n in self._history]
+
+    @property
+    def playlists(self) -> dict[str, list[tuple[str, str]]]:
+        """Video ID and *setVideoId* pairs keyed by playlist ID."""
+        with self.lock:
+            return {
+                playlist_id: [(self.data.video_id(
+                    n, playlist_id), self.data.set_video_id(playlist_id, n)) for n in numbers]
+                for playlist_id, numbers in self._playlists.items()
+            }
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server, such as ``http://127.0.0.1:8080``."""
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host!s}:{port}'
+
+    def start(self) -> None:
+        """Start serving in a background thread."""
+        self._httpd.server_bind()
+        self._httpd.server_activate()
+        self._thread = Thread(target=self._httpd.serve_forever,
+                              name='innertube-server',
+                              daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> Self:
+        """
+        Start serving.
+
+        Returns
+        -------
+        Self
+            This server.
+        """
+        self.start()
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        """Stop serving."""
+        self.close()
+
+    def session(self) -> StandInSession:
+        """
+        Get a session whose YouTube requests go to this server.
+
+        Returns
+        -------
+        StandInSession
+            New session.
+        """
+        return StandInSession(self.url)
+
+    def respond(self, method: str, path: str, query: Mapping[str, Sequence[str]],
+                headers: Mapping[str, str], body: bytes) -> _Response:
+        """
+        Build the response to a request without faults.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method.
+        path : str
+            The URL path.
+        query : Mapping[str, Sequence[str]]
+            The query string as returned by :py:func:`urllib.parse.parse_qs`.
+        headers : Mapping[str, str]
+            The request headers.
+        body : bytes
+            The request body.
+
+        Returns
+        -------
+        tuple[int, str, bytes]
+            The status code, the content type and the body.
+        """
+        if method == 'GET' and path == '/feed/history':
+            return self._history_page()
+        if method == 'GET' and path == '/playlist' and 'list' in query:
+            return self._playlist_page(query['list'][0])
+        if method != 'POST' or path not in {
+                BROWSE_API_URL, FEEDBACK_API_URL, _EDIT_PLAYLIST_API_URL
+        }:
+            return HTTPStatus.NOT_FOUND, 'text/plain', b'Not found.'
+        if not headers.get('Authorization'):
+            return HTTPStatus.UNAUTHORIZED, 'text/plain', b'Missing Authorization header.'
+        api_key = self.data.ytcfg['INNERTUBE_API_KEY']
+        if query.get('key', [api_key])[0] != api_key:
+            return HTTPStatus.BAD_REQUEST, 'text/plain', b'Invalid API key.'
+        try:
+            request = loads(body)
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, 'text/plain', b'Invalid JSON.'
+        if path == BROWSE_API_URL:
+            return self._browse(request.get('continuation', ''))
+        if path == FEEDBACK_API_URL:
+            return self._json(self._feedback(request.get('feedbackTokens', [])))
+        return self._json(self._edit_playlist(request))
+
+    @staticmethod
+    def _json(obj: Any) -> _Response:
+        return HTTPStatus.OK, 'application/json; charset=utf-8', dumps(obj).encode()
+
+    def _html(self, initial_data: Mapping[str, Any]) -> _Response:
+        return HTTPStatus.OK, 'text/html; charset=utf-8', self.data.page_html(initial_data).encode()
+
+    @staticmethod
+    def _page(numbers: Sequence[int], cursor: int, size: int) -> tuple[Sequence[int], int | None]:
+        start = bisect_left(numbers, cursor)
+        page = numbers[start:start + size + 1]
+        return page[:size], page[size] if len(page) > size else None
+
+    def _history_page(self) -> _Response:
+        with self.lock:
+            numbers, next_cursor = self._page(self._history, 0, self.page_size)
+        return self._html(
+            self.data.history_initial_data(
+                numbers,
+                None if next_cursor is None else f'history:{next_cursor}',
+                paused=self.history_paused))
+
+    def _playlist_items(self, playlist_id: str, cursor: int) -> list[Any]:
+        with self.lock:
+            start = bisect_left(self._playlists[playlist_id], cursor)
+            numbers, next_cursor = self._page(self._playlists[playlist_id], cursor, self.page_size)
+        items: list[Any] = [
+            self.data.playlist_renderer(playlist_id, n, start + i) for i, n in enumerate(numbers)
+        ]
+        if next_cursor is not None:
+            items.append(self.data.continuation_item(f'playlist:{playlist_id}:{next_cursor}'))
+        return items
+
+    def _playlist_page(self, playlist_id: str) -> _Response:
+        if playlist_id not in self._playlists:
+            return HTTPStatus.NOT_FOUND, 'text/plain', b'Playlist not found.'
+        items = self._playlist_items(playlist_id, 0)
+        with self.lock:
+            total = len(self._playlists[playlist_id])
+        return self._html(self.data.playlist_initial_data(items, total))
+
+    def _browse(self, token: str) -> _Response:
+        kind, _, cursor = token.rpartition(':')
+        if not cursor.isdigit():
+            return HTTPStatus.BAD_REQUEST, 'text/plain', b'Invalid continuation.'
+        if kind == 'history':
+            with self.lock:
+                numbers, next_cursor = self._page(self._history, int(cursor), self.page_size)
+            return self._json(
+                self.data.continuation_response(
+                    self.data.history_sections(
+                        numbers, None if next_cursor is None else f'history:{next_cursor}')))
+        playlist_id = kind.removeprefix('playlist:')
+        if not kind.startswith('playlist:') or playlist_id not in self._playlists:
+            return HTTPStatus.BAD_REQUEST, 'text/plain', b'Invalid continuation.'
+        return self._json(
+            self.data.continuation_response(self._playlist_items(playlist_id, int(cursor))))
+
+    def _feedback(self, tokens: Sequence[str]) -> dict[str, Any]:
+        processed = []
+        with self.lock:
+            for token in tokens:
+                n = self.data.feedback_token_entry(token)
+                index = -1 if n is None else bisect_left(self._history, n)
+                if token == self.data.clear_history_token:
+                    self._history.clear()
+                elif token == self.data.pause_history_token:
+                    self.history_paused = not self.history_paused
+                elif 0 <= index < len(self._history) and self._history[index] == n:
+                    del self._history[index]
+                else:
+                    processed.append({'isProcessed': False})
+                    continue
+                processed.append({'isProcessed': True})
+        return {'feedbackResponses': processed}
+
+    def _edit_playlist(self, request: Mapping[str, Any]) -> dict[str, Any]:
+        playlist_id = request.get('playlistId', '')
+        succeeded = True
+        with self.lock:
+            if (numbers := self._playlists.get(playlist_id)) is None:
+                return {'status': 'STATUS_FAILED'}
+            for action in request.get('actions', []):
+                n = self._playlist_numbers[playlist_id].get(
+                    action.get('removedVideoId') or action.get('setVideoId', ''))
+                index = -1 if n is None else bisect_left(numbers, n)
+                if 0 <= index < len(numbers) and numbers[index] == n:
+                    del numbers[index]
+                else:
+                    succeeded = False
+        return {'status': 'STATUS_SUCCEEDED' if succeeded else 'STATUS_FAILED'}
@@ -0,0 +1,690 @@
+"""
+Synthetic history and playlist pages of any size.
+
+:py:class:`SyntheticData` builds ``videoRenderer`` and ``playlistVideoRenderer`` items with the keys
+and nesting of real pages, the pages and continuation responses that hold them, and whole
+continuation chains. Every item depends only on the seed and its number, so the same seed gives the
+same bytes on every run and any page can be built without building the ones before it.
+
+.. code-block:: python
+
+   data = SyntheticData(seed=1)
+   html, continuations = data.history_chain(50_000, continuations=500)
+"""
+from __future__ import annotations
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any, cast
+import binascii
+import hashlib
+import math
+import random
+
+from ..json_codec import dumps
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from ..typing.playlist import PlaylistInfo
+    from ..typing.ytcfg import YtcfgDict
+
+__all__ = ('BROWSE_API_URL', 'FEEDBACK_API_URL', 'SYNTHETIC_YTCFG', 'SyntheticData')
+
+BROWSE_API_URL = '/youtubei/v1/browse'
+"""Path of the browse (continuation) endpoint."""
+FEEDBACK_API_URL = '/youtubei/v1/feedback'
+"""Path of the feedback endpoint."""
+SYNTHETIC_YTCFG: YtcfgDict = {
+    'INNERTUBE_API_KEY': 'synthetic-api-key',
+    'INNERTUBE_CONTEXT_CLIENT_NAME': '1',
+    'INNERTUBE_CONTEXT_CLIENT_VERSION': '2.20260101.00.00',
+    'INNERTUBE_CONTEXT_GL': 'US',
+    'INNERTUBE_CONTEXT_HL': 'en',
+    'LOGGED_IN': 'true',
+    'SESSION_INDEX': 0,
+    'USER_SESSION_ID': 'synthetic-session',
+    'VISITOR_DATA': 'synthetic-visitor'
+}
+"""ytcfg of synthetic pages."""
+_WORDS = ('amazing', 'backyard', 'build', 'cat', 'challenge', 'city', 'cooking', 'day', 'deep',
+          'dive', 'episode', 'explained', 'final', 'first', 'game', 'guide', 'history', 'home',
+          'how', 'inside', 'journey', 'kitchen', 'live', 'making', 'music', 'night', 'official',
+          'part', 'review', 'road', 'science', 'secret', 'simple', 'song', 'story', 'trip',
+          'ultimate', 'video', 'vlog', 'why', 'world', 'year')
+_DAYS_PER_WEEK = 7
+_ITEMS_PER_DAY = 25
+_RICH_THUMBNAIL_SHARE = 0.5
+_VERIFIED_SHARE = 0.2
+_VIEW_COUNT_UNITS = ((1_000_000, 'M'), (1000, 'K'))
+_TODAY = date(2026, 1, 1)
+_THUMBNAIL_SIZES = ((168, 94), (196, 110), (246, 138), (336, 188))
+
+
+def _wrap(value: Any, *path: str | int) -> Any:
+    # Build a nested object from the inside out. A ``0`` in the path is a one-element list.
+    for key in reversed(path):
+        value = [value] if key == 0 else {key: value}
+    return value
+
+
+def _runs(text: str) -> dict[str, Any]:
+    return {'runs': [{'text': text}]}
+
+
+def _digest(*parts: object) -> bytes:
+    return hashlib.sha256(':'.join(map(str, parts)).encode()).digest()
+
+
+def _tracking_params(*parts: object) -> str:
+    return urlsafe_b64encode(_digest('tracking', *parts) * 3).decode().rstrip('=')
+
+
+def _count_text(count: int) -> str:
+    for size, unit in _VIEW_COUNT_UNITS:
+        if count >= size:
+            return f'{count // size}{unit} views'
+    return f'{count} views'
+
+
+class SyntheticData:
+    """Builder of synthetic pages, deterministic from a seed."""
+    def __init__(self, seed: int = 0, *, ytcfg: YtcfgDict | None = None) -> None:
+        """
+        Initialise the builder.
+
+        Parameters
+        ----------
+        seed : int
+            Seed of all generated values.
+        ytcfg : YtcfgDict | None
+            ytcfg of the pages. Defaults to :py:data:`SYNTHETIC_YTCFG`.
+        """
+        self.seed = seed
+        """Seed of all generated values."""
+        self.ytcfg = ytcfg if ytcfg is not None else SYNTHETIC_YTCFG
+        """ytcfg of the pages."""
+
+    def _random(self, *parts: object) -> random.Random:
+        return random.Random(  # ruff:ignore[suspicious-non-cryptographic-random-usage]
+            _digest(self.seed, *parts))
+
+    def video_id(self, n: int, playlist_id: str | None = None) -> str:
+        """
+        Get the video ID of a history entry or a playlist item.
+
+        Parameters
+        ----------
+        n : int
+            Number of the entry.
+        playlist_id : str | None
+            Playlist of the item. ``None`` means the history.
+
+        Returns
+        -------
+        str
+            Eleven character video ID.
+        """
+        return urlsafe_b64encode(_digest(self.seed, 'video', playlist_id, n)).decode()[:11]
+
+    def set_video_id(self, playlist_id: str, n: int) -> str:
+        """
+        Get the *setVideoId* of a playlist item.
+
+        Parameters
+        ----------
+        playlist_id : str
+            Playlist of the item.
+        n : int
+            Number of the item.
+
+        Returns
+        -------
+        str
+            Sixteen hexadecimal digits.
+        """
+        return _digest(self.seed, 'set', playlist_id, n)[:8].hex().upper()
+
+    def feedback_token(self, n: int) -> str:
+        """
+        Get the feedback token that removes a history entry.
+
+        Parameters
+        ----------
+        n : int
+            Number of the entry.
+
+        Returns
+        -------
+        str
+            Opaque token that :py:meth:`feedback_token_entry` decodes.
+        """
+        return urlsafe_b64encode(f'remove:{n}:'.encode() +
+                                 _digest(self.seed, 'feedback', n) * 2).decode()
+
+    @staticmethod
+    def feedback_token_entry(token: str) -> int | None:
+        """
+        Get the history entry number of a feedback token from :py:meth:`feedback_token`.
+
+        Parameters
+        ----------
+        token : str
+            The token.
+
+        Returns
+        -------
+        int | None
+            Number of the entry, or ``None`` if the token does not remove an entry.
+        """
+        try:
+            kind, number, _ = urlsafe_b64decode(token).split(b':', 2)
+        except (binascii.Error, ValueError):
+            return None
+        return int(number) if kind == b'remove' and number.isdigit() else None
+
+    @staticmethod
+    def _thumbnails(video_id: str, rng: random.Random) -> list[dict[str, Any]]:
+        return [{
+            'url': (f'https://i.ytimg.com/vi/{video_id}/hqdefault.jpg?sqp=-oaymwEc'
+                    f'&rs={urlsafe_b64encode(rng.randbytes(24)).decode()}'),
+            'width': width,
+            'height': height
+        } for width, height in _THUMBNAIL_SIZES]
+
+    @staticmethod
+    def _title(rng: random.Random) -> str:
+        return ' '.join(rng.choices(_WORDS, k=rng.randint(3, 10))).capitalize()
+
+    def _channel(self, rng: random.Random) -> tuple[str, str]:
+        number = rng.randrange(2000)
+        return (f'{rng.choice(_WORDS).capitalize()} Channel {number}',
+                f'UC{urlsafe_b64encode(_digest(self.seed, "channel", number)).decode()[:22]}')
+
+    @staticmethod
+    def _length(rng: random.Random) -> tuple[int, dict[str, Any]]:
+        seconds = rng.randrange(30, 3 * 3600)
+        minutes, second = divmod(seconds, 60)
+        hours, minute = divmod(minutes, 60)
+        text = f'{hours}:{minute:02}:{second:02}' if hours else f'{minute}:{second:02}'
+        label = ', '.join(
+            f'{value} {unit}'
+            for value, unit in ((hours, 'hours'), (minute, 'minutes'), (second, 'seconds'))
+            if value)
+        return seconds, {
+            'accessibility': _wrap(label, 'accessibilityData', 'label'),
+            'simpleText': text
+        }
+
+    @staticmethod
+    def _channel_endpoint(name: str, channel_id: str) -> dict[str, Any]:
+        return {
+            'text': name,
+            'navigationEndpoint': {
+                'browseEndpoint': {
+                    'browseId': channel_id,
+                    'canonicalBaseUrl': f'/@{name.replace(" ", "")}'
+                }
+            }
+        }
+
+    def history_renderer(self, n: int) -> dict[str, Any]:
+        """
+        Build a history entry.
+
+        Parameters
+        ----------
+        n : int
+            Number of the entry.
+
+        Returns
+        -------
+        dict[str, Any]
+            Object with a ``videoRenderer`` key.
+        """
+        rng = self._random('history', n)
+        video_id = self.video_id(n)
+        channel, channel_id = self._channel(rng)
+        title = self._title(rng)
+        _, length_text = self._length(rng)
+        views = int(rng.paretovariate(0.6) * 100)
+        byline = {'runs': [self._channel_endpoint(channel, channel_id)]}
+        feedback = _wrap(self.feedback_token(n), 'serviceEndpoint', 'feedbackEndpoint',
+                         'feedbackToken')
+        renderer: dict[str, Any] = {
+            'videoId':
+                video_id,
+            'thumbnail': {
+                'thumbnails': self._thumbnails(video_id, rng)
+            },
+            'title':
+                _runs(title) | {
+                    'accessibility': _wrap(f'{title} by {channel}', 'accessibilityData', 'label')
+                },
+            'descriptionSnippet': {
+                'runs': [{
+                    'text': ' '.join(rng.choices(_WORDS, k=rng.randint(5, 25)))
+                }, {
+                    'text': '\n'
+                }, {
+                    'text': ' '.join(rng.choices(_WORDS, k=rng.randint(0, 15)))
+                }]
+            },
+            'longBylineText':
+                byline,
+            'lengthText':
+                length_text,
+            'viewCountText': {
+                'simpleText': f'{views:,} views'
+            },
+            'navigationEndpoint': {
+                'clickTrackingParams': _tracking_params('history-nav', self.seed, n),
+                'watchEndpoint': {
+                    'videoId': video_id
+                }
+            },
+            'ownerText':
+                byline,
+            'shortBylineText':
+                byline,
+            'trackingParams':
+                _tracking_params('history', self.seed, n),
+            'showActionMenu':
+                False,
+            'shortViewCountText': {
+                'simpleText': _count_text(views)
+            },
+            'menu':
+                _wrap(feedback, 'menuRenderer', 'topLevelButtons', 0, 'buttonRenderer'),
+            'channelThumbnailSupportedRenderers':
+                _wrap({'thumbnails': self._thumbnails(channel_id, rng)[:1]},
+                      'channelThumbnailWithLinkRenderer', 'thumbnail'),
+            'thumbnailOverlays': [
+                _wrap(length_text | {'style': 'DEFAULT'}, 'thumbnailOverlayTimeStatusRenderer'),
+                _wrap({'percentDurationWatched': rng.randint(1, 100)},
+                      'thumbnailOverlayResumePlaybackRenderer')
+            ],
+            'isWatched':
+                True
+        }
+        if rng.random() < _VERIFIED_SHARE:
+            renderer['ownerBadges'] = [
+                _wrap('BADGE_STYLE_TYPE_VERIFIED', 'metadataBadgeRenderer', 'style')
+            ]
+        if rng.random() < _RICH_THUMBNAIL_SHARE:
+            renderer['richThumbnail'] = _wrap({'thumbnails': self._thumbnails(video_id, rng)[-1:]},
+                                              'movingThumbnailRenderer', 'movingThumbnailDetails')
+        return {'videoRenderer': renderer}
+
+    def playlist_renderer(self, playlist_id: str, n: int, index: int | None = None) -> PlaylistInfo:
+        """
+        Build a playlist item.
+
+        Parameters
+        ----------
+        playlist_id : str
+            Playlist of the item.
+        n : int
+            Number of the item.
+        index : int | None
+            Position shown in the playlist. Defaults to ``n``.
+
+        Returns
+        -------
+        PlaylistInfo
+            Object with a ``playlistVideoRenderer`` key.
+        """
+        rng = self._random('playlist', playlist_id, n)
+        video_id = self.video_id(n, playlist_id)
+        set_video_id = self.set_video_id(playlist_id, n)
+        channel, channel_id = self._channel(rng)
+        seconds, length_text = self._length(rng)
+        title = self._title(rng)
+        remove = {
+            'clickTrackingParams': _tracking_params('remove', self.seed, playlist_id, n),
+            'playlistEditEndpoint': {
+                'playlistId': playlist_id,
+                'actions': [{
+                    'setVideoId': set_video_id,
+                    'action': 'ACTION_REMOVE_VIDEO'
+                }]
+            }
+        }
+        return cast(
+            'PlaylistInfo', {
+                'playlistVideoRenderer': {
+                    'videoId':
+                        video_id,
+                    'thumbnail': {
+                        'thumbnails': self._thumbnails(video_id, rng)
+                    },
+                    'title':
+                        _runs(title) | {
+                            'accessibility':
+                                _wrap(f'{title} by {channel}', 'accessibilityData', 'label')
+                        },
+                    'index': {
+                        'simpleText': str((n if index is None else index) + 1)
+                    },
+                    'shortBylineText': {
+                        'runs': [self._channel_endpoint(channel, channel_id)]
+                    },
+                    'lengthText':
+                        length_text,
+                    'navigationEndpoint': {
+                        'clickTrackingParams': _tracking_params('nav', self.seed, playlist_id, n),
+                        'watchEndpoint': {
+                            'videoId': video_id,
+                            'playlistId': playlist_id,
+                            'index': n
+                        }
+                    },
+                    'setVideoId':
+                        set_video_id,
+                    'lengthSeconds':
+                        str(seconds),
+                    'trackingParams':
+                        _tracking_params('playlist', self.seed, playlist_id, n),
+                    'isPlayable':
+                        True,
+                    'menu': {
+                        'menuRenderer': {
+                            'items': [{
+                                'menuServiceItemRenderer': {
+                                    'icon': {
+                                        'iconType': 'DELETE'
+                                    },
+                                    'serviceEndpoint': remove
+                                }
+                            }]
+                        }
+                    },
+                    'videoInfo': {
+                        'runs': [{
+                            'text': _count_text(int(rng.paretovariate(0.6) * 100))
+                        }, {
+                            'text': ' • '
+                        }, {
+                            'text': f'{rng.randint(1, 11)} years ago'
+                        }]
+                    }
+                }
+            })
+
+    @staticmethod
+    def continuation_item(token: str) -> dict[str, Any]:
+        """
+        Build the item that ends a page with more pages after it.
+
+        Parameters
+        ----------
+        token : str
+            Continuation token of the next page.
+
+        Returns
+        -------
+        dict[str, Any]
+            Object with a ``continuationItemRenderer`` key.
+        """
+        return cast(
+            'dict[str, Any]',
+            _wrap(
+                {
+                    'clickTrackingParams': _tracking_params('continuation', token),
+                    'commandMetadata': _wrap(BROWSE_API_URL, 'webCommandMetadata', 'apiUrl'),
+                    'continuationCommand': {
+                        'request': 'CONTINUATION_REQUEST_TYPE_BROWSE',
+                        'token': token
+                    }
+                }, 'continuationItemRenderer', 'continuationEndpoint'))
+
+    @staticmethod
+    def continuation_response(items: Sequence[Any]) -> dict[str, Any]:
+        """
+        Build the response of the browse endpoint to a continuation.
+
+        Parameters
+        ----------
+        items : Sequence[Any]
+            Items of the page, ending with a :py:meth:`continuation_item` if there are more pages.
+
+        Returns
+        -------
+        dict[str, Any]
+            The response.
+        """
+        return {
+            'onResponseReceivedActions':
+                _wrap(list(items), 0, 'appendContinuationItemsAction', 'continuationItems'),
+            'responseContext': {
+                'mainAppWebResponseContext': {
+                    'loggedOut': False
+                }
+            }
+        }
+
+    def history_sections(self,
+                         numbers: Sequence[int],
+                         continuation: str | None = None) -> list[dict[str, Any]]:
+        """
+        Build the items of a history page.
+
+        Entries are grouped in sections by the day they were watched, like on YouTube.
+
+        Parameters
+        ----------
+        numbers : Sequence[int]
+            Numbers of the entries on the page.
+        continuation : str | None
+            Continuation token of the next page, if any.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            ``itemSectionRenderer`` objects and the continuation item.
+        """
+        sections: list[dict[str, Any]] = []
+        day = None
+        for n in numbers:
+            if n // _ITEMS_PER_DAY != day:
+                day = n // _ITEMS_PER_DAY
+                watched = _TODAY - timedelta(days=day)
+                title = ('Today' if day == 0 else 'Yesterday' if day == 1 else
+                         f'{watched:%A}' if day < _DAYS_PER_WEEK else f'{watched:%b} {watched.day}')
+                sections.append({
+                    'itemSectionRenderer': {
+                        'contents': [],
+                        'header':
+                            _wrap(title, 'itemSectionHeaderRenderer', 'title', 'runs', 0, 'text')
+                    }
+                })
+            sections[-1]['itemSectionRenderer']['contents'].append(self.history_renderer(n))
+        if continuation is not None:
+            sections.append(self.continuation_item(continuation))
+        return sections
+
+    def history_initial_data(self,
+                             numbers: Sequence[int],
+                             continuation: str | None = None,
+                             *,
+                             paused: bool = False) -> dict[str, Any]:
+        """
+        Build the ``ytInitialData`` of the history page.
+
+        Parameters
+        ----------
+        numbers : Sequence[int]
+            Numbers of the entries on the page.
+        continuation : str | None
+            Continuation token of the next page, if any.
+        paused : bool
+            Whether watch history is paused. Only changes the label of the pause button.
+
+        Returns
+        -------
+        dict[str, Any]
+            The ``ytInitialData`` object.
+        """
+        def button(text: str, token: str, *, disabled: bool = False) -> dict[str, Any]:
+            endpoint = {
+                'commandMetadata': _wrap(FEEDBACK_API_URL, 'webCommandMetadata', 'apiUrl'),
+                'feedbackEndpoint': {
+                    'feedbackToken': token
+                }
+            }
+            return cast(
+                'dict[str, Any]',
+                _wrap(
+                    {
+                        'text': {
+                            'simpleText': text
+                        },
+                        'isDisabled':
+                            disabled,
+                        'navigationEndpoint':
+                            _wrap(endpoint, 'confirmDialogEndpoint', 'content',
+                                  'confirmDialogRenderer', 'confirmEndpoint')
+                    }, 'buttonRenderer'))
+
+        actions = [
+            button('Search watch history', '', disabled=not numbers),
+            button('Clear all watch history', self.clear_history_token),
+            button('Turn on watch history' if paused else 'Pause watch history',
+                   self.pause_history_token)
+        ]
+        return cast(
+            'dict[str, Any]',
+            _wrap(
+                {
+                    'tabs':
+                        _wrap(self.history_sections(numbers, continuation), 0, 'tabRenderer',
+                              'content', 'sectionListRenderer', 'contents'),
+                    'secondaryContents':
+                        _wrap(actions, 'browseFeedActionsRenderer', 'contents')
+                }, 'contents', 'twoColumnBrowseResultsRenderer'))
+
+    @property
+    def clear_history_token(self) -> str:
+        """Feedback token of the *Clear all watch history* button."""
+        return urlsafe_b64encode(b'clear:' + _digest(self.seed, 'clear')).decode()
+
+    @property
+    def pause_history_token(self) -> str:
+        """Feedback token of the *Pause watch history* button."""
+        return urlsafe_b64encode(b'pause:' + _digest(self.seed, 'pause')).decode()
+
+    @staticmethod
+    def playlist_initial_data(items: Sequence[PlaylistInfo],
+                              total: int | None = None) -> dict[str, Any]:
+        """
+        Build the ``ytInitialData`` of a playlist page.
+
+        Parameters
+        ----------
+        items : Sequence[PlaylistInfo]
+            Items of the page, ending with a :py:meth:`continuation_item` if there are more pages.
+            If empty, the page is that of an empty playlist.
+        total : int | None
+            Number of videos in the whole playlist, shown in the header. If ``None``, there is no
+            header.
+
+        Returns
+        -------
+        dict[str, Any]
+            The ``ytInitialData`` object.
+        """
+        section: dict[str, Any] = _wrap('This playlist has no videos.', 'messageRenderer', 'text',
+                                        'simpleText')
+        if items:
+            section = _wrap(list(items), 'playlistVideoListRenderer', 'contents')
+        data = cast(
+            'dict[str, Any]',
+            _wrap(section, 'contents', 'twoColumnBrowseResultsRenderer', 'tabs', 0, 'tabRenderer',
+                  'content', 'sectionListRenderer', 'contents', 0, 'itemSectionRenderer',
+                  'contents', 0))
+        if total is not None:
+            data['header'] = _wrap(
+                {'runs': [{
+                    'text': f'{total:,}'
+                }, {
+                    'text': ' video' if total == 1 else ' videos'
+                }]}, 'playlistHeaderRenderer', 'numVideosText')
+        return data
+
+    def page_html(self, initial_data: Mapping[str, Any]) -> str:
+        """
+        Build the HTML of a page.
+
+        Parameters
+        ----------
+        initial_data : Mapping[str, Any]
+            The ``ytInitialData`` object.
+
+        Returns
+        -------
+        str
+            HTML with a ``ytcfg.set`` script and a ``ytInitialData`` script.
+        """
+        return ('<!DOCTYPE html><html><head><script>(function() {window.ytcfg = window.ytcfg || '
+                f'{{}};ytcfg.set({dumps(self.ytcfg)});}})();</script></head><body><script>'
+                f'var ytInitialData = {dumps(initial_data)};</script></body></html>')
+
+    def history_chain(self, size: int, *,
+                      continuations: int) -> tuple[str, dict[str, dict[str, Any]]]:
+        """
+        Build a history page and all of its continuations.
+
+        Parameters
+        ----------
+        size : int
+            Number of entries.
+        continuations : int
+            Number of continuation pages after the first page. Entries are spread evenly.
+
+        Returns
+        -------
+        tuple[str, dict[str, dict[str, Any]]]
+            HTML of the history page, and the browse responses keyed by continuation token.
+        """
+        pages = self._split(size, continuations)
+        tokens = [f'history:{page[0]}' for page in pages[1:]] + [None]
+        return (self.page_html(self.history_initial_data(pages[0], tokens[0])), {
+            cast('str', token): self.continuation_response(self.history_sections(page, next_token))
+            for token, page, next_token in zip(tokens, pages[1:], tokens[1:], strict=False)
+        })
+
+    def playlist_chain(self, playlist_id: str, size: int, *,
+                       continuations: int) -> tuple[str, dict[str, dict[str, Any]]]:
+        """
+        Build a playlist page and all of its continuations.
+
+        Parameters
+        ----------
+        playlist_id : str
+            The playlist.
+        size : int
+            Number of items.
+        continuations : int
+            Number of continuation pages after the first page. Items are spread evenly.
+
+        Returns
+        -------
+        tuple[str, dict[str, dict[str, Any]]]
+            HTML of the playlist page, and the browse responses keyed by continuation token.
+        """
+        def items(page: Sequence[int], token: str | None) -> list[Any]:
+            return [self.playlist_renderer(playlist_id, n)
+                    for n in page] + ([self.continuation_item(token)] if token is not None else [])
+
+        pages = self._split(size, continuations)
+        tokens = [f'playlist:{playlist_id}:{page[0]}' for page in pages[1:]] + [None]
+        return (self.page_html(self.playlist_initial_data(items(pages[0], tokens[0]), size)), {
+            cast('str', token): self.continuation_response(items(page, next_token))
+            for token, page, next_token in zip(tokens, pages[1:], tokens[1:], strict=False)
+        })
+
+    @staticmethod
+    def _split(size: int, continuations: int) -> list[range]:
+        page_size = max(1, math.ceil(size / (continuations + 1)))
+        return [range(start, min(start + page_size, size))
+                for start in range(0, size, page_size)] or [range(0)]
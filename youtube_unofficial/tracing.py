@@ -0,0 +1,468 @@
+"""
+Tracing spans per operation, page and request.
+
+:py:class:`~youtube_unofficial.client.YouTubeClient` opens a span for every public call, with child
+spans for the download and parsing of the bootstrap page, every continuation request and every
+batch of removals. Spans carry attributes such as ``playlist_id``, ``page_index`` and
+``item_count``. The default tracer records nothing.
+
+:py:class:`RecordingTracer` keeps the spans in memory and writes them as JSON lines.
+:py:class:`OpenTelemetryTracer` forwards them to `OpenTelemetry <https://opentelemetry.io/>`_, so
+they reach whatever exporter the SDK is configured with, for example a collector when run under
+``opentelemetry-instrument``:
+
+.. code-block:: python
+
+   tracer = RecordingTracer()
+   yt = YouTubeClient(session, tracer=tracer)
+   await yt.clear_playlist('WL')
+   tracer.write_jsonl('trace.jsonl')
+
+Any object with a ``start_span`` method like :py:meth:`Tracer.start_span` can be used.
+
+The current span is kept in a context variable and is the default parent of new spans. Async
+generators are run with :py:func:`trace_items`, which sets it only while the generator produces an
+item, because a context variable set inside an async generator would leak to the code iterating it.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol, TypeVar
+import os
+import threading
+import time
+
+from typing_extensions import override
+
+from .json_codec import dumps
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Iterator, Mapping
+
+__all__ = ('NOOP_TRACER', 'AttributeValue', 'NoOpTracer', 'OpenTelemetryTracer', 'RecordedSpan',
+           'RecordingTracer', 'Span', 'Tracer', 'current_span', 'start_span', 'trace_items',
+           'use_span')
+
+_T = TypeVar('_T')
+
+AttributeValue = str | bool | int | float
+"""Value of a span attribute."""
+
+
+class Span(Protocol):
+    """Operation being traced. OpenTelemetry spans satisfy this protocol."""
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        """Set an attribute."""
+
+    def record_exception(self, exception: BaseException) -> None:
+        """Record an exception raised during the operation."""
+
+    def end(self) -> None:
+        """End the span."""
+
+
+class Tracer(Protocol):
+    """Creates spans."""
+    def start_span(self,
+                   name: str,
+                   parent: Any = None,
+                   attributes: Mapping[str, AttributeValue] | None = None) -> Span:
+        """
+        Start a span.
+
+        Parameters
+        ----------
+        name : str
+            Name of the operation.
+        parent : Any
+            Span created by this tracer to nest the new span under. Anything else, such as
+            ``None``, starts a root span.
+        attributes : Mapping[str, AttributeValue] | None
+            Initial attributes.
+        """
+
+
+class _NoOpSpan:
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoOpSpan()
+
+
+class NoOpTracer(Tracer):
+    """Tracer that records nothing. This is the default of the client."""
+    @override
+    def start_span(self,
+                   name: str,
+                   parent: Any = None,
+                   attributes: Mapping[str, AttributeValue] | None = None) -> Span:
+        """
+        Return a span that does nothing.
+
+        Parameters
+        ----------
+        name : str
+            Ignored.
+        parent : Any
+            Ignored.
+        attributes : Mapping[str, AttributeValue] | None
+            Ignored.
+
+        Returns
+        -------
+        Span
+            A shared span that does nothing.
+        """
+        return _NOOP_SPAN
+
+
+NOOP_TRACER = NoOpTracer()
+"""Shared :py:class:`NoOpTracer`."""
+
+
+class RecordedSpan:
+    """Span kept by :py:class:`RecordingTracer`."""
+    def __init__(self,
+                 tracer: RecordingTracer,
+                 name: str,
+                 parent: RecordedSpan | None = None,
+                 attributes: Mapping[str, AttributeValue] | None = None) -> None:
+        """
+        Start the span.
+
+        Parameters
+        ----------
+        tracer : RecordingTracer
+            Tracer to add the span to when it ends.
+        name : str
+            Name of the operation.
+        parent : RecordedSpan | None
+            Parent span.
+        attributes : Mapping[str, AttributeValue] | None
+            Initial attributes.
+        """
+        self.name = name
+        """Name of the operation."""
+        self.trace_id: str = parent.trace_id if parent else os.urandom(16).hex()
+        """Identifier of the trace, shared by all spans under the same root."""
+        self.span_id: str = os.urandom(8).hex()
+        """Identifier of the span."""
+        self.parent_span_id: str | None = parent.span_id if parent else None
+        """Identifier of the parent span, if any."""
+        self.attributes: dict[str, AttributeValue] = dict(attributes or {})
+        """Attributes."""
+        self.events: list[dict[str, Any]] = []
+        """Recorded exceptions, as OpenTelemetry ``exception`` events."""
+        self.start_time = time.time_ns()
+        """Start time in nanoseconds since the epoch."""
+        self.end_time: int | None = None
+        """End time in nanoseconds since the epoch, or ``None`` while running."""
+        self._tracer = tracer
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        """
+        Set an attribute.
+
+        Parameters
+        ----------
+        key : str
+            Name of the attribute.
+        value : AttributeValue
+            Value of the attribute.
+        """
+        self.attributes[key] = value
+
+    def record_exception(self, exception: BaseException) -> None:
+        """
+        Record an exception.
+
+        Parameters
+        ----------
+        exception : BaseException
+            The exception.
+        """
+        self.events.append({
+            'name': 'exception',
+            'time_unix_nano': time.time_ns(),
+            'attributes': {
+                'exception.type': type(exception).__qualname__,
+                'exception.message': str(exception)
+            }
+        })
+
+    def end(self) -> None:
+        """End the span and add it to the tracer. Later calls do nothing."""
+        if self.end_time is None:
+            self.end_time = time.time_ns()
+            self._tracer.add(self)
+
+    @property
+    def duration(self) -> float:
+        """Seconds between start and end, or up to now while running."""
+        return ((self.end_time or time.time_ns()) - self.start_time) / 1e9
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Get the span in the field names of the OpenTelemetry protocol.
+
+        Returns
+        -------
+        dict[str, Any]
+            The span.
+        """
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_span_id': self.parent_span_id,
+            'start_time_unix_nano': self.start_time,
+            'end_time_unix_nano': self.end_time,
+            'attributes': self.attributes,
+            'events': self.events,
+            'status': 'ERROR' if self.events else 'UNSET'
+        }
+
+
+class RecordingTracer(Tracer):
+    """Tracer that keeps ended spans in memory. Safe to use from several threads."""
+    def __init__(self) -> None:
+        """Initialise the tracer."""
+        self.spans: list[RecordedSpan] = []
+        """Ended spans in the order they ended."""
+        self._lock = threading.Lock()
+
+    @override
+    def start_span(self,
+                   name: str,
+                   parent: Any = None,
+                   attributes: Mapping[str, AttributeValue] | None = None) -> RecordedSpan:
+        """
+        Start a span.
+
+        Parameters
+        ----------
+        name : str
+            Name of the operation.
+        parent : Any
+            :py:class:`RecordedSpan` to nest the new span under. Anything else starts a root span.
+        attributes : Mapping[str, AttributeValue] | None
+            Initial attributes.
+
+        Returns
+        -------
+        RecordedSpan
+            The span.
+        """
+        return RecordedSpan(self, name, parent if isinstance(parent, RecordedSpan) else None,
+                            attributes)
+
+    def add(self, span: RecordedSpan) -> None:
+        """
+        Add an ended span.
+
+        Parameters
+        ----------
+        span : RecordedSpan
+            The span.
+        """
+        with self._lock:
+            self.spans.append(span)
+
+    def write_jsonl(self, path: str | Path) -> None:
+        """
+        Write the ended spans, one JSON object per line.
+
+        Parameters
+        ----------
+        path : str | Path
+            Destination.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        Path(path).write_text(''.join(f'{dumps(x.to_dict())}\n' for x in spans), encoding='utf-8')
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    Tracer that creates OpenTelemetry spans.
+
+    Requires the ``opentelemetry-api`` package (the ``otel`` extra). Without a configured SDK,
+    OpenTelemetry itself records nothing.
+    """
+    def __init__(self, tracer: Any = None) -> None:
+        """
+        Initialise the tracer.
+
+        Parameters
+        ----------
+        tracer : Any
+            OpenTelemetry tracer. Defaults to the tracer named ``youtube_unofficial`` of the global
+            tracer provider.
+
+        Raises
+        ------
+        ImportError
+            If ``opentelemetry-api`` is not installed.
+        """
+        try:
+            from opentelemetry import trace  # ruff:ignore[import-outside-top-level]
+        except ImportError as e:
+            msg = ('OpenTelemetry tracing requires the opentelemetry-api package. Install '
+                   'youtube-unofficial[otel].')
+            raise ImportError(msg) from e
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer('youtube_unofficial')
+        """The OpenTelemetry tracer."""
+
+    @override
+    def start_span(self,
+                   name: str,
+                   parent: Any = None,
+                   attributes: Mapping[str, AttributeValue] | None = None) -> Span:
+        """
+        Start an OpenTelemetry span.
+
+        Parameters
+        ----------
+        name : str
+            Name of the operation.
+        parent : Any
+            OpenTelemetry span to nest the new span under. If it is not an OpenTelemetry span, the
+            new span is nested under the current OpenTelemetry span, if any.
+        attributes : Mapping[str, AttributeValue] | None
+            Initial attributes.
+
+        Returns
+        -------
+        Span
+            The span.
+        """
+        context = (self._trace.set_span_in_context(parent)
+                   if isinstance(parent, self._trace.Span) else None)
+        return self.tracer.start_span(name, context=context, attributes=attributes)
+
+
+_current_span: ContextVar[Any] = ContextVar('youtube_unofficial_span', default=None)
+
+
+def current_span() -> Span:
+    """
+    Get the span set by :py:func:`use_span` or :py:func:`trace_items` in the current context.
+
+    Returns
+    -------
+    Span
+        The span, or one that does nothing if none is set.
+    """
+    return _current_span.get() or _NOOP_SPAN
+
+
+@contextmanager
+def use_span(span: Span) -> Iterator[Span]:
+    """
+    Make a span the default parent of :py:func:`start_span` in the current context.
+
+    Do not yield from an async generator inside this context manager.
+
+    Parameters
+    ----------
+    span : Span
+        The span.
+
+    Yields
+    ------
+    Span
+        ``span``.
+    """
+    token = _current_span.set(span)
+    try:
+        yield span
+    finally:
+        _current_span.reset(token)
+
+
+@contextmanager
+def start_span(tracer: Tracer,
+               name: str,
+               parent: Any = None,
+               **attributes: AttributeValue) -> Iterator[Span]:
+    """
+    Start a span and end it on exit, recording any exception.
+
+    Parameters
+    ----------
+    tracer : Tracer
+        The tracer.
+    name : str
+        Name of the operation.
+    parent : Any
+        Parent span. Defaults to :py:func:`current_span`.
+    **attributes : AttributeValue
+        Initial attributes.
+
+    Yields
+    ------
+    Span
+        The span.
+    """
+    span = tracer.start_span(name, parent or _current_span.get(), attributes)
+    try:
+        yield span
+    except BaseException as e:
+        if not isinstance(e, GeneratorExit):
+            span.record_exception(e)
+        raise
+    finally:
+        span.end()
+
+
+_END: Any = object()
+
+
+async def _next_item(span: Span, items: AsyncGenerator[_T, None]) -> _T:
+    token = _current_span.set(span)
+    try:
+        return await anext(items, _END)
+    finally:
+        _current_span.reset(token)
+
+
+async def trace_items(span: Span, items: AsyncGenerator[_T, None]) -> AsyncGenerator[_T, None]:
+    """
+    Yield the items of an async generator, ending a span when it finishes or is closed.
+
+    ``span`` is the current span (see :py:func:`current_span`) while the generator produces each
+    item, so the spans it starts are nested under ``span``. It is not current in the code iterating
+    the items.
+
+    Parameters
+    ----------
+    span : Span
+        The span. Exceptions raised by the generator are recorded in it.
+    items : AsyncGenerator[_T, None]
+        The generator.
+
+    Yields
+    ------
+    _T
+        The items of ``items``.
+    """
+    try:
+        while (item := await _next_item(span, items)) is not _END:
+            yield item
+    except BaseException as e:
+        if not isinstance(e, GeneratorExit):
+            span.record_exception(e)
+        raise
+    finally:
+        await items.aclose()
+        span.end()
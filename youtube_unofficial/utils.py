@@ -9,6 +9,8 @@ import re
 
 from more_itertools import first
 
+from .json_codec import loads
+
 if TYPE_CHECKING:
     from collections.abc import Iterable, Iterator, Mapping
 
@@ -18,7 +20,7 @@ if TYPE_CHECKING:
     from .typing.ytcfg import YtcfgDict
 
 __all__ = ('context_client_body', 'extract_keys', 'find_ytcfg', 'get_text_runs', 'initial_data',
-           'ytcfg_headers')
+           'playlist_video_count', 'ytcfg_headers')
 
 _K = TypeVar('_K')
 _V = TypeVar('_V')
@@ -112,7 +114,7 @@ def initial_data(content: Soup) -> dict[str, Any]:
     """
     return cast(
         'dict[str, Any]',
-        json.loads(
+        loads(
             first(
                 re.sub(
                     _YT_INITIAL_DATA_RE, '',
@@ -120,6 +122,30 @@ def initial_data(content: Soup) -> dict[str, Any]:
                           if re.match(_YT_INITIAL_DATA_RE, x))).split('\n'))[:-1]))
 
 
+def playlist_video_count(yt_init_data: Mapping[str, Any]) -> int | None:
+    """
+    Get the number of videos shown in the header of a playlist page.
+
+    Parameters
+    ----------
+    yt_init_data : Mapping[str, Any]
+        ``ytInitialData`` of a playlist page.
+
+    Returns
+    -------
+    int | None
+        The number of videos, or ``None`` if the header is missing or has no count.
+    """
+    try:
+        text = ''.join(
+            x['text']
+            for x in yt_init_data['header']['playlistHeaderRenderer']['numVideosText']['runs'])
+    except (KeyError, TypeError):
+        return None
+    digits = re.sub(r'\D', '', text)
+    return int(digits) if digits else None
+
+
 def find_ytcfg(soup: Soup) -> YtcfgDict:
     """
     Extract ytcfg from a BeautifulSoup object.
@@ -134,6 +160,8 @@ def find_ytcfg(soup: Soup) -> YtcfgDict:
     YtcfgDict
         Parsed ytcfg configuration.
     """
+    # The standard library decoder stops at the end of the object. The fast codecs cannot ignore the
+    # rest of the script after it.
     return cast(
         'YtcfgDict',
         first(json.JSONDecoder().raw_decode(
@@ -167,7 +195,7 @@ def ytcfg_headers(ytcfg: YtcfgDict) -> dict[str, str]:
         msg = 'Missing DELEGATED_SESSION_ID or USER_SESSION_ID in ytcfg.'
         raise KeyError(msg)
     return {
-        'x-goog-authuser': '0',
+        'x-goog-authuser': str(ytcfg.get('SESSION_INDEX', 0)),
         'x-goog-page-id': str(ytcfg.get('DELEGATED_SESSION_ID', ytcfg.get('USER_SESSION_ID', ''))),
         'x-origin': 'https://www.youtube.com'
     }